@@ -0,0 +1,111 @@
+"""
+Retención de ``volunteer_analysis``: por cada voluntario se dejan en la tabla
+los ``ANALISIS_RETENER_POR_VOLUNTARIO`` análisis más recientes y los
+anteriores ya terminados (completados o fallidos) se mueven a
+``volunteer_analysis_archive``. Así la tabla que consulta el listado de
+análisis crece con el número de voluntarios y no con el historial.
+
+Las filas que sobran se numeran con ``row_number()`` por voluntario en una
+sola consulta. El traslado se hace por lotes de ``ANALISIS_ARCHIVO_LOTE``
+filas, cada uno en su propia transacción (SELECT del lote, INSERT ... SELECT
++ DELETE) y con una pausa de ``ANALISIS_ARCHIVO_PAUSA_S`` entre lotes, para
+no retener el bloqueo de escritura ni competir con las peticiones. Varios
+workers pueden archivar a la vez: el INSERT se salta las filas que otro ya
+ha copiado. ``tarea_archivo_periodica`` lo
+repite cada ``ANALISIS_ARCHIVO_INTERVALO_S`` segundos; para vaciar un
+historial acumulado puede lanzarse a mano con ``python archivar_analisis.py``.
+"""
+import asyncio
+import logging
+from typing import List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.models.agent_models import AnalysisStatus, VolunteerAnalysis, VolunteerAnalysisArchive
+
+logger = logging.getLogger(__name__)
+
+# Los pendientes o en curso se quedan: el webhook de n8n todavía los actualiza
+ESTADOS_ARCHIVABLES = (AnalysisStatus.COMPLETED, AnalysisStatus.FAILED)
+COLUMNAS = (
+    "id", "voluntario_id", "estado", "parametros", "resultado", "error", "fecha_creacion", "fecha_actualizacion"
+)
+
+
+async def _ids_archivables(db, retener: int, lote: int) -> List[int]:
+    """
+    Hasta ``lote`` IDs de análisis terminados que quedan fuera de los
+    ``retener`` más recientes de su voluntario, en una sola consulta.
+    """
+    orden = func.row_number().over(
+        partition_by=VolunteerAnalysis.voluntario_id,
+        order_by=(VolunteerAnalysis.fecha_creacion.desc(), VolunteerAnalysis.id.desc())
+    ).label("orden")
+    numerados = select(VolunteerAnalysis.id, VolunteerAnalysis.estado, orden).subquery()
+    ids = await db.scalars(
+        select(numerados.c.id)
+        .where(numerados.c.orden > retener, numerados.c.estado.in_(ESTADOS_ARCHIVABLES))
+        .order_by(numerados.c.id)
+        .limit(lote)
+    )
+    return ids.all()
+
+
+async def mover_al_archivo(db, ids: List[int]) -> None:
+    """Copia las filas al archivo y las borra de la tabla activa (sin commit)."""
+    origen = VolunteerAnalysis.__table__
+    # Otro worker puede haber copiado ya alguna de estas filas: se copian sólo
+    # las que faltan en el archivo y se borran todas de la tabla activa
+    ya_archivado = select(VolunteerAnalysisArchive.id).where(VolunteerAnalysisArchive.id == origen.c.id).exists()
+    await db.execute(
+        insert(VolunteerAnalysisArchive).from_select(
+            COLUMNAS,
+            select(*(origen.c[columna] for columna in COLUMNAS)).where(origen.c.id.in_(ids), ~ya_archivado)
+        )
+    )
+    await db.execute(
+        delete(VolunteerAnalysis).where(VolunteerAnalysis.id.in_(ids)).execution_options(synchronize_session=False)
+    )
+
+
+async def archivar_analisis(
+    fabrica: sessionmaker = AsyncSessionLocal,
+    retener: Optional[int] = None,
+    lote: Optional[int] = None,
+    pausa: Optional[float] = None
+) -> int:
+    """Archiva los análisis que sobran y devuelve cuántos se han movido."""
+    retener = settings.ANALISIS_RETENER_POR_VOLUNTARIO if retener is None else retener
+    lote = lote or settings.ANALISIS_ARCHIVO_LOTE
+    pausa = settings.ANALISIS_ARCHIVO_PAUSA_S if pausa is None else pausa
+
+    movidos = 0
+    while True:
+        # Cada lote se elige y se mueve en la misma transacción; los ya movidos
+        # no vuelven a salir en la consulta del siguiente
+        async with fabrica() as db:
+            ids = await _ids_archivables(db, retener, lote)
+            if not ids:
+                break
+            await mover_al_archivo(db, ids)
+            await db.commit()
+        movidos += len(ids)
+        if len(ids) < lote:
+            break
+        await asyncio.sleep(pausa)
+    if movidos:
+        logger.info(f"Archivados {movidos} análisis de voluntarios")
+    return movidos
+
+
+async def tarea_archivo_periodica() -> None:
+    """Ejecuta ``archivar_analisis`` cada ``ANALISIS_ARCHIVO_INTERVALO_S`` segundos hasta que se cancele."""
+    while True:
+        await asyncio.sleep(settings.ANALISIS_ARCHIVO_INTERVALO_S)
+        try:
+            await archivar_analisis()
+        except Exception as e:
+            logger.error(f"Error al archivar análisis: {e}", exc_info=True)
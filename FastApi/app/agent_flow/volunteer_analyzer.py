@@ -5,9 +5,12 @@ import httpx
 import json
 import math
 from fastapi import HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.agent_models import VolunteerAnalysis, AnalysisStatus
+from app.models.agent_models import VolunteerAnalysis, VolunteerAnalysisArchive, AnalysisStatus
+from app.models.fechas import rango_proximos_dias
+from app.models.models import Eventos
 from app.schemas.agent.volunteer_analysis import AnalysisResult, AnalysisRequest
 from app.core.config import settings
 from .n8n_integration import n8n
@@ -20,9 +23,9 @@ class VolunteerAnalyzer:
     Ahora integrado con n8n para la orquestación del flujo de trabajo.
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.openai_api_key = settings.OPENAI_API_KEY
+        self.openai_api_key = getattr(settings, "OPENAI_API_KEY", None)
     
     async def start_analysis(self, voluntario_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -44,8 +47,8 @@ class VolunteerAnalyzer:
             )
             
             self.db.add(db_analysis)
-            self.db.commit()
-            self.db.refresh(db_analysis)
+            await self.db.commit()
+            await self.db.refresh(db_analysis)
             
             # Iniciar el flujo en n8n
             await n8n.trigger_volunteer_analysis(voluntario_id, params)
@@ -74,9 +77,10 @@ class VolunteerAnalyzer:
         Returns:
             Dict con los detalles del análisis
         """
-        db_analysis = self.db.query(VolunteerAnalysis).filter(
-            VolunteerAnalysis.id == analysis_id
-        ).first()
+        db_analysis = await self.db.get(VolunteerAnalysis, analysis_id)
+        if not db_analysis:
+            # Los análisis antiguos se mueven al archivo (ver archivo_analisis.py)
+            db_analysis = await self.db.get(VolunteerAnalysisArchive, analysis_id)
         
         if not db_analysis:
             raise HTTPException(
@@ -207,10 +211,14 @@ class VolunteerAnalyzer:
         if ubicacion_voluntario:
             ubicaciones_eventos = []
             eventos_con_ubicacion = []
+            # Una sola geocodificación por dirección: muchos eventos comparten ubicación
+            geocodificadas: Dict[str, Optional[Tuple[float, float]]] = {}
             
             for evento in eventos_futuros:
-                if "ubicacion" in evento:
-                    ubicacion = await self._get_geocode(evento["ubicacion"])
+                if evento.get("ubicacion"):
+                    if evento["ubicacion"] not in geocodificadas:
+                        geocodificadas[evento["ubicacion"]] = await self._get_geocode(evento["ubicacion"])
+                    ubicacion = geocodificadas[evento["ubicacion"]]
                     if ubicacion:
                         ubicaciones_eventos.append(ubicacion)
                         eventos_con_ubicacion.append(evento)
@@ -280,22 +288,36 @@ class VolunteerAnalyzer:
         )
     
     async def _get_future_events(self) -> List[Dict[str, Any]]:
-        """Obtiene los eventos futuros desde la API interna."""
-        # En un entorno real, esto haría una llamada HTTP a la API de eventos
-        # Por ahora, devolvemos datos de ejemplo
-        return [
-            {
-                "id": 1,
-                "nombre": "Recaudación de fondos",
-                "fecha": "2023-08-15",
-                "ubicacion": "Calle Falsa 123, Ciudad de México",
-                "habilidades_requeridas": ["Comunicación", "Ventas"]
-            },
-            {
-                "id": 2,
-                "nombre": "Capacitación de voluntarios",
-                "fecha": "2023-08-20",
-                "ubicacion": "Avenida Siempre Viva 742, Ciudad de México",
-                "habilidades_requeridas": ["Enseñanza", "Paciencia"]
+        """
+        Obtiene los primeros ``AGENT_MAX_EVENTOS_FUTUROS`` eventos que empiezan en
+        los próximos ``AGENT_DIAS_EVENTOS_FUTUROS`` días (rango sobre el índice de
+        ``starts_at``). Cada uno cuesta una geocodificación y una columna de la
+        matriz de distancias.
+        """
+        desde, hasta = rango_proximos_dias(settings.AGENT_DIAS_EVENTOS_FUTUROS)
+        resultado = await self.db.execute(
+            select(
+                Eventos.eventos_id,
+                Eventos.nombre,
+                Eventos.fecha,
+                Eventos.hora,
+                Eventos.starts_at,
+                Eventos.ubicacion
+            )
+            .where(Eventos.starts_at >= desde, Eventos.starts_at < hasta)
+            .order_by(Eventos.starts_at)
+            .limit(settings.AGENT_MAX_EVENTOS_FUTUROS)
+        )
+        eventos = []
+        for fila in resultado:
+            evento = {
+                "id": fila.eventos_id,
+                "nombre": fila.nombre,
+                "fecha": fila.fecha,
+                "hora": fila.hora,
+                "starts_at": fila.starts_at.isoformat()
             }
-        ]
+            if fila.ubicacion:
+                evento["ubicacion"] = fila.ubicacion
+            eventos.append(evento)
+        return eventos
@@ -1,20 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import defer
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, List
+from datetime import datetime
+import logging
 
-from app.db.session import get_db
+from app.db.async_session import get_async_db
 from app.schemas.agent.volunteer_analysis import (
     VolunteerAnalysisCreate,
     VolunteerAnalysisInDB,
     AnalysisRequest,
     AnalysisResult
 )
+from app.models.agent_models import VolunteerAnalysis, VolunteerAnalysisArchive, AnalysisStatus
 from app.agent_flow.volunteer_analyzer import VolunteerAnalyzer
 from app.core.security import get_current_active_user
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+
+def _columnas_omitidas(modelo, incluir_resultado: bool) -> list:
+    """Los listados no devuelven parametros; resultado sólo si se pide. Lo omitido ni se lee ni se descomprime."""
+    opciones = [defer(modelo.parametros_comprimido)]
+    if not incluir_resultado:
+        opciones.append(defer(modelo.resultado_comprimido))
+    return opciones
+
+
 @router.post(
     "/analyze-volunteer",
     response_model=Dict[str, Any],
@@ -28,7 +44,7 @@ router = APIRouter()
 async def analyze_volunteer(
     request: AnalysisRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
     """
@@ -54,7 +70,7 @@ async def analyze_volunteer(
 )
 async def get_analysis_status(
     analysis_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
     """
@@ -75,20 +91,22 @@ async def get_volunteer_analyses(
     voluntario_id: int,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    incluir_resultado: bool = Query(True, description="Con false sólo se devuelve el estado de cada análisis"),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
     """
     Obtiene todos los análisis realizados para un voluntario.
     """
-    analyzer = VolunteerAnalyzer(db)
-    
     # Obtener análisis de la base de datos
-    analyses = db.query(VolunteerAnalysis).filter(
-        VolunteerAnalysis.voluntario_id == voluntario_id
-    ).order_by(
-        VolunteerAnalysis.fecha_creacion.desc()
-    ).offset(skip).limit(limit).all()
+    resultado = await db.execute(
+        select(VolunteerAnalysis).where(
+            VolunteerAnalysis.voluntario_id == voluntario_id
+        ).order_by(
+            VolunteerAnalysis.fecha_creacion.desc()
+        ).offset(skip).limit(limit).options(*_columnas_omitidas(VolunteerAnalysis, incluir_resultado))
+    )
+    analyses = resultado.scalars().all()
     
     # Convertir a formato de diccionario
     return [
@@ -99,11 +117,52 @@ async def get_volunteer_analyses(
             "fecha_creacion": a.fecha_creacion,
             "fecha_actualizacion": a.fecha_actualizacion,
             "error": a.error,
-            "resultado": a.resultado
+            **({"resultado": a.resultado} if incluir_resultado else {})
         }
         for a in analyses
     ]
 
+@router.get(
+    "/volunteer/{voluntario_id}/analyses/archived",
+    response_model=List[Dict[str, Any]],
+    summary="Obtiene los análisis archivados de un voluntario",
+    description="""
+    Devuelve los análisis antiguos de un voluntario que se han movido al archivo
+    por la política de retención (ANALISIS_RETENER_POR_VOLUNTARIO).
+    """
+)
+async def get_volunteer_archived_analyses(
+    voluntario_id: int,
+    skip: int = 0,
+    limit: int = 10,
+    incluir_resultado: bool = Query(True, description="Con false sólo se devuelve el estado de cada análisis"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    """
+    Obtiene los análisis archivados de un voluntario, del más reciente al más antiguo.
+    """
+    resultado = await db.execute(
+        select(VolunteerAnalysisArchive).where(
+            VolunteerAnalysisArchive.voluntario_id == voluntario_id
+        ).order_by(
+            VolunteerAnalysisArchive.fecha_creacion.desc()
+        ).offset(skip).limit(limit).options(*_columnas_omitidas(VolunteerAnalysisArchive, incluir_resultado))
+    )
+    return [
+        {
+            "analysis_id": a.id,
+            "voluntario_id": a.voluntario_id,
+            "estado": a.estado.value,
+            "fecha_creacion": a.fecha_creacion,
+            "fecha_actualizacion": a.fecha_actualizacion,
+            "fecha_archivado": a.fecha_archivado,
+            "error": a.error,
+            **({"resultado": a.resultado} if incluir_resultado else {})
+        }
+        for a in resultado.scalars().all()
+    ]
+
 # Webhook para que n8n actualice el estado de los análisis
 @router.post(
     "/webhook/analysis-update",
@@ -112,7 +171,7 @@ async def get_volunteer_analyses(
 )
 async def update_analysis_webhook(
     data: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Webhook que n8n usa para actualizar el estado de un análisis.
@@ -131,9 +190,7 @@ async def update_analysis_webhook(
             )
         
         # Obtener el análisis de la base de datos
-        db_analysis = db.query(VolunteerAnalysis).filter(
-            VolunteerAnalysis.id == analysis_id
-        ).first()
+        db_analysis = await db.get(VolunteerAnalysis, analysis_id)
         
         if not db_analysis:
             raise HTTPException(
@@ -152,12 +209,14 @@ async def update_analysis_webhook(
             db_analysis.estado = status_update
         
         db_analysis.fecha_actualizacion = datetime.utcnow()
-        db.commit()
+        await db.commit()
         
         return {"status": "success", "message": "Análisis actualizado correctamente"}
         
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error en el webhook de actualización: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
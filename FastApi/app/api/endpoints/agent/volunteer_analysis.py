@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 
-from app.db.session import get_db
+from app.db.async_session import get_async_db
 from app.schemas.agent.volunteer_analysis import (
     VolunteerAnalysisCreate,
     VolunteerAnalysisInDB,
@@ -29,7 +30,7 @@ router = APIRouter()
 async def analyze_volunteer(
     request: AnalysisRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
     """
@@ -54,8 +55,8 @@ async def analyze_volunteer(
     )
     
     db.add(db_analysis)
-    db.commit()
-    db.refresh(db_analysis)
+    await db.commit()
+    await db.refresh(db_analysis)
     
     # Iniciar tarea en segundo plano
     analyzer = VolunteerAnalyzer(db)
@@ -76,15 +77,13 @@ async def analyze_volunteer(
 )
 async def get_analysis_status(
     analysis_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
     """
     Obtiene el estado de un análisis por su ID.
     """
-    db_analysis = db.query(VolunteerAnalysis).filter(
-        VolunteerAnalysis.id == analysis_id
-    ).first()
+    db_analysis = await db.get(VolunteerAnalysis, analysis_id)
     
     if not db_analysis:
         raise HTTPException(
@@ -113,7 +112,7 @@ async def get_volunteer_analyses(
     voluntario_id: int,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
     """
@@ -126,10 +125,13 @@ async def get_volunteer_analyses(
     #         detail="No tiene permisos para ver estos análisis"
     #     )
     
-    analyses = db.query(VolunteerAnalysis).filter(
-        VolunteerAnalysis.voluntario_id == voluntario_id
-    ).order_by(
-        VolunteerAnalysis.fecha_creacion.desc()
-    ).offset(skip).limit(limit).all()
+    resultado = await db.execute(
+        select(VolunteerAnalysis).where(
+            VolunteerAnalysis.voluntario_id == voluntario_id
+        ).order_by(
+            VolunteerAnalysis.fecha_creacion.desc()
+        ).offset(skip).limit(limit)
+    )
+    analyses = resultado.scalars().all()
     
     return analyses
@@ -1,9 +1,11 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database.database import get_db
+from ..db.async_session import get_async_db
+from ..db.repositorio import usuario_por_correo
 from ..models.models import Usuarios
 from .schemas import Token, UserCreate, UserInDB, UserLogin
 from .jwt_handler import (
@@ -21,9 +23,9 @@ router = APIRouter(
 )
 
 @router.post("/register", response_model=UserInDB)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Verificar si el correo ya está registrado
-    db_user = db.query(Usuarios).filter(Usuarios.correo == user.correo).first()
+    db_user = await usuario_por_correo(db, user.correo)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,20 +42,21 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
         is_active=True,
         is_verified=False  # Podrías implementar verificación por correo electrónico
     )
-    db_user.set_password(user.password)
+    # bcrypt es costoso en CPU: se calcula fuera del event loop
+    await run_in_threadpool(db_user.set_password, user.password)
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(Usuarios).filter(Usuarios.correo == form_data.username).first()
-    if not user or not user.verify_password(form_data.password):
+    user = await usuario_por_correo(db, form_data.username)
+    if not user or not await run_in_threadpool(user.verify_password, form_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Correo o contraseña incorrectos",
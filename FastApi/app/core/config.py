@@ -6,7 +6,34 @@ from pathlib import Path
 class Settings(BaseSettings):
     # Configuración de la base de datos
     DATABASE_URL: str = "sqlite:///./sqlite.db"
+
+    # Configuración del pool de conexiones (ver app/database/engines.py)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 lo desactiva
+
+    # Perfil de SQLite en fichero (ver aplicar_perfil_sqlite)
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_COLA_ESCRITURA: bool = True
+
+    # Réplicas de lectura (ver app/db/enrutamiento.py)
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_LECTURA_PEGAJOSA_SEGUNDOS: int = 5
+
+    # Instrumentación de consultas por petición (ver app/db/instrumentacion.py)
+    DB_CONSULTA_LENTA_MS: float = 200
+    DB_N_MAS_1_UMBRAL: int = 5
     
+    # Zona horaria en la que se escriben la fecha y hora de los eventos
+    EVENTOS_ZONA_HORARIA: str = "UTC"
+
     # Configuración de autenticación
     SECRET_KEY: str = "una_clave_secreta_muy_segura"
     ALGORITHM: str = "HS256"
@@ -24,6 +51,14 @@ class Settings(BaseSettings):
     AGENT_TIMEOUT: int = 60
     AGENT_MAX_DISTANCE_KM: float = 20.0
     AGENT_MIN_SKILL_MATCH: float = 0.5
+    AGENT_DIAS_EVENTOS_FUTUROS: int = 30
+    AGENT_MAX_EVENTOS_FUTUROS: int = 50
+
+    # Retención de volunteer_analysis (ver app/agent_flow/archivo_analisis.py)
+    ANALISIS_RETENER_POR_VOLUNTARIO: int = 20
+    ANALISIS_ARCHIVO_LOTE: int = 500
+    ANALISIS_ARCHIVO_PAUSA_S: float = 0.5
+    ANALISIS_ARCHIVO_INTERVALO_S: int = 3600  # 0 desactiva la tarea periódica
     
     # Configuración de n8n
     N8N_WEBHOOK_URL: str = "http://localhost:5678/webhook/"
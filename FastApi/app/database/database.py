@@ -1,13 +1,15 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 
-# Configuración de la base de datos SQLite
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sqlite.db"
+from app.core.config import settings
+from app.database.engines import activar_claves_foraneas, obtener_engine
 
-# Creación de la engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+# Configuración de la base de datos
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+# Engine compartido del registro (pool configurado en settings)
+engine = obtener_engine(SQLALCHEMY_DATABASE_URL)
 
 # Creación de la sesión local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,171 @@
+"""
+Registro único de engines de base de datos.
+
+Toda la aplicación obtiene sus engines (síncrono y asíncrono) de aquí, de modo
+que hay un solo pool por URL y la configuración del pool (tamaño, overflow,
+pre-ping, reciclado y timeout de sentencias) se toma de ``settings``.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+# Driver asíncrono a usar para cada backend
+DRIVERS_ASINCRONOS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+_engines: Dict[str, Engine] = {}
+_engines_asincronos: Dict[str, AsyncEngine] = {}
+
+
+def url_asincrona(url: str) -> str:
+    """Convierte una URL de base de datos síncrona en su equivalente asíncrona."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    driver_asincrono = DRIVERS_ASINCRONOS.get(backend)
+    if driver_asincrono is not None and url.drivername not in DRIVERS_ASINCRONOS.values():
+        url = url.set(drivername=driver_asincrono)
+    return url.render_as_string(hide_password=False)
+
+
+def activar_claves_foraneas(engine) -> None:
+    """
+    SQLite sólo aplica las claves foráneas (y sus ON DELETE) si se activan en
+    cada conexión. Se acepta tanto un Engine como el ``sync_engine`` de uno asíncrono.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _pragma_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def aplicar_perfil_sqlite(engine) -> None:
+    """
+    Perfil de producción para SQLite en fichero, aplicado en cada conexión:
+    WAL (los lectores no bloquean al escritor ni al revés), ``synchronous=NORMAL``
+    (seguro con WAL), espera ante el bloqueo de escritura en lugar de fallar
+    con "database is locked", y memoria mapeada y caché de páginas más grandes.
+    """
+    if engine.dialect.name != "sqlite" or engine.url.database in (None, "", ":memory:"):
+        return
+
+    pragmas = [
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        # Negativo: tamaño en KiB en lugar de en páginas
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+    ]
+    if settings.SQLITE_WAL:
+        pragmas.insert(0, "PRAGMA journal_mode=WAL")
+
+    @event.listens_for(engine, "connect")
+    def _pragmas_rendimiento(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def _opciones_engine(url: str, asincrono: bool) -> Dict[str, Any]:
+    """Argumentos de ``create_engine`` según el backend y la configuración."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    opciones: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {},
+    }
+
+    if backend == "sqlite":
+        if not url.database or url.database == ":memory:":
+            # La base en memoria vive en una única conexión: se deja el pool por defecto
+            if not asincrono:
+                opciones["connect_args"]["check_same_thread"] = False
+            return opciones
+        # SQLAlchemy 1.4 usa NullPool con ficheros SQLite (una conexión nueva
+        # por sesión); un pool con cola reutiliza las conexiones como en PostgreSQL
+        opciones["poolclass"] = AsyncAdaptedQueuePool if asincrono else QueuePool
+        if not asincrono:
+            opciones["connect_args"]["check_same_thread"] = False
+        # SQLite no tiene timeout de sentencias: la espera por el bloqueo de
+        # escritura la fija busy_timeout (ver aplicar_perfil_sqlite)
+    elif backend == "postgresql" and timeout_ms:
+        if asincrono:
+            opciones["connect_args"]["server_settings"] = {"statement_timeout": str(timeout_ms)}
+        else:
+            opciones["connect_args"]["options"] = f"-c statement_timeout={timeout_ms}"
+
+    opciones.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return opciones
+
+
+def obtener_engine(url: Optional[str] = None) -> Engine:
+    """Devuelve el engine síncrono de ``url`` (por defecto ``DATABASE_URL``), creándolo una sola vez."""
+    url = url or settings.DATABASE_URL
+    engine = _engines.get(url)
+    if engine is None:
+        engine = create_engine(url, **_opciones_engine(url, asincrono=False))
+        activar_claves_foraneas(engine)
+        aplicar_perfil_sqlite(engine)
+        _engines[url] = engine
+    return engine
+
+
+def obtener_engine_asincrono(url: Optional[str] = None) -> AsyncEngine:
+    """Devuelve el engine asíncrono de ``url`` (por defecto ``DATABASE_URL``), creándolo una sola vez."""
+    url = url_asincrona(url or settings.DATABASE_URL)
+    engine = _engines_asincronos.get(url)
+    if engine is None:
+        engine = create_async_engine(url, **_opciones_engine(url, asincrono=True))
+        activar_claves_foraneas(engine.sync_engine)
+        aplicar_perfil_sqlite(engine.sync_engine)
+        _engines_asincronos[url] = engine
+    return engine
+
+
+def _estadisticas(engine: Engine, tipo: str) -> Dict[str, Any]:
+    pool = engine.pool
+    estadisticas: Dict[str, Any] = {
+        "url": engine.url.render_as_string(hide_password=True),
+        "tipo": tipo,
+        "pool": type(pool).__name__,
+    }
+    # Sólo los pools con cola llevan la cuenta de conexiones
+    for nombre in ("size", "checkedin", "checkedout", "overflow"):
+        metodo = getattr(pool, nombre, None)
+        if callable(metodo):
+            estadisticas[nombre] = metodo()
+    return estadisticas
+
+
+def estadisticas_pool() -> List[Dict[str, Any]]:
+    """Estado de los pools de todos los engines registrados."""
+    return (
+        [_estadisticas(engine, "sincrono") for engine in _engines.values()]
+        + [_estadisticas(engine.sync_engine, "asincrono") for engine in _engines_asincronos.values()]
+    )
+
+
+async def cerrar_engines() -> None:
+    """Cierra las conexiones de todos los engines registrados."""
+    for engine in _engines.values():
+        engine.dispose()
+    for engine in _engines_asincronos.values():
+        await engine.dispose()
@@ -5,5 +5,6 @@ Este paquete contiene la configuración y las utilidades para interactuar con la
 """
 
 from .session import Base, engine, get_db, SessionLocal
+from .async_session import async_engine, AsyncSessionLocal, get_async_db, sesion_lectura
 
-__all__ = ["Base", "engine", "get_db", "SessionLocal"]
+__all__ = ["Base", "engine", "get_db", "SessionLocal", "async_engine", "AsyncSessionLocal", "get_async_db", "sesion_lectura"]
@@ -0,0 +1,40 @@
+"""
+Acceso asíncrono a la base de datos.
+
+Los endpoints son ``async def``, así que las consultas deben hacerse con
+``AsyncSession`` (aiosqlite en desarrollo, asyncpg en PostgreSQL) para no
+bloquear el event loop mientras esperan a la base de datos.
+
+Si ``DATABASE_REPLICA_URLS`` tiene réplicas, las peticiones de sólo lectura
+leen de ellas (ver ``app.db.enrutamiento``).
+"""
+from typing import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.engines import obtener_engine_asincrono
+from app.db.enrutamiento import crear_fabrica_sesiones, lectura_de_la_peticion, usar_replica
+
+async_engine = obtener_engine_asincrono()
+replica_engines = [obtener_engine_asincrono(url) for url in settings.DATABASE_REPLICA_URLS]
+
+# SQLite admite un solo escritor: las escrituras del proceso hacen cola
+AsyncSessionLocal = crear_fabrica_sesiones(
+    async_engine,
+    replica_engines,
+    serializar_escrituras=settings.SQLITE_COLA_ESCRITURA and async_engine.dialect.name == "sqlite"
+)
+
+
+def sesion_lectura() -> AsyncSession:
+    """Sesión para resolvers de sólo lectura: lee de una réplica si la hay."""
+    return AsyncSessionLocal(info={"replica": usar_replica()})
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Proveedor de dependencia para obtener una sesión asíncrona de base de datos.
+    """
+    async with AsyncSessionLocal(info={"replica": lectura_de_la_peticion()}) as db:
+        yield db
@@ -0,0 +1,280 @@
+"""
+Generador de datos sintéticos para pruebas de carga.
+
+Produce usuarios, voluntarios (con habilidades y disponibilidad), eventos,
+asignaciones, feedback y análisis de voluntarios con proporciones y
+distribuciones parecidas a las de producción: unos pocos voluntarios y
+habilidades concentran buena parte de la actividad, las fechas se reparten
+alrededor de ``referencia`` y los textos combinan frases en español para que
+la búsqueda de texto completo tenga un vocabulario realista.
+
+Cada tabla se genera por trozos de IDs consecutivos, y cada trozo usa su
+propio ``random.Random`` derivado de (semilla, tabla, inicio): los trozos
+pueden generarse en cualquier orden y en procesos distintos, y la misma
+semilla, escala, tamaño de trozo y referencia producen exactamente los
+mismos datos. El orden de ``TABLAS`` respeta las claves foráneas.
+
+La escritura y la reconstrucción de las tablas derivadas están en el script
+``generar_datos.py``.
+"""
+import random
+import unicodedata
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Sequence
+
+from app.models.agent_models import AnalysisStatus
+from app.models.fechas import calcular_inicio
+from app.models.json_comprimido import comprimir_json
+from app.routers.habilidades import normalizar_habilidad
+
+# Fracción de la escala (filas totales) que corresponde a cada tabla principal
+PROPORCIONES = {
+    "Usuarios": 0.08,
+    "Voluntarios": 0.08,
+    "Eventos": 0.01,
+    "Asignaciones": 0.38,
+    "feedback": 0.25,
+    "volunteer_analysis": 0.20,
+}
+
+NOMBRES = (
+    "María", "Carmen", "Ana", "Laura", "Lucía", "Marta", "Elena", "Sara", "Paula", "Cristina",
+    "Antonio", "José", "Manuel", "Francisco", "David", "Juan", "Javier", "Daniel", "Carlos", "Miguel",
+)
+APELLIDOS = (
+    "García", "Rodríguez", "González", "Fernández", "López", "Martínez", "Sánchez", "Pérez",
+    "Gómez", "Martín", "Jiménez", "Ruiz", "Hernández", "Díaz", "Moreno", "Muñoz", "Álvarez", "Romero",
+)
+TIPOS_USUARIO = (("voluntario", 90), ("organizador", 8), ("admin", 2))
+# Ordenadas de más a menos frecuente: la probabilidad decae como 1/posición
+HABILIDADES = (
+    "Trabajo en equipo", "Atención al público", "Logística", "Cocina", "Conducción",
+    "Primeros auxilios", "Idiomas", "Informática", "Organización de eventos", "Almacén",
+    "Carga y descarga", "Redes sociales", "Fotografía", "Contabilidad", "Educación infantil",
+    "Atención a mayores", "Paramédico", "Traducción", "Diseño gráfico", "Mediación",
+)
+DISPONIBILIDADES = ("Fines de semana", "Entre semana", "Mañanas", "Tardes", "Noches", "Flexible")
+TIPOS_EVENTO = (
+    "Reparto de alimentos", "Recogida de donaciones", "Clasificación de alimentos",
+    "Gran recogida", "Comedor social", "Taller de cocina", "Campaña escolar",
+)
+BARRIOS = (
+    "Centro", "Chamberí", "Vallecas", "Carabanchel", "Usera", "Tetuán", "Latina",
+    "Moratalaz", "Hortaleza", "Arganzuela", "Villaverde", "Ciudad Lineal",
+)
+FRASES_EVENTO = (
+    "Se necesitan voluntarios para descargar el camión y ordenar el almacén.",
+    "Los productos frescos se reparten primero entre las familias inscritas.",
+    "Habrá un punto de información para nuevas familias y voluntarios.",
+    "Es importante llegar con quince minutos de antelación.",
+    "Se recogerán alimentos no perecederos, productos de higiene y leche infantil.",
+    "Los coordinadores explicarán las tareas al inicio de cada turno.",
+    "El evento se celebra en colaboración con la asociación de vecinos.",
+    "Se recomienda llevar ropa cómoda y calzado cerrado.",
+)
+FRASES_FEEDBACK = (
+    "Muy buena organización y un ambiente estupendo.",
+    "Faltaron voluntarios en el turno de tarde.",
+    "Las familias agradecieron mucho la rapidez del reparto.",
+    "La coordinación con el almacén fue mejorable.",
+    "Repetiré sin duda en la próxima recogida.",
+    "Hubo retrasos en la llegada del camión.",
+    "Las instrucciones fueron claras desde el principio.",
+    "Sería útil tener más carros para la carga.",
+)
+ROLES = ("Ayudante", "Coordinador", "Conductor", "Mozo de almacén", "Cocinero", "Informador")
+ESTADOS_ASIGNACION = (("Confirmado", 60), ("Pendiente", 25), ("Completado", 10), ("Cancelado", 5))
+ESTADOS_ANALISIS = (
+    (AnalysisStatus.COMPLETED, 80), (AnalysisStatus.FAILED, 8),
+    (AnalysisStatus.PENDING, 7), (AnalysisStatus.IN_PROGRESS, 5),
+)
+HORAS = ("09:00", "10:00", "10:30", "12:00", "16:00", "17:30", "18:00")
+PARAMETROS_ANALISIS = comprimir_json({"incluir_historico": True, "incluir_recomendaciones": True, "idioma": "es"})
+
+
+@dataclass(frozen=True)
+class Contexto:
+    """Parámetros comunes a todos los trozos de una generación."""
+    semilla: int
+    tamanos: Dict[str, int]
+    referencia: date
+    # Hash de contraseña compartido por todos los usuarios (bcrypt por fila sería lo más lento)
+    hashed_password: str
+
+
+def calcular_tamanos(escala: int) -> Dict[str, int]:
+    """Filas de cada tabla principal para una escala dada (al menos una por tabla)."""
+    return {tabla: max(1, round(escala * proporcion)) for tabla, proporcion in PROPORCIONES.items()}
+
+
+def catalogo_habilidades() -> List[dict]:
+    """Filas de ``habilidades``; el ID de cada una es su posición en ``HABILIDADES`` más uno."""
+    return [
+        {"habilidades_id": i, "nombre": normalizar_habilidad(nombre), "total_voluntarios": 0}
+        for i, nombre in enumerate(HABILIDADES, start=1)
+    ]
+
+
+def _elegir(rng: random.Random, pesos: Sequence[tuple]):
+    return rng.choices([valor for valor, _ in pesos], weights=[peso for _, peso in pesos])[0]
+
+
+def _sesgado(rng: random.Random, n: int) -> int:
+    """ID en [1, n] con más peso en los primeros: unos pocos voluntarios y eventos acumulan más actividad."""
+    return int(n * rng.random() ** 2) + 1
+
+
+def _sin_tildes(texto: str) -> str:
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode().lower()
+
+
+def _fecha(rng: random.Random, contexto: Contexto, dias_antes: int, dias_despues: int) -> date:
+    return contexto.referencia + timedelta(days=rng.randint(-dias_antes, dias_despues))
+
+
+def _momento(rng: random.Random, contexto: Contexto, dias_antes: int) -> datetime:
+    inicio = datetime.combine(contexto.referencia, datetime.min.time())
+    return inicio - timedelta(seconds=rng.randint(0, dias_antes * 86400))
+
+
+def _usuarios(rng, contexto, inicio, fin):
+    filas = []
+    for i in range(inicio, fin):
+        nombre, apellido = rng.choice(NOMBRES), rng.choice(APELLIDOS)
+        filas.append({
+            "usuarios_id": i,
+            "nombre": nombre,
+            "apellido": apellido,
+            "correo": f"{_sin_tildes(nombre)}.{_sin_tildes(apellido)}.{i}@example.org",
+            "telefono": f"6{rng.randint(0, 99999999):08d}",
+            "tipo": _elegir(rng, TIPOS_USUARIO),
+            "hashed_password": contexto.hashed_password,
+            "is_active": rng.random() < 0.97,
+            "is_verified": rng.random() < 0.7,
+        })
+    return {"Usuarios": filas}
+
+
+def _voluntarios(rng, contexto, inicio, fin):
+    usuarios = contexto.tamanos["Usuarios"]
+    pesos = [1 / posicion for posicion in range(1, len(HABILIDADES) + 1)]
+    voluntarios, indice = [], []
+    for i in range(inicio, fin):
+        elegidas = sorted(set(rng.choices(range(len(HABILIDADES)), weights=pesos, k=rng.randint(1, 4))))
+        voluntarios.append({
+            "voluntarios_id": i,
+            "habilidades": ", ".join(HABILIDADES[h] for h in elegidas),
+            "disponibilidad": rng.choice(DISPONIBILIDADES),
+            "usuario_id": i if i <= usuarios else None,
+        })
+        indice.extend({"habilidad_id": h + 1, "voluntario_id": i} for h in elegidas)
+    return {"Voluntarios": voluntarios, "voluntarios_habilidades": indice}
+
+
+def _eventos(rng, contexto, inicio, fin):
+    filas = []
+    for i in range(inicio, fin):
+        fecha = _fecha(rng, contexto, 730, 180).isoformat()
+        hora = rng.choice(HORAS)
+        barrio = rng.choice(BARRIOS)
+        filas.append({
+            "eventos_id": i,
+            "nombre": f"{rng.choice(TIPOS_EVENTO)} en {barrio}",
+            "fecha": fecha,
+            "hora": hora,
+            "starts_at": calcular_inicio(fecha, hora),
+            "ubicacion": f"Calle {rng.choice(APELLIDOS)} {rng.randint(1, 120)}, {barrio}, Madrid",
+            "voluntarios_necesarios": rng.randint(3, 40),
+            "descripcion_eventos": " ".join(rng.sample(FRASES_EVENTO, rng.randint(2, 4))),
+        })
+    return {"Eventos": filas}
+
+
+def _asignaciones(rng, contexto, inicio, fin):
+    eventos, voluntarios = contexto.tamanos["Eventos"], contexto.tamanos["Voluntarios"]
+    filas = []
+    for i in range(inicio, fin):
+        filas.append({
+            "asignaciones_id": i,
+            "evento_id": rng.randint(1, eventos),
+            "voluntario_id": _sesgado(rng, voluntarios),
+            "rol": rng.choice(ROLES),
+            "estado": _elegir(rng, ESTADOS_ASIGNACION),
+            "fecha_asignacion": _fecha(rng, contexto, 730, 30).isoformat(),
+        })
+    return {"Asignaciones": filas}
+
+
+def _feedback(rng, contexto, inicio, fin):
+    eventos, voluntarios = contexto.tamanos["Eventos"], contexto.tamanos["Voluntarios"]
+    filas = []
+    for i in range(inicio, fin):
+        filas.append({
+            "feedback_id": i,
+            "evento_id": _sesgado(rng, eventos),
+            "voluntario_id": _sesgado(rng, voluntarios),
+            "calificacion": _elegir(rng, ((5, 40), (4, 30), (3, 15), (2, 10), (1, 5))),
+            "comentario": " ".join(rng.sample(FRASES_FEEDBACK, rng.randint(1, 3))),
+            "fecha_creacion": _momento(rng, contexto, 730),
+        })
+    return {"feedback": filas}
+
+
+def _volunteer_analysis(rng, contexto, inicio, fin):
+    voluntarios = contexto.tamanos["Voluntarios"]
+    filas = []
+    for i in range(inicio, fin):
+        estado = _elegir(rng, ESTADOS_ANALISIS)
+        creado = _momento(rng, contexto, 365)
+        calificacion = round(rng.uniform(2.5, 5.0), 1)
+        resultado = None
+        if estado == AnalysisStatus.COMPLETED:
+            resultado = {
+                "resumen": "Voluntario con buen desempeño y participación constante.",
+                "fortalezas": [f"Ha participado en {rng.randint(0, 60)} eventos", f"Calificación promedio: {calificacion}/5.0"],
+                "recomendaciones": ["Asignar a eventos cercanos"] + (["Considerar para liderazgo"] if calificacion >= 4.5 else []),
+                "habilidades_destacadas": [normalizar_habilidad(h) for h in rng.sample(HABILIDADES, 3)],
+                "compatibilidad_eventos_futuros": {
+                    f"{rng.choice(TIPOS_EVENTO)} en {barrio}": round(rng.random(), 2)
+                    for barrio in rng.sample(BARRIOS, rng.randint(0, 5))
+                },
+            }
+        filas.append({
+            "id": i,
+            "voluntario_id": _sesgado(rng, voluntarios),
+            "estado": estado,
+            "parametros": PARAMETROS_ANALISIS,
+            "resultado": None if resultado is None else comprimir_json(resultado),
+            "error": "Tiempo de espera agotado en n8n" if estado == AnalysisStatus.FAILED else None,
+            "fecha_creacion": creado,
+            "fecha_actualizacion": None if estado == AnalysisStatus.PENDING else creado + timedelta(minutes=rng.randint(1, 30)),
+        })
+    return {"volunteer_analysis": filas}
+
+
+# Generador de cada tabla principal, en orden compatible con las claves foráneas
+TABLAS: Dict[str, Callable] = {
+    "Usuarios": _usuarios,
+    "Voluntarios": _voluntarios,
+    "Eventos": _eventos,
+    "Asignaciones": _asignaciones,
+    "feedback": _feedback,
+    "volunteer_analysis": _volunteer_analysis,
+}
+
+
+def generar_trozo(tabla: str, inicio: int, fin: int, contexto: Contexto) -> Dict[str, List[dict]]:
+    """
+    Filas con IDs en [inicio, fin) de ``tabla``, agrupadas por la tabla en la
+    que se insertan (los voluntarios traen también su índice de habilidades).
+    """
+    rng = random.Random(f"{contexto.semilla}:{tabla}:{inicio}")
+    return TABLAS[tabla](rng, contexto, inicio, fin)
+
+
+def trozos(tamanos: Dict[str, int], tamano_trozo: int):
+    """(tabla, inicio, fin) de todos los trozos, tabla a tabla en el orden de ``TABLAS``."""
+    for tabla in TABLAS:
+        for inicio in range(1, tamanos[tabla] + 1, tamano_trozo):
+            yield tabla, inicio, min(inicio + tamano_trozo, tamanos[tabla] + 1)
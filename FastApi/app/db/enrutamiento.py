@@ -0,0 +1,119 @@
+"""
+Enrutamiento de sesiones entre la base de datos primaria y sus réplicas.
+
+Las sesiones creadas con ``replica=True`` en ``info`` envían sus SELECT a una
+réplica (por turnos si hay varias). Todo lo demás va a la primaria: los flush,
+los INSERT/UPDATE/DELETE y cualquier lectura posterior a una escritura dentro
+de la misma sesión.
+
+Para leer lo que uno acaba de escribir aunque la réplica vaya con retraso,
+``enrutar_peticion`` marca con una cookie al cliente que ha escrito y, durante
+``DB_LECTURA_PEGAJOSA_SEGUNDOS``, sus lecturas también van a la primaria.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import cycle
+from typing import Optional, Sequence
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.escritura import SesionSerializada
+
+COOKIE_ESCRITURA = "db_escritura_reciente"
+METODOS_LECTURA = ("GET", "HEAD")
+
+
+@dataclass
+class EstadoPeticion:
+    metodo: str
+    pegajosa: bool
+    escrito: bool = False
+
+
+_estado_peticion: ContextVar[Optional[EstadoPeticion]] = ContextVar("estado_peticion", default=None)
+
+
+def usar_replica(solo_lectura: bool = True) -> bool:
+    """
+    Indica si una sesión de la petición actual puede leer de una réplica: no
+    si el cliente escribió hace poco ni si esta misma petición ya ha escrito.
+    """
+    if not solo_lectura:
+        return False
+    estado = _estado_peticion.get()
+    return estado is None or not (estado.pegajosa or estado.escrito)
+
+
+def lectura_de_la_peticion() -> bool:
+    """La petición HTTP actual es de sólo lectura (GET/HEAD) y no viene de una escritura reciente."""
+    estado = _estado_peticion.get()
+    return estado is not None and usar_replica(estado.metodo in METODOS_LECTURA)
+
+
+def _marcar_escritura() -> None:
+    estado = _estado_peticion.get()
+    if estado is not None:
+        estado.escrito = True
+
+
+def crear_fabrica_sesiones(
+    primaria: AsyncEngine,
+    replicas: Sequence[AsyncEngine] = (),
+    serializar_escrituras: bool = False
+) -> sessionmaker:
+    """
+    Crea una fábrica de ``AsyncSession`` que reparte las lecturas entre
+    ``replicas``. Sin réplicas todas las sesiones usan la primaria. Con
+    ``serializar_escrituras`` las transacciones de escritura del proceso pasan
+    de una en una por la cola de ``app.db.escritura``.
+    """
+    turno = cycle([replica.sync_engine for replica in replicas]) if replicas else None
+
+    class SesionEnrutada(Session):
+        def get_bind(self, mapper=None, clause=None, **kw):
+            if self._flushing or (clause is not None and not getattr(clause, "is_select", False)):
+                self.info["escrito"] = True
+                _marcar_escritura()
+                return primaria.sync_engine
+            if turno is not None and clause is not None and self.info.get("replica") and not self.info.get("escrito"):
+                return next(turno)
+            return primaria.sync_engine
+
+    # expire_on_commit=False: los objetos devueltos tras el commit se serializan
+    # sin volver a consultar la base de datos (no hay carga perezosa en asyncio)
+    return sessionmaker(
+        primaria,
+        class_=SesionSerializada if serializar_escrituras else AsyncSession,
+        sync_session_class=SesionEnrutada,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+
+async def enrutar_peticion(request: Request, call_next):
+    """
+    Middleware HTTP: guarda el método y la cookie de escritura reciente para
+    que las sesiones de la petición elijan primaria o réplica, y renueva la
+    cookie cuando la petición ha escrito en la base de datos.
+    """
+    estado = EstadoPeticion(
+        metodo=request.method,
+        pegajosa=COOKIE_ESCRITURA in request.cookies
+    )
+    token = _estado_peticion.set(estado)
+    try:
+        response = await call_next(request)
+    finally:
+        _estado_peticion.reset(token)
+    if estado.escrito:
+        response.set_cookie(
+            COOKIE_ESCRITURA,
+            "1",
+            max_age=settings.DB_LECTURA_PEGAJOSA_SEGUNDOS,
+            httponly=True,
+            samesite="lax"
+        )
+    return response
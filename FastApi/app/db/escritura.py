@@ -0,0 +1,75 @@
+"""
+Cola de escritura única para SQLite.
+
+SQLite admite un solo escritor a la vez: con varios handlers escribiendo en
+paralelo, los que no consiguen el bloqueo esperan ``busy_timeout`` y acaban en
+"database is locked". ``SesionSerializada`` toma el turno de escritura en el
+proceso antes de su primera escritura y lo suelta al terminar la transacción
+(commit, rollback o close), así que las transacciones de escritura se ejecutan
+una tras otra en orden de llegada y las lecturas siguen en paralelo.
+"""
+import asyncio
+from weakref import WeakKeyDictionary
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Un turno por event loop: asyncio.Lock atiende a los que esperan en orden FIFO
+_turnos: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = WeakKeyDictionary()
+
+
+def turno_escritura() -> asyncio.Lock:
+    """Devuelve el turno de escritura del event loop actual."""
+    loop = asyncio.get_running_loop()
+    turno = _turnos.get(loop)
+    if turno is None:
+        turno = _turnos[loop] = asyncio.Lock()
+    return turno
+
+
+class SesionSerializada(AsyncSession):
+    """``AsyncSession`` que serializa sus transacciones de escritura con ``turno_escritura``."""
+
+    _con_turno = False
+
+    def _cambios_pendientes(self) -> bool:
+        return bool(self.new or self.dirty or self.deleted)
+
+    async def _tomar_turno(self) -> None:
+        if not self._con_turno:
+            await turno_escritura().acquire()
+            self._con_turno = True
+
+    def _soltar_turno(self) -> None:
+        if self._con_turno:
+            self._con_turno = False
+            turno_escritura().release()
+
+    async def execute(self, statement, *args, **kwargs):
+        if not getattr(statement, "is_select", False):
+            await self._tomar_turno()
+        return await super().execute(statement, *args, **kwargs)
+
+    async def flush(self, objects=None):
+        if self._cambios_pendientes():
+            await self._tomar_turno()
+        await super().flush(objects)
+
+    async def commit(self):
+        if self._cambios_pendientes():
+            await self._tomar_turno()
+        try:
+            await super().commit()
+        finally:
+            self._soltar_turno()
+
+    async def rollback(self):
+        try:
+            await super().rollback()
+        finally:
+            self._soltar_turno()
+
+    async def close(self):
+        try:
+            await super().close()
+        finally:
+            self._soltar_turno()
@@ -0,0 +1,142 @@
+"""
+Instrumentación de las consultas SQL por petición HTTP u operación GraphQL.
+
+Los eventos ``before/after_cursor_execute`` de SQLAlchemy, escuchados en la
+clase ``Engine`` (todos los engines, también los síncronos que hay debajo de
+los asíncronos), anotan cada sentencia en el ``RegistroConsultas`` de la
+petición en curso:
+
+- número de consultas y tiempo total en la base de datos;
+- sentencias con la misma forma (literales, parámetros y listas ``IN``
+  normalizados) repetidas ``DB_N_MAS_1_UMBRAL`` veces o más: candidatas a N+1;
+- consultas que tardan más de ``DB_CONSULTA_LENTA_MS``, con su SQL.
+
+Al terminar la petición ``instrumentar_peticion`` escribe un resumen JSON en
+el logger ``app.sql`` (y cada consulta lenta como warning) y, con ``DEBUG``,
+lo añade a la respuesta en las cabeceras ``X-DB-*`` y ``Server-Timing``.
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+_LISTA_IN = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_PARAMETROS = re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+")
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_ESPACIOS = re.compile(r"\s+")
+MAX_SQL_LOG = 1000
+
+
+@dataclass
+class RegistroConsultas:
+    nombre: str
+    consultas: int = 0
+    tiempo_ms: float = 0.0
+    formas: Counter = field(default_factory=Counter)
+    lentas: List[Dict] = field(default_factory=list)
+
+    def anotar(self, sentencia: str, duracion_ms: float) -> None:
+        self.consultas += 1
+        self.tiempo_ms += duracion_ms
+        self.formas[forma_sentencia(sentencia)] += 1
+        if duracion_ms >= settings.DB_CONSULTA_LENTA_MS:
+            self.lentas.append({"sql": sentencia[:MAX_SQL_LOG], "ms": round(duracion_ms, 2)})
+
+    def repetidas(self) -> Dict[str, int]:
+        """Formas de sentencia ejecutadas al menos ``DB_N_MAS_1_UMBRAL`` veces."""
+        return {forma: veces for forma, veces in self.formas.most_common() if veces >= settings.DB_N_MAS_1_UMBRAL}
+
+    def resumen(self) -> Dict:
+        return {
+            "peticion": self.nombre,
+            "consultas": self.consultas,
+            "tiempo_ms": round(self.tiempo_ms, 2),
+            "repetidas": self.repetidas(),
+            "lentas": len(self.lentas),
+        }
+
+
+_registro: ContextVar[Optional[RegistroConsultas]] = ContextVar("registro_consultas", default=None)
+
+
+def forma_sentencia(sentencia: str) -> str:
+    """SQL sin valores concretos: dos consultas con la misma forma sólo difieren en sus parámetros."""
+    forma = _PARAMETROS.sub("?", sentencia)
+    forma = _LITERALES.sub("?", forma)
+    forma = _LISTA_IN.sub("IN (?)", forma)
+    return _ESPACIOS.sub(" ", forma).strip()
+
+
+def registro_actual() -> Optional[RegistroConsultas]:
+    return _registro.get()
+
+
+@contextmanager
+def registro_activo(registro: RegistroConsultas) -> Iterator[RegistroConsultas]:
+    """Anota en ``registro`` las consultas que se ejecuten dentro del bloque."""
+    token = _registro.set(registro)
+    try:
+        yield registro
+    finally:
+        _registro.reset(token)
+
+
+# El inicio se guarda en el contexto de ejecución de la sentencia, que se
+# descarta con ella aunque falle y no se comparte entre sentencias
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _registro.get() is not None:
+        context.inicio_consulta = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    registro = _registro.get()
+    inicio = getattr(context, "inicio_consulta", None)
+    if registro is None or inicio is None:
+        return
+    registro.anotar(statement, (time.perf_counter() - inicio) * 1000)
+
+
+def registrar(registro: RegistroConsultas) -> None:
+    """Escribe el resumen y las consultas lentas de ``registro`` en el log ``app.sql``."""
+    for lenta in registro.lentas:
+        logger.warning(json.dumps({"consulta_lenta": lenta, "peticion": registro.nombre}, ensure_ascii=False))
+    logger.info(json.dumps(registro.resumen(), ensure_ascii=False))
+
+
+def cabeceras_depuracion(registro: RegistroConsultas) -> Dict[str, str]:
+    return {
+        "X-DB-Consultas": str(registro.consultas),
+        "X-DB-Tiempo-Ms": f"{registro.tiempo_ms:.2f}",
+        "X-DB-Repetidas": str(len(registro.repetidas())),
+        "X-DB-Lentas": str(len(registro.lentas)),
+        "Server-Timing": f"db;dur={registro.tiempo_ms:.2f};desc=\"{registro.consultas} consultas\"",
+    }
+
+
+async def instrumentar_peticion(request: Request, call_next):
+    """
+    Middleware HTTP: abre un registro de consultas para la petición, lo
+    escribe en el log al terminar y, con ``DEBUG``, lo resume en cabeceras.
+    """
+    registro = RegistroConsultas(nombre=f"{request.method} {request.url.path}")
+    with registro_activo(registro):
+        response = await call_next(request)
+    registrar(registro)
+    if settings.DEBUG:
+        response.headers.update(cabeceras_depuracion(registro))
+    return response
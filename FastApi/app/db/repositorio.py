@@ -0,0 +1,38 @@
+"""
+Búsquedas por clave primaria y por correo con sentencias en caché.
+
+``select(...).where(...)`` construye en cada llamada el árbol de la sentencia
+y recorre ese árbol para calcular la clave de la caché de compilación. Con
+``lambda_stmt`` SQLAlchemy analiza la lambda una sola vez, guarda la sentencia
+bajo la posición de su código y en las siguientes llamadas sólo extrae los
+valores de las variables capturadas (``correo``, ``id``) como parámetros.
+Se usa en los caminos que se repiten en cada petición: la autenticación y
+las búsquedas por ID de los endpoints (``benchmarks/consultas_por_id.py``).
+"""
+from typing import Any, Optional, Type, TypeVar
+
+from sqlalchemy import inspect, lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Usuarios
+
+Modelo = TypeVar("Modelo")
+
+
+async def usuario_por_id(db: AsyncSession, usuario_id: int) -> Optional[Usuarios]:
+    return await db.scalar(lambda_stmt(lambda: select(Usuarios).where(Usuarios.usuarios_id == usuario_id)))
+
+
+async def usuario_por_correo(db: AsyncSession, correo: str) -> Optional[Usuarios]:
+    return await db.scalar(lambda_stmt(lambda: select(Usuarios).where(Usuarios.correo == correo)))
+
+
+async def obtener_por_id(db: AsyncSession, modelo: Type[Modelo], id: Any) -> Optional[Modelo]:
+    """
+    Fila de ``modelo`` con clave primaria ``id`` o ``None``; equivale a
+    ``db.get`` pero sin mirar antes el mapa de identidad, que en una sesión
+    por petición está vacío.
+    """
+    clave = inspect(modelo).primary_key[0]
+    # modelo y clave forman parte de la clave de caché: una sentencia por modelo
+    return await db.scalar(lambda_stmt(lambda: select(modelo).where(clave == id)))
@@ -1,27 +1,11 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-# Crear el motor de SQLAlchemy
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# El engine y la fábrica de sesiones se comparten con app.database.database:
+# ambos salen del registro de engines, así que hay un único pool por URL
+from app.database.database import SessionLocal, engine, get_db
 
-# Crear una fábrica de sesiones
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
 # Base para los modelos
 Base = declarative_base()
-
-def get_db():
-    """
-    Proveedor de dependencia para obtener una sesión de base de datos.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
@@ -0,0 +1,73 @@
+"""
+DataLoaders de las relaciones de los tipos GraphQL.
+
+Cada operación recibe sus propios cargadores en el contexto
+(``obtener_contexto``). Los resolvers de ``Voluntarios.usuario``,
+``Usuarios.voluntarios``, ``Feedback.voluntario``, ``Feedback.evento`` y
+``Feedback.usuario`` piden la fila relacionada con ``load``; el DataLoader
+junta todas las claves pedidas en el mismo ciclo del event loop y las
+resuelve con una sola consulta ``IN (...)`` (una por cada
+``MAX_PARAMETROS_IN`` claves). Así una consulta anidada hace un número fijo
+de sentencias por nivel, no una por fila. La caché del cargador dura lo que
+la operación: dos filas que apuntan al mismo voluntario lo leen una vez.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+
+from app.db.async_session import sesion_lectura
+from app.models.models import Eventos, Usuarios, Voluntarios
+from app.routers.bulk import MAX_PARAMETROS_IN
+
+
+async def _filas_por_clave(modelo, columna, claves: List[int]) -> Dict[int, object]:
+    db = sesion_lectura()
+    try:
+        # Con varias filas por clave se queda la de menor ID
+        filas = await db.scalars(
+            select(modelo).where(columna.in_(claves)).order_by(*modelo.__table__.primary_key.columns)
+        )
+        resultado: Dict[int, object] = {}
+        for fila in filas:
+            resultado.setdefault(getattr(fila, columna.key), fila)
+        return resultado
+    finally:
+        await db.close()
+
+
+def _cargador(modelo, columna) -> DataLoader:
+    """DataLoader que devuelve la fila de ``modelo`` con ``columna`` igual a cada clave, o None."""
+    async def cargar(claves: List[int]) -> List[Optional[object]]:
+        filas = await _filas_por_clave(modelo, columna, claves)
+        return [filas.get(clave) for clave in claves]
+
+    return DataLoader(load_fn=cargar, max_batch_size=MAX_PARAMETROS_IN)
+
+
+@dataclass
+class Cargadores:
+    usuarios: DataLoader = field(default_factory=lambda: _cargador(Usuarios, Usuarios.usuarios_id))
+    voluntarios: DataLoader = field(default_factory=lambda: _cargador(Voluntarios, Voluntarios.voluntarios_id))
+    eventos: DataLoader = field(default_factory=lambda: _cargador(Eventos, Eventos.eventos_id))
+    voluntarios_por_usuario: DataLoader = field(default_factory=lambda: _cargador(Voluntarios, Voluntarios.usuario_id))
+
+
+async def obtener_contexto() -> Dict[str, Cargadores]:
+    """``context_getter`` del router GraphQL: cargadores nuevos para cada operación."""
+    return {"cargadores": Cargadores()}
+
+
+def cargadores(info: Info) -> Cargadores:
+    """
+    Cargadores de la operación. Fuera del router (``schema.execute``) se crean
+    al primer uso si el contexto es un dict; sin contexto no se comparten.
+    """
+    contexto = info.context
+    if not isinstance(contexto, dict):
+        return Cargadores()
+    if contexto.get("cargadores") is None:
+        contexto["cargadores"] = Cargadores()
+    return contexto["cargadores"]
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from typing import Optional
 
-from strawberry import type as strawberry_type, input as strawberry_input
+from strawberry import type as strawberry_type, input as strawberry_input, field as strawberry_field
+from strawberry.types import Info
+
+from app.graphql.cargadores import cargadores
 
 @strawberry_type
 class Usuarios:
@@ -12,7 +15,11 @@ class Usuarios:
     correo: Optional[str]
     telefono: Optional[int]
     tipo: Optional[str]
-    voluntarios: Optional["Voluntarios"] = None
+
+    @strawberry_field
+    async def voluntarios(self, info: Info) -> Optional[Voluntarios]:
+        """Voluntario del usuario (el de menor ID si tuviera varios)."""
+        return await cargadores(info).voluntarios_por_usuario.load(self.usuarios_id)
 
 
 @strawberry_input
@@ -36,7 +43,12 @@ class Voluntarios:
     habilidades: Optional[str]
     disponibilidad: Optional[str]
     usuario_id: Optional[int]
-    usuario: Optional["Usuarios"]
+
+    @strawberry_field
+    async def usuario(self, info: Info) -> Optional[Usuarios]:
+        if self.usuario_id is None:
+            return None
+        return await cargadores(info).usuarios.load(self.usuario_id)
 
 
 @strawberry_input
@@ -105,9 +117,28 @@ class Feedback:
     evento_id: Optional[int]
     calificacion: Optional[int]
     comentario: Optional[str]
-    usuario: Optional["Usuarios"] = None
-    voluntario: Optional["Voluntarios"] = None
-    evento: Optional["Eventos"] = None
+
+    @strawberry_field
+    async def voluntario(self, info: Info) -> Optional[Voluntarios]:
+        if self.voluntario_id is None:
+            return None
+        return await cargadores(info).voluntarios.load(self.voluntario_id)
+
+    @strawberry_field
+    async def evento(self, info: Info) -> Optional[Eventos]:
+        if self.evento_id is None:
+            return None
+        return await cargadores(info).eventos.load(self.evento_id)
+
+    @strawberry_field
+    async def usuario(self, info: Info) -> Optional[Usuarios]:
+        """Usuario del voluntario que dejó el feedback."""
+        if self.voluntario_id is None:
+            return None
+        voluntario = await cargadores(info).voluntarios.load(self.voluntario_id)
+        if voluntario is None or voluntario.usuario_id is None:
+            return None
+        return await cargadores(info).usuarios.load(voluntario.usuario_id)
 
 @strawberry_input
 class FeedbackInput:
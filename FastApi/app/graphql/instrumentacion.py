@@ -0,0 +1,27 @@
+"""
+Registro de consultas SQL por operación GraphQL (ver ``app.db.instrumentacion``).
+
+Dentro de una petición HTTP la operación reutiliza el registro de la petición
+y sólo le pone nombre (``graphql <operación>``); fuera de ella, p. ej. con
+``schema.execute`` en un script, abre y escribe su propio registro.
+"""
+from strawberry.extensions import SchemaExtension
+
+from app.db.instrumentacion import RegistroConsultas, registrar, registro_activo, registro_actual
+
+
+class InstrumentacionConsultas(SchemaExtension):
+    def on_operation(self):
+        nombre = f"graphql {self.execution_context.operation_name or 'anonima'}"
+        registro = registro_actual()
+        if registro is not None:
+            registro.nombre = nombre
+            yield
+            return
+
+        registro = RegistroConsultas(nombre=nombre)
+        try:
+            with registro_activo(registro):
+                yield
+        finally:
+            registrar(registro)
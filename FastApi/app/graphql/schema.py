@@ -1,5 +1,11 @@
-from typing import List
-from app.database.database import SessionLocal
+from typing import List, Optional
+from sqlalchemy import select
+from app.db.async_session import AsyncSessionLocal, sesion_lectura
+from app.db.repositorio import obtener_por_id
+from app.routers.pagination import paginar_keyset, LIMITE_POR_DEFECTO
+from app.routers.versiones import incrementar_version
+from app.routers.resumen_feedback import recalcular_resumenes
+from app.routers.habilidades import sincronizar_habilidades, habilidades_de_voluntarios, recalcular_totales
 
 
 import strawberry
@@ -9,8 +15,9 @@ from app.graphql.definitions import Usuarios, Voluntarios, Eventos, Asignaciones
     AsignacionesDelete, FeedbackInput, FeedbackDelete
 
 from strawberry.fastapi import GraphQLRouter
-from app.routers.routers import get_usuarios, get_voluntarios, get_eventos, get_asignaciones, get_feedback,\
-    insert_usuario, update_usuario, delete_usuario, insert_voluntario, update_voluntario, delete_voluntario,\
+from app.graphql.instrumentacion import InstrumentacionConsultas
+from app.graphql.cargadores import obtener_contexto
+from app.routers.routers import insert_usuario, update_usuario, delete_usuario, insert_voluntario, update_voluntario, delete_voluntario,\
     insert_asignacion, update_asignacion, insert_evento, insert_feedback, update_asignacion, update_evento,\
     update_feedback, update_voluntario, delete_asignacion, delete_evento, delete_feedback
 
@@ -22,38 +29,42 @@ async def sleep_for_2_seconds(name: str, time: int) -> str:
 @strawberry.type
 class Query:
     @strawberry.field
-    async def get_usuarios(self) -> List[Usuarios]:
-        return await get_usuarios()
+    async def get_usuarios(self, after: Optional[int] = None, limit: int = LIMITE_POR_DEFECTO) -> List[Usuarios]:
+        from app.models.models import Usuarios as UsuariosModel
+
+        db = sesion_lectura()
+        try:
+            usuarios, _ = await paginar_keyset(db, select(UsuariosModel), UsuariosModel.usuarios_id, after, limit)
+            return usuarios
+        finally:
+            await db.close()
 
     @strawberry.field
-    async def get_voluntarios(self) -> List[Voluntarios]:
-        from app.database.database import SessionLocal
+    async def get_voluntarios(self, after: Optional[int] = None, limit: int = LIMITE_POR_DEFECTO) -> List[Voluntarios]:
         from app.models.models import Voluntarios as VoluntariosModel
         
-        db = SessionLocal()
+        db = sesion_lectura()
         try:
-            voluntarios = db.query(VoluntariosModel).all()
+            voluntarios, _ = await paginar_keyset(db, select(VoluntariosModel), VoluntariosModel.voluntarios_id, after, limit)
             return [
                 Voluntarios(
                     voluntarios_id=v.voluntarios_id,
                     habilidades=v.habilidades,
                     disponibilidad=v.disponibilidad,
-                    usuario_id=v.usuario_id,
-                    usuario=None  # This would need to be populated if needed
+                    usuario_id=v.usuario_id
                 )
                 for v in voluntarios
             ]
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.field
-    async def get_eventos(self) -> List[Eventos]:
-        from app.database.database import SessionLocal
+    async def get_eventos(self, after: Optional[int] = None, limit: int = LIMITE_POR_DEFECTO) -> List[Eventos]:
         from app.models.models import Eventos as EventosModel
         
-        db = SessionLocal()
+        db = sesion_lectura()
         try:
-            eventos = db.query(EventosModel).all()
+            eventos, _ = await paginar_keyset(db, select(EventosModel), EventosModel.eventos_id, after, limit)
             return [Eventos(
                 eventos_id=e.eventos_id,
                 nombre=e.nombre,
@@ -64,15 +75,29 @@ class Query:
                 descripcion_eventos=e.descripcion_eventos
             ) for e in eventos]
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.field
-    async def get_asignaciones(self) -> List[Asignaciones]:
-        return await get_asignaciones()
+    async def get_asignaciones(self, after: Optional[int] = None, limit: int = LIMITE_POR_DEFECTO) -> List[Asignaciones]:
+        from app.models.models import Asignaciones as AsignacionesModel
+
+        db = sesion_lectura()
+        try:
+            asignaciones, _ = await paginar_keyset(db, select(AsignacionesModel), AsignacionesModel.asignaciones_id, after, limit)
+            return asignaciones
+        finally:
+            await db.close()
 
     @strawberry.field
-    async def get_feedback(self) -> List[Feedback]:
-        return await get_feedback()
+    async def get_feedback(self, after: Optional[int] = None, limit: int = LIMITE_POR_DEFECTO) -> List[Feedback]:
+        from app.models.models import Feedback as FeedbackModel
+
+        db = sesion_lectura()
+        try:
+            feedback, _ = await paginar_keyset(db, select(FeedbackModel), FeedbackModel.feedback_id, after, limit)
+            return feedback
+        finally:
+            await db.close()
 
     @strawberry.field
     async def test_sleep_1(self) -> str:
@@ -97,7 +122,7 @@ class Mutation:
         from datetime import datetime
         import logging
 
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         logger = logging.getLogger(__name__)
         try:
             nuevo_usuario = await insert_usuario(usuario, db)
@@ -126,7 +151,7 @@ class Mutation:
 
             return nuevo_usuario
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.mutation
     async def update_usuario(self, usuario: UsuariosInput) -> Usuarios:
@@ -136,7 +161,7 @@ class Mutation:
         from app.routers.routers import update_usuario as router_update_usuario
         from app.models.schema import UsuariosModel
 
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         logger = logging.getLogger(__name__)
         try:
             # Convert the Strawberry input to a Pydantic model
@@ -188,7 +213,7 @@ class Mutation:
             logger.error(f"Error al actualizar usuario: {str(e)}")
             raise
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.mutation
     async def delete_usuario(self, usuario: UsuariosDelete) -> bool:
@@ -196,8 +221,9 @@ class Mutation:
         from datetime import datetime
         import logging
         from app.models.models import Usuarios  # Import the Usuarios model
+        from app.models.models import Voluntarios as VoluntariosModel
 
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         logger = logging.getLogger(__name__)
         try:
             # Get the user ID from the input object
@@ -206,11 +232,12 @@ class Mutation:
                 raise ValueError("User ID is required")
                 
             # Perform the deletion directly in the resolver
-            existing_usuario = db.query(Usuarios).filter(Usuarios.usuarios_id == usuario_id).first()
+            existing_usuario = await obtener_por_id(db, Usuarios, usuario_id)
             
             if existing_usuario:
-                db.delete(existing_usuario)
-                db.commit()
+                await db.delete(existing_usuario)
+                await incrementar_version(db, Usuarios.__tablename__, VoluntariosModel.__tablename__)
+                await db.commit()
                 
                 # Send notification
                 notification_data = {
@@ -233,22 +260,21 @@ class Mutation:
             return False
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error al eliminar usuario: {str(e)}")
             raise
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.mutation
     async def create_voluntario(self, voluntario: VoluntariosInput) -> Voluntarios:
         from app.websocket.client import websocket_client
         from datetime import datetime
         import logging
-        from app.database.database import SessionLocal
         from app.models.models import Voluntarios as VoluntariosModel
         from app.models.schema import VoluntariosModel as VoluntariosSchema
 
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         logger = logging.getLogger(__name__)
         
         try:
@@ -270,8 +296,11 @@ class Mutation:
             )
             
             db.add(new_voluntario)
-            db.commit()
-            db.refresh(new_voluntario)
+            await db.flush()
+            await sincronizar_habilidades(db, {new_voluntario.voluntarios_id: new_voluntario.habilidades})
+            await incrementar_version(db, VoluntariosModel.__tablename__)
+            await db.commit()
+            await db.refresh(new_voluntario)
             
             # Prepare and send notification
             notification_data = {
@@ -298,16 +327,15 @@ class Mutation:
                 voluntarios_id=new_voluntario.voluntarios_id,
                 habilidades=new_voluntario.habilidades,
                 disponibilidad=new_voluntario.disponibilidad,
-                usuario_id=new_voluntario.usuario_id,
-                usuario=None  # This would need to be populated if needed
+                usuario_id=new_voluntario.usuario_id
             )
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error al crear voluntario: {str(e)}")
             raise
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.mutation
     async def update_voluntario(self, voluntario: VoluntariosInput) -> Voluntarios:
@@ -315,16 +343,12 @@ class Mutation:
         from datetime import datetime
         import logging
         from app.models.models import Voluntarios
-        from sqlalchemy.orm import Session
-        from app.database.database import SessionLocal
 
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         logger = logging.getLogger(__name__)
         try:
             # Get the existing voluntario
-            existing_voluntario = db.query(Voluntarios).filter(
-                Voluntarios.voluntarios_id == voluntario.voluntarios_id
-            ).first()
+            existing_voluntario = await obtener_por_id(db, Voluntarios, voluntario.voluntarios_id)
 
             if not existing_voluntario:
                 raise Exception("Voluntario no encontrado")
@@ -334,8 +358,11 @@ class Mutation:
                 if value is not None and hasattr(existing_voluntario, field):
                     setattr(existing_voluntario, field, value)
 
-            db.commit()
-            db.refresh(existing_voluntario)
+            await db.flush()
+            await sincronizar_habilidades(db, {existing_voluntario.voluntarios_id: existing_voluntario.habilidades})
+            await incrementar_version(db, Voluntarios.__tablename__)
+            await db.commit()
+            await db.refresh(existing_voluntario)
 
             # Prepare and send notification
             notification_data = {
@@ -362,16 +389,15 @@ class Mutation:
                 voluntarios_id=existing_voluntario.voluntarios_id,
                 habilidades=existing_voluntario.habilidades,
                 disponibilidad=existing_voluntario.disponibilidad,
-                usuario_id=existing_voluntario.usuario_id,
-                usuario=None  # This would need to be populated if needed
+                usuario_id=existing_voluntario.usuario_id
             )
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error al actualizar voluntario: {str(e)}")
             raise
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.mutation
     async def delete_voluntario(self, voluntario: VoluntariosDelete) -> bool:
@@ -379,22 +405,25 @@ class Mutation:
         from datetime import datetime
         import logging
         from app.models.models import Voluntarios
-        from app.database.database import SessionLocal
+        from app.models.models import Asignaciones as AsignacionesModel, Feedback as FeedbackModel
 
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         logger = logging.getLogger(__name__)
         try:
             # Get the voluntario ID from the input
             voluntario_id = voluntario.voluntarios_id
             
             # Perform the deletion directly
-            existing_voluntario = db.query(Voluntarios).filter(
-                Voluntarios.voluntarios_id == voluntario_id
-            ).first()
+            existing_voluntario = await obtener_por_id(db, Voluntarios, voluntario_id)
 
             if existing_voluntario:
-                db.delete(existing_voluntario)
-                db.commit()
+                habilidades = await habilidades_de_voluntarios(db, [voluntario_id])
+                await db.delete(existing_voluntario)
+                await db.flush()
+                await recalcular_resumenes(db, voluntario_ids=[voluntario_id])
+                await recalcular_totales(db, habilidades)
+                await incrementar_version(db, Voluntarios.__tablename__, AsignacionesModel.__tablename__, FeedbackModel.__tablename__)
+                await db.commit()
 
                 # Send notification
                 notification_data = {
@@ -417,11 +446,11 @@ class Mutation:
             return False
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error al eliminar voluntario: {str(e)}")
             raise
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.mutation
     async def create_evento(self, evento: EventosInput) -> Eventos:
@@ -429,7 +458,7 @@ class Mutation:
         from datetime import datetime
         import logging
 
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         logger = logging.getLogger(__name__)
         try:
             nuevo_evento = await insert_evento(evento, db=db)
@@ -461,7 +490,7 @@ class Mutation:
             logger.error(f"Error al crear evento: {str(e)}")
             raise
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.mutation
     async def update_evento(self, evento: EventosInput) -> Eventos:
@@ -469,7 +498,7 @@ class Mutation:
         from datetime import datetime
         import logging
 
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         logger = logging.getLogger(__name__)
         try:
             evento_actualizado = await update_evento(evento, db=db)
@@ -499,7 +528,7 @@ class Mutation:
             logger.error(f"Error al actualizar evento: {str(e)}")
             raise
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.mutation
     async def delete_evento(self, evento: EventosDelete) -> bool:
@@ -507,7 +536,7 @@ class Mutation:
         from datetime import datetime
         import logging
 
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         logger = logging.getLogger(__name__)
         try:
             exito = await delete_evento(evento_id=evento.eventos_id, db=db)
@@ -534,32 +563,38 @@ class Mutation:
             logger.error(f"Error al eliminar evento: {str(e)}")
             raise
         finally:
-            db.close()
+            await db.close()
 
     @strawberry.mutation
     async def create_asignacion(self, asignacion: AsignacionesInput) -> Asignaciones:
-        return await insert_asignacion(asignacion)
+        async with AsyncSessionLocal() as db:
+            return await insert_asignacion(asignacion, db=db)
 
     @strawberry.mutation
     async def update_asignacion(self, asignacion: AsignacionesInput) -> Asignaciones:
-        return await update_asignacion(asignacion)
+        async with AsyncSessionLocal() as db:
+            return await update_asignacion(asignacion, db=db)
 
     @strawberry.mutation
     async def delete_asignacion(self, asignacion: AsignacionesDelete) -> bool:
-        return await delete_asignacion(asignacion_id=asignacion.asignaciones_id)
+        async with AsyncSessionLocal() as db:
+            return await delete_asignacion(asignacion_id=asignacion.asignaciones_id, db=db)
 
     @strawberry.mutation
     async def create_feedback(self, feedback: FeedbackInput) -> Feedback:
-        return await insert_feedback(feedback)
+        async with AsyncSessionLocal() as db:
+            return await insert_feedback(feedback, db=db)
 
     @strawberry.mutation
     async def update_feedback(self, feedback: FeedbackInput) -> Feedback:
-        return await update_feedback(feedback)
+        async with AsyncSessionLocal() as db:
+            return await update_feedback(feedback, db=db)
 
     @strawberry.mutation
     async def delete_feedback(self, feedback: FeedbackDelete) -> bool:
-        return await delete_feedback(feedback_id=feedback.feedback_id)
+        async with AsyncSessionLocal() as db:
+            return await delete_feedback(feedback_id=feedback.feedback_id, db=db)
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[InstrumentacionConsultas])
 
-graphql_app = GraphQLRouter(schema)
+graphql_app = GraphQLRouter(schema, context_getter=obtener_contexto)
@@ -1,5 +1,6 @@
-from .models import Base, Usuarios, Voluntarios, Eventos, Asignaciones, Feedback
-from .agent_models import VolunteerAnalysis, AnalysisStatus
+from .models import Base, Usuarios, Voluntarios, Eventos, Asignaciones, Feedback, VersionesTablas, \
+    ResumenFeedbackVoluntario, ResumenFeedbackEvento, Habilidades, VoluntariosHabilidades
+from .agent_models import VolunteerAnalysis, VolunteerAnalysisArchive, AnalysisStatus
 
 # Asegurarse de que todos los modelos estén importados para que SQLAlchemy los reconozca
 __all__ = [
@@ -9,6 +10,12 @@ __all__ = [
     "Eventos",
     "Asignaciones",
     "Feedback",
+    "VersionesTablas",
+    "ResumenFeedbackVoluntario",
+    "ResumenFeedbackEvento",
+    "Habilidades",
+    "VoluntariosHabilidades",
     "VolunteerAnalysis",
+    "VolunteerAnalysisArchive",
     "AnalysisStatus"
 ]
\ No newline at end of file
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.database import Base
+from app.models.json_comprimido import JSONComprimido, JSONPerezoso, comprimir_json
 from datetime import datetime
 import enum
 
@@ -18,10 +19,13 @@ class VolunteerAnalysis(Base):
     __tablename__ = "volunteer_analysis"
     
     id = Column(Integer, primary_key=True, index=True)
-    voluntario_id = Column(Integer, ForeignKey("Voluntarios.voluntarios_id"), nullable=False)
+    voluntario_id = Column(Integer, ForeignKey("Voluntarios.voluntarios_id", ondelete="CASCADE"), nullable=False)
     estado = Column(SQLAlchemyEnum(AnalysisStatus), nullable=False, default=AnalysisStatus.PENDING)
-    parametros = Column(JSON, nullable=False, default={})
-    resultado = Column(JSON, nullable=True)
+    # JSON comprimido; parametros y resultado se descomprimen al leerlos (ver json_comprimido.py)
+    parametros_comprimido = Column("parametros", JSONComprimido, nullable=False, default=comprimir_json({}))
+    resultado_comprimido = Column("resultado", JSONComprimido, nullable=True)
+    parametros = JSONPerezoso("parametros_comprimido")
+    resultado = JSONPerezoso("resultado_comprimido")
     error = Column(String, nullable=True)
     fecha_creacion = Column(DateTime, server_default=func.now(), nullable=False)
     fecha_actualizacion = Column(DateTime, onupdate=func.now(), nullable=True)
@@ -29,6 +33,34 @@ class VolunteerAnalysis(Base):
     # Relación con el modelo Voluntarios
     voluntario = relationship("Voluntarios", back_populates="analisis")
 
+    __table_args__ = (
+        # Cubre el ON DELETE CASCADE desde Voluntarios y el listado por voluntario ordenado por fecha
+        Index("ix_volunteer_analysis_voluntario_fecha", "voluntario_id", "fecha_creacion"),
+    )
+
+class VolunteerAnalysisArchive(Base):
+    """
+    Análisis antiguos que ``app.agent_flow.archivo_analisis`` saca de
+    ``volunteer_analysis``; conservan su ID original.
+    """
+    __tablename__ = "volunteer_analysis_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    voluntario_id = Column(Integer, ForeignKey("Voluntarios.voluntarios_id", ondelete="CASCADE"), nullable=False)
+    estado = Column(SQLAlchemyEnum(AnalysisStatus), nullable=False)
+    parametros_comprimido = Column("parametros", JSONComprimido, nullable=False, default=comprimir_json({}))
+    resultado_comprimido = Column("resultado", JSONComprimido, nullable=True)
+    parametros = JSONPerezoso("parametros_comprimido")
+    resultado = JSONPerezoso("resultado_comprimido")
+    error = Column(String, nullable=True)
+    fecha_creacion = Column(DateTime, nullable=False)
+    fecha_actualizacion = Column(DateTime, nullable=True)
+    fecha_archivado = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_volunteer_analysis_archive_voluntario_fecha", "voluntario_id", "fecha_creacion"),
+    )
+
 # Añadir la relación al modelo Voluntarios existente
 def add_relationship_to_volunteers():
     """
@@ -41,5 +73,6 @@ def add_relationship_to_volunteers():
         Voluntarios.analisis = relationship(
             "VolunteerAnalysis", 
             back_populates="voluntario",
-            cascade="all, delete-orphan"
+            cascade="all, delete-orphan",
+            passive_deletes=True
         )
@@ -0,0 +1,60 @@
+"""
+Conversión de la fecha y hora libres de los eventos a ``starts_at``.
+
+``Eventos.fecha`` y ``Eventos.hora`` son texto tal como lo escribe el usuario;
+``starts_at`` guarda el mismo instante como ``DateTime`` en UTC (sin zona,
+igual que el resto de fechas de la base de datos) para poder filtrar rangos
+con un índice.
+"""
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+
+FORMATOS_FECHA = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d")
+FORMATOS_HORA = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M%p", "%H")
+
+
+def _parsear(valor: str, formatos):
+    for formato in formatos:
+        try:
+            return datetime.strptime(valor, formato)
+        except ValueError:
+            continue
+    return None
+
+
+def calcular_inicio(fecha: Optional[str], hora: Optional[str] = None) -> Optional[datetime]:
+    """
+    Devuelve el inicio del evento en UTC, o ``None`` si la fecha no se puede
+    interpretar. Sin hora (o con una hora ilegible) se toma el comienzo del día.
+    La fecha y la hora se interpretan en ``EVENTOS_ZONA_HORARIA``.
+    """
+    if not fecha:
+        return None
+    dia = _parsear(fecha.strip(), FORMATOS_FECHA)
+    if dia is None:
+        return None
+    hora_parseada = _parsear(hora.strip().upper(), FORMATOS_HORA) if hora else None
+    inicio = datetime.combine(dia.date(), hora_parseada.time() if hora_parseada else time())
+    local = inicio.replace(tzinfo=ZoneInfo(settings.EVENTOS_ZONA_HORARIA))
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def inicio_por_defecto(context) -> Optional[datetime]:
+    """Valor por defecto de ``starts_at`` en los INSERT, también en los ``executemany`` en lote."""
+    parametros = context.get_current_parameters()
+    return calcular_inicio(parametros.get("fecha"), parametros.get("hora"))
+
+
+def inicio_de_hoy() -> datetime:
+    """Comienzo del día de hoy en ``EVENTOS_ZONA_HORARIA``, en UTC."""
+    hoy = datetime.now(ZoneInfo(settings.EVENTOS_ZONA_HORARIA)).date()
+    return calcular_inicio(hoy.isoformat())
+
+
+def rango_proximos_dias(dias: int) -> Tuple[datetime, datetime]:
+    """Intervalo [ahora, ahora + ``dias``) en UTC para filtrar ``starts_at``."""
+    ahora = datetime.utcnow()
+    return ahora, ahora + timedelta(days=dias)
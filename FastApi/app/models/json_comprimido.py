@@ -0,0 +1,82 @@
+"""
+JSON comprimido con decodificación perezosa, para las columnas ``resultado``
+y ``parametros`` de los análisis de voluntarios (texto en español muy
+repetitivo que zlib reduce varias veces).
+
+En la base de datos cada valor es un binario con un byte de cabecera que
+indica el formato del resto:
+
+- ``0x00``: JSON en UTF-8 sin comprimir (valores pequeños, donde zlib no ahorra);
+- ``0x01``: JSON en UTF-8 comprimido con zlib.
+
+La columna (``JSONComprimido``) devuelve los bytes tal cual; el descriptor
+``JSONPerezoso`` los descomprime la primera vez que se lee el atributo y
+guarda el resultado en la instancia. Cargar un análisis para leer sólo su
+estado no descomprime nada.
+"""
+import json
+import zlib
+from typing import Any, Optional
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+SIN_COMPRIMIR = b"\x00"
+ZLIB = b"\x01"
+NIVEL_ZLIB = 6
+
+
+def comprimir_json(valor: Any) -> bytes:
+    """Serializa ``valor`` a JSON y lo comprime si así ocupa menos."""
+    texto = json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    comprimido = zlib.compress(texto, NIVEL_ZLIB)
+    if len(comprimido) < len(texto):
+        return ZLIB + comprimido
+    return SIN_COMPRIMIR + texto
+
+
+def descomprimir_json(datos: Optional[bytes]) -> Any:
+    if datos is None:
+        return None
+    cabecera, cuerpo = datos[:1], datos[1:]
+    if cabecera == ZLIB:
+        cuerpo = zlib.decompress(cuerpo)
+    elif cabecera != SIN_COMPRIMIR:
+        raise ValueError(f"Cabecera de JSON comprimido desconocida: {cabecera!r}")
+    return json.loads(cuerpo)
+
+
+class JSONComprimido(TypeDecorator):
+    """Binario con JSON comprimido; acepta valores JSON o bytes ya comprimidos y devuelve bytes."""
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, bytes):
+            return value
+        return comprimir_json(value)
+
+
+class JSONPerezoso:
+    """
+    Atributo JSON respaldado por una columna ``JSONComprimido``: al leerlo se
+    descomprime una vez por instancia; al asignarlo se comprime en la columna.
+    """
+
+    def __init__(self, columna: str):
+        self.columna = columna
+        self.cache = f"_{columna}_decodificado"
+
+    def __get__(self, instancia, propietario):
+        if instancia is None:
+            return self
+        datos = getattr(instancia, self.columna)
+        guardado = instancia.__dict__.get(self.cache)
+        # Se vuelve a decodificar si la columna ha cambiado (refresh, nueva carga)
+        if guardado is None or guardado[0] is not datos:
+            guardado = (datos, descomprimir_json(datos))
+            instancia.__dict__[self.cache] = guardado
+        return guardado[1]
+
+    def __set__(self, instancia, valor):
+        setattr(instancia, self.columna, None if valor is None else comprimir_json(valor))
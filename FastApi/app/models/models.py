@@ -1,8 +1,11 @@
+from datetime import datetime
 from typing import List
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, DateTime, Float, Index, event, inspect
 from sqlalchemy.orm import relationship
 from sqlalchemy.util import u
 from app.database.database import Base
+from app.models.fechas import calcular_inicio, inicio_por_defecto
+from app.models.texto_completo import crear_indice_texto, borrar_indice_texto
 from passlib.context import CryptContext
 
 # Configuración para el hashing de contraseñas
@@ -16,13 +19,13 @@ class Usuarios(Base):
     apellido = Column(String(100), nullable=False)
     correo = Column(String(100), unique=True, nullable=False, index=True)
     telefono = Column(String(20))
-    tipo = Column(String(50), nullable=False)  # Ejemplo: 'admin', 'voluntario', 'organizador'
+    tipo = Column(String(50), nullable=False, index=True)  # Ejemplo: 'admin', 'voluntario', 'organizador'
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     
     # Relaciones
-    voluntarios = relationship("Voluntarios", back_populates="usuario")
+    voluntarios = relationship("Voluntarios", back_populates="usuario", passive_deletes=True)
 
     def set_password(self, password: str):
         self.hashed_password = pwd_context.hash(password)
@@ -35,41 +38,104 @@ class Voluntarios(Base):
     voluntarios_id = Column(Integer, primary_key=True)
     habilidades = Column(String)
     disponibilidad = Column(String)
-    usuario_id = Column(Integer, ForeignKey("Usuarios.usuarios_id"))
+    usuario_id = Column(Integer, ForeignKey("Usuarios.usuarios_id", ondelete="SET NULL"), index=True)
     usuario = relationship("Usuarios", back_populates="voluntarios")
-    asignaciones = relationship("Asignaciones", back_populates="voluntario")
-    feedback = relationship("Feedback", back_populates="voluntario")
-    analisis = relationship("VolunteerAnalysis", back_populates="voluntario", cascade="all, delete-orphan")
+    # passive_deletes: el borrado de las filas hijas lo resuelve la base de datos (ON DELETE)
+    asignaciones = relationship("Asignaciones", back_populates="voluntario", passive_deletes=True)
+    feedback = relationship("Feedback", back_populates="voluntario", passive_deletes=True)
+    analisis = relationship("VolunteerAnalysis", back_populates="voluntario", cascade="all, delete-orphan", passive_deletes=True)
 
 class Eventos(Base):
     __tablename__ = "Eventos"
     eventos_id = Column(Integer, primary_key=True)
     nombre = Column(String)
-    fecha = Column(String)
+    fecha = Column(String, index=True)
     hora = Column(String)
+    # fecha + hora en UTC, calculado al insertar o al cambiar fecha u hora
+    starts_at = Column(DateTime, default=inicio_por_defecto, index=True)
     ubicacion = Column(String)
     voluntarios_necesarios = Column(Integer)
     descripcion_eventos = Column(Text)
-    asignaciones = relationship("Asignaciones", back_populates="evento")
-    feedback = relationship("Feedback", back_populates="evento")
+    asignaciones = relationship("Asignaciones", back_populates="evento", passive_deletes=True)
+    feedback = relationship("Feedback", back_populates="evento", passive_deletes=True)
+
+
+@event.listens_for(Eventos, "before_update")
+def _actualizar_starts_at(mapper, connection, evento):
+    estado = inspect(evento)
+    if estado.attrs.fecha.history.has_changes() or estado.attrs.hora.history.has_changes():
+        evento.starts_at = calcular_inicio(evento.fecha, evento.hora)
 
 class Asignaciones(Base):
     __tablename__ = "Asignaciones"
     asignaciones_id = Column(Integer, primary_key=True)
-    evento_id = Column(Integer, ForeignKey("Eventos.eventos_id"))
-    voluntario_id = Column(Integer, ForeignKey("Voluntarios.voluntarios_id"))
+    evento_id = Column(Integer, ForeignKey("Eventos.eventos_id", ondelete="CASCADE"))
+    voluntario_id = Column(Integer, ForeignKey("Voluntarios.voluntarios_id", ondelete="CASCADE"), index=True)
     rol = Column(String)
-    estado = Column(String)
+    estado = Column(String, index=True)
     fecha_asignacion = Column(String)
     evento = relationship("Eventos", back_populates="asignaciones")
     voluntario = relationship("Voluntarios", back_populates="asignaciones")
+
+    __table_args__ = (
+        # Cubre el filtro y el ON DELETE por evento y el resumen de personal
+        # agrupado por (evento, estado) sin leer la tabla
+        Index("ix_Asignaciones_evento_estado", "evento_id", "estado"),
+    )
     
 class Feedback(Base):
     __tablename__ = "feedback"
     feedback_id = Column(Integer, primary_key=True)
-    evento_id = Column(Integer, ForeignKey("Eventos.eventos_id"))
-    voluntario_id = Column(Integer, ForeignKey("Voluntarios.voluntarios_id"))
+    evento_id = Column(Integer, ForeignKey("Eventos.eventos_id", ondelete="SET NULL"), index=True)
+    voluntario_id = Column(Integer, ForeignKey("Voluntarios.voluntarios_id", ondelete="SET NULL"), index=True)
     calificacion = Column(Integer)
     comentario = Column(Text)
+    fecha_creacion = Column(DateTime, default=datetime.utcnow)
     evento = relationship("Eventos", back_populates="feedback")
     voluntario = relationship("Voluntarios", back_populates="feedback")
+
+# Índices de texto completo de descripcion_eventos y comentario (ver app.models.texto_completo)
+for _tabla in (Eventos.__table__, Feedback.__table__):
+    event.listen(_tabla, "after_create", crear_indice_texto)
+    event.listen(_tabla, "before_drop", borrar_indice_texto)
+
+class VersionesTablas(Base):
+    """Contador de cambios por tabla, usado para los ETag de los listados."""
+    __tablename__ = "versiones_tablas"
+    tabla = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class ResumenFeedbackVoluntario(Base):
+    """Agregados de feedback por voluntario, mantenidos al escribir feedback."""
+    __tablename__ = "resumen_feedback_voluntario"
+    voluntario_id = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    suma = Column(Integer, nullable=False, default=0)
+    promedio = Column(Float, index=True)
+    ultima_fecha = Column(DateTime)
+
+class ResumenFeedbackEvento(Base):
+    """Agregados de feedback por evento, mantenidos al escribir feedback."""
+    __tablename__ = "resumen_feedback_evento"
+    evento_id = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    suma = Column(Integer, nullable=False, default=0)
+    promedio = Column(Float, index=True)
+    ultima_fecha = Column(DateTime)
+
+class Habilidades(Base):
+    """Catálogo de habilidades normalizadas (minúsculas, espacios simples)."""
+    __tablename__ = "habilidades"
+    habilidades_id = Column(Integer, primary_key=True)
+    nombre = Column(String(100), unique=True, nullable=False, index=True)
+    # Longitud de la lista de voluntarios de la habilidad: la búsqueda empieza por la más corta
+    total_voluntarios = Column(Integer, nullable=False, default=0)
+
+class VoluntariosHabilidades(Base):
+    """
+    Índice invertido habilidad -> voluntarios. La clave primaria
+    (habilidad_id, voluntario_id) guarda cada lista ordenada por voluntario.
+    """
+    __tablename__ = "voluntarios_habilidades"
+    habilidad_id = Column(Integer, ForeignKey("habilidades.habilidades_id", ondelete="CASCADE"), primary_key=True)
+    voluntario_id = Column(Integer, ForeignKey("Voluntarios.voluntarios_id", ondelete="CASCADE"), primary_key=True, index=True)
@@ -30,9 +30,9 @@ class EventosModel:
     nombre: Optional[str]
     fecha: Optional[str]
     hora: Optional[str]
-    lugar: Optional[str]
-    tipo: Optional[str]
-    estado: Optional[str]
+    ubicacion: Optional[str]
+    voluntarios_necesarios: Optional[int]
+    descripcion_eventos: Optional[str] = None
 
 
 @dataclass
@@ -41,6 +41,16 @@ class AsignacionesModel:
     voluntario_id: Optional[int]
     evento_id: Optional[int]
     estado: Optional[str]
+    rol: Optional[str] = None
+    fecha_asignacion: Optional[str] = None
+
+
+@dataclass
+class TransicionEstadoAsignacionesModel:
+    estado: str
+    asignaciones_ids: Optional[List[int]] = None
+    evento_id: Optional[int] = None
+    estado_actual: Optional[str] = None
 
 
 @dataclass
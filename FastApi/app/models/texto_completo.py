@@ -0,0 +1,101 @@
+"""
+Índices de texto completo sobre la descripción de los eventos y los
+comentarios de feedback.
+
+- SQLite: una tabla virtual FTS5 de contenido externo por columna
+  (``eventos_fts``, ``feedback_fts``) que guarda sólo el índice; tres triggers
+  la mantienen al insertar, actualizar y borrar filas de la tabla original.
+- PostgreSQL: un índice GIN sobre ``to_tsvector`` de la columna. No necesita
+  triggers: la consulta usa la misma expresión y el planificador usa el índice.
+
+Se crean junto a las tablas (``after_create``) y en la migración. En SQLite
+borrar una tabla borra sus triggers: una migración que recree ``Eventos`` o
+``feedback`` (p. ej. ``batch_alter_table``) debe volver a llamar a
+``crear_indice_texto`` y reconstruir el índice con ``reconstruir_indice_texto``.
+"""
+from dataclasses import dataclass
+from typing import List
+
+from sqlalchemy import Table
+
+# Configuración de búsqueda de PostgreSQL; la consulta debe usar la misma
+# para que coincida con la expresión indexada
+CONFIGURACION_PG = "spanish"
+
+
+@dataclass(frozen=True)
+class IndiceTexto:
+    nombre: str
+    tabla: str
+    clave: str
+    columna: str
+
+
+INDICES_TEXTO = {
+    "Eventos": IndiceTexto("eventos_fts", "Eventos", "eventos_id", "descripcion_eventos"),
+    "feedback": IndiceTexto("feedback_fts", "feedback", "feedback_id", "comentario"),
+}
+
+# Tablas internas que FTS5 crea para cada tabla virtual
+_SUFIJOS_FTS5 = ("", "_data", "_idx", "_docsize", "_config", "_content")
+
+
+def _sentencias_sqlite(indice: IndiceTexto) -> List[str]:
+    n, t, k, c = indice.nombre, indice.tabla, indice.clave, indice.columna
+    return [
+        f"CREATE VIRTUAL TABLE {n} USING fts5("
+        f"{c}, content='{t}', content_rowid='{k}', tokenize='unicode61 remove_diacritics 2')",
+        f'CREATE TRIGGER {n}_ai AFTER INSERT ON "{t}" BEGIN '
+        f"INSERT INTO {n}(rowid, {c}) VALUES (new.{k}, new.{c}); END",
+        f'CREATE TRIGGER {n}_ad AFTER DELETE ON "{t}" BEGIN '
+        f"INSERT INTO {n}({n}, rowid, {c}) VALUES ('delete', old.{k}, old.{c}); END",
+        f'CREATE TRIGGER {n}_au AFTER UPDATE OF {k}, {c} ON "{t}" BEGIN '
+        f"INSERT INTO {n}({n}, rowid, {c}) VALUES ('delete', old.{k}, old.{c}); "
+        f"INSERT INTO {n}(rowid, {c}) VALUES (new.{k}, new.{c}); END",
+    ]
+
+
+def _sentencias_postgresql(indice: IndiceTexto) -> List[str]:
+    return [
+        f'CREATE INDEX IF NOT EXISTS ix_{indice.nombre} ON "{indice.tabla}" USING GIN '
+        f"(to_tsvector('{CONFIGURACION_PG}', coalesce({indice.columna}, '')))"
+    ]
+
+
+def crear_indice_texto(tabla: Table, connection, **kw) -> None:
+    """Crea el índice de texto completo de ``tabla`` en el dialecto de ``connection``."""
+    indice = INDICES_TEXTO[tabla.name]
+    if connection.dialect.name == "sqlite":
+        sentencias = _sentencias_sqlite(indice)
+    elif connection.dialect.name == "postgresql":
+        sentencias = _sentencias_postgresql(indice)
+    else:
+        return
+    for sentencia in sentencias:
+        connection.exec_driver_sql(sentencia)
+
+
+def borrar_indice_texto(tabla: Table, connection, **kw) -> None:
+    """Borra el índice de texto completo de ``tabla`` (y sus triggers en SQLite)."""
+    indice = INDICES_TEXTO[tabla.name]
+    if connection.dialect.name == "sqlite":
+        for sufijo in ("ai", "ad", "au"):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {indice.nombre}_{sufijo}")
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {indice.nombre}")
+    elif connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{indice.nombre}")
+
+
+def reconstruir_indice_texto(tabla: Table, connection) -> None:
+    """Vuelve a indexar en FTS5 las filas que ya tenía la tabla (no hace falta en PostgreSQL)."""
+    indice = INDICES_TEXTO[tabla.name]
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"INSERT INTO {indice.nombre}({indice.nombre}) VALUES ('rebuild')")
+
+
+def es_objeto_texto_completo(nombre: str) -> bool:
+    """Tablas e índices de texto completo, que no están en los metadatos de los modelos."""
+    return any(
+        nombre in (f"{indice.nombre}{sufijo}" for sufijo in _SUFIJOS_FTS5) or nombre == f"ix_{indice.nombre}"
+        for indice in INDICES_TEXTO.values()
+    )
@@ -0,0 +1,203 @@
+"""
+Inserción y borrado masivos para los endpoints en lote.
+
+Las filas se validan por adelantado con una consulta ``IN (...)`` por lote
+(IDs repetidos y claves foráneas inexistentes) y las válidas se insertan con
+``executemany`` dentro de una única transacción. Si un lote falla en la base de
+datos se reintenta fila a fila con SAVEPOINTs para poder informar el error de
+cada una sin perder el resto.
+
+El borrado en lote ejecuta un ``DELETE ... WHERE pk IN (...)`` por trozo sin
+cargar objetos ORM; las filas dependientes las resuelven las claves foráneas
+con ``ON DELETE CASCADE`` / ``SET NULL``.
+"""
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.routers.versiones import incrementar_version
+
+# Filas por sentencia executemany
+TAMANO_LOTE = 500
+# Máximo de filas aceptadas en una petición
+MAX_FILAS_POR_PETICION = 10000
+# Parámetros por cláusula IN (SQLite admite 999 en versiones antiguas)
+MAX_PARAMETROS_IN = 900
+# insert() con ON CONFLICT de cada dialecto que lo admite
+INSERT_CON_CONFLICTO = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+async def _valores_existentes(db: AsyncSession, columna, valores: Iterable[Any]) -> Set[Any]:
+    """Devuelve cuáles de ``valores`` ya existen en ``columna``."""
+    valores = list(valores)
+    existentes = set()
+    for inicio in range(0, len(valores), MAX_PARAMETROS_IN):
+        trozo = valores[inicio:inicio + MAX_PARAMETROS_IN]
+        resultado = await db.execute(select(columna).where(columna.in_(trozo)))
+        existentes.update(resultado.scalars())
+    return existentes
+
+
+async def referencias_inexistentes(db: AsyncSession, modelo, fila: Dict[str, Any]) -> List[str]:
+    """Error de cada clave foránea de ``fila`` que apunta a una fila inexistente."""
+    errores = []
+    for columna in modelo.__table__.columns:
+        valor = fila.get(columna.name)
+        if valor is None:
+            continue
+        for clave_foranea in columna.foreign_keys:
+            if not await _valores_existentes(db, clave_foranea.column, [valor]):
+                errores.append(f"{columna.name} {valor} no existe")
+    return errores
+
+
+async def insertar_en_lote(
+    db: AsyncSession,
+    modelo,
+    filas: List[Dict[str, Any]],
+    al_insertar: Optional[Callable[[AsyncSession, List[Dict[str, Any]]], Awaitable[None]]] = None
+) -> Dict[str, Any]:
+    """
+    Inserta ``filas`` en la tabla de ``modelo`` y devuelve un informe por fila.
+
+    Args:
+        db: Sesión asíncrona de base de datos
+        modelo: Modelo SQLAlchemy de destino
+        filas: Diccionarios con los valores de cada fila (las claves que no son
+            columnas del modelo se ignoran)
+        al_insertar: Función opcional que recibe las filas insertadas y se
+            ejecuta antes del commit, en la misma transacción
+
+    Returns:
+        Dict con el total, creados, fallidos y el resultado de cada fila
+    """
+    tabla = modelo.__table__
+    columna_pk = list(tabla.primary_key.columns)[0]
+    nombres_columnas = {columna.name for columna in tabla.columns}
+
+    resultados: List[Dict[str, Any]] = []
+    candidatas = []
+    vistos = set()
+    for indice, fila in enumerate(filas):
+        fila = {clave: valor for clave, valor in fila.items() if clave in nombres_columnas}
+        id_fila = fila.get(columna_pk.name)
+        resultados.append({"indice": indice, "id": id_fila, "ok": False, "error": None})
+        if id_fila in vistos:
+            resultados[indice]["error"] = f"{columna_pk.name} {id_fila} repetido en la petición"
+            continue
+        vistos.add(id_fila)
+        candidatas.append((indice, fila))
+
+    # IDs que ya existen en la tabla
+    existentes = await _valores_existentes(db, columna_pk, [fila[columna_pk.name] for _, fila in candidatas])
+    validas = []
+    for indice, fila in candidatas:
+        if fila[columna_pk.name] in existentes:
+            resultados[indice]["error"] = f"{columna_pk.name} {fila[columna_pk.name]} ya existe"
+        else:
+            validas.append((indice, fila))
+
+    # Claves foráneas que apuntan a filas inexistentes
+    for columna in tabla.columns:
+        for clave_foranea in columna.foreign_keys:
+            referenciados = {fila[columna.name] for _, fila in validas if fila.get(columna.name) is not None}
+            if not referenciados:
+                continue
+            encontrados = await _valores_existentes(db, clave_foranea.column, referenciados)
+            restantes = []
+            for indice, fila in validas:
+                valor = fila.get(columna.name)
+                if valor is not None and valor not in encontrados:
+                    resultados[indice]["error"] = f"{columna.name} {valor} no existe"
+                else:
+                    restantes.append((indice, fila))
+            validas = restantes
+
+    try:
+        for inicio in range(0, len(validas), TAMANO_LOTE):
+            lote = validas[inicio:inicio + TAMANO_LOTE]
+            try:
+                async with db.begin_nested():
+                    await db.execute(insert(tabla), [fila for _, fila in lote])
+                for indice, _ in lote:
+                    resultados[indice]["ok"] = True
+            except IntegrityError:
+                # Reintentar fila a fila para aislar las que fallan
+                for indice, fila in lote:
+                    try:
+                        async with db.begin_nested():
+                            await db.execute(insert(tabla).values(**fila))
+                        resultados[indice]["ok"] = True
+                    except IntegrityError as e:
+                        resultados[indice]["error"] = str(e.orig)
+        insertadas = [fila for indice, fila in validas if resultados[indice]["ok"]]
+        if insertadas:
+            await incrementar_version(db, tabla.name)
+            if al_insertar is not None:
+                await al_insertar(db, insertadas)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    creados = sum(1 for resultado in resultados if resultado["ok"])
+    return {
+        "total": len(resultados),
+        "creados": creados,
+        "fallidos": len(resultados) - creados,
+        "resultados": resultados
+    }
+
+
+def _tablas_dependientes(tabla) -> List[str]:
+    """Tablas con claves foráneas hacia ``tabla`` (afectadas por sus ON DELETE)."""
+    return [
+        otra.name for otra in tabla.metadata.sorted_tables
+        if any(clave_foranea.column.table is tabla for clave_foranea in otra.foreign_keys)
+    ]
+
+
+async def borrar_en_lote(
+    db: AsyncSession,
+    modelo,
+    ids: List[Any],
+    al_borrar: Optional[Callable[[AsyncSession, List[Any]], Awaitable[None]]] = None
+) -> Dict[str, Any]:
+    """
+    Borra las filas de ``modelo`` cuyos IDs están en ``ids`` en una única transacción.
+
+    Args:
+        db: Sesión asíncrona de base de datos
+        modelo: Modelo SQLAlchemy de destino
+        ids: Claves primarias a borrar (las inexistentes se ignoran)
+        al_borrar: Función opcional que recibe los IDs y se ejecuta tras el
+            borrado, antes del commit
+
+    Returns:
+        Dict con los IDs solicitados y las filas realmente borradas
+    """
+    tabla = modelo.__table__
+    columna_pk = list(tabla.primary_key.columns)[0]
+    ids = list(dict.fromkeys(ids))
+
+    borrados = 0
+    try:
+        for inicio in range(0, len(ids), MAX_PARAMETROS_IN):
+            trozo = ids[inicio:inicio + MAX_PARAMETROS_IN]
+            resultado = await db.execute(
+                delete(tabla).where(columna_pk.in_(trozo)).execution_options(synchronize_session=False)
+            )
+            borrados += resultado.rowcount
+        if borrados:
+            await incrementar_version(db, tabla.name, *_tablas_dependientes(tabla))
+            if al_borrar is not None:
+                await al_borrar(db, ids)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    return {"solicitados": len(ids), "borrados": borrados}
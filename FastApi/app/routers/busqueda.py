@@ -0,0 +1,115 @@
+"""
+Búsqueda de texto completo en la descripción de los eventos y en los
+comentarios de feedback, ordenada por relevancia y con un fragmento del texto
+donde aparecen las palabras buscadas.
+
+Usa los índices de ``app.models.texto_completo``: ``MATCH`` + ``bm25`` +
+``snippet`` de FTS5 en SQLite y ``@@`` + ``ts_rank_cd`` + ``ts_headline`` en
+PostgreSQL. En los dos casos se buscan filas que contengan todas las palabras.
+"""
+import html
+import re
+from typing import List, Optional
+
+from sqlalchemy import func, literal_column, select, table, column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.models.models import Eventos, Feedback
+from app.models.texto_completo import CONFIGURACION_PG, INDICES_TEXTO
+
+PALABRAS = re.compile(r"\w+")
+# Palabras vacías: aparecen en casi todos los comentarios y obligarían a puntuar
+# con bm25 la tabla entera. PostgreSQL ya las descarta con la configuración 'spanish'
+PALABRAS_VACIAS = frozenset(
+    "a al algo con de del e el en era es esta este fue ha hay la las le lo los me mi muy "
+    "ni no o para pero por que se sin su sus un una uno y ya".split()
+)
+ELIPSIS = "…"
+# La base de datos marca las palabras con caracteres de uso privado: el texto
+# se escapa entero en Python y después se cambian por <b> y </b>, de modo que
+# el HTML de un comentario nunca llega sin escapar al fragmento
+MARCA_INICIO, MARCA_FIN = "\ue000", "\ue001"
+PALABRAS_FRAGMENTO = 12
+
+
+def palabras_busqueda(texto: str) -> List[str]:
+    """Palabras del texto buscado; se descartan comillas, operadores y palabras vacías."""
+    return [palabra for palabra in PALABRAS.findall(texto) if palabra.casefold() not in PALABRAS_VACIAS]
+
+
+def fragmento_html(fragmento: Optional[str]) -> Optional[str]:
+    """Fragmento escapado como HTML con las palabras encontradas entre ``<b>`` y ``</b>``."""
+    if fragmento is None:
+        return None
+    return html.escape(fragmento).replace(MARCA_INICIO, "<b>").replace(MARCA_FIN, "</b>")
+
+
+def _consulta_fts5(palabras: List[str], modelo, columnas, limite: int) -> Select:
+    indice = INDICES_TEXTO[modelo.__tablename__]
+    fts = table(indice.nombre, column("rowid"))
+    tabla_fts = literal_column(indice.nombre)
+    # Cada palabra entre comillas: MATCH no interpreta AND/OR/NEAR ni '-' del usuario
+    expresion = " ".join('"{}"'.format(palabra) for palabra in palabras)
+    # bm25 es menor cuanto más relevante; se cambia de signo para ordenar de mayor a menor
+    relevancia = (-func.bm25(tabla_fts)).label("relevancia")
+    fragmento = func.snippet(tabla_fts, 0, MARCA_INICIO, MARCA_FIN, ELIPSIS, PALABRAS_FRAGMENTO).label("fragmento")
+    clave = getattr(modelo, indice.clave)
+    return (
+        select(*columnas, fragmento, relevancia)
+        .select_from(fts)
+        .join(modelo, clave == fts.c.rowid)
+        .where(tabla_fts.op("MATCH")(expresion))
+        .order_by(relevancia.desc(), clave)
+        .limit(limite)
+    )
+
+
+def _consulta_postgresql(palabras: List[str], modelo, columnas, limite: int) -> Select:
+    indice = INDICES_TEXTO[modelo.__tablename__]
+    texto = getattr(modelo, indice.columna)
+    # Configuración y coalesce como literales para que la expresión coincida con la del índice GIN
+    configuracion = literal_column(f"'{CONFIGURACION_PG}'")
+    vector = func.to_tsvector(configuracion, func.coalesce(texto, literal_column("''")))
+    consulta = func.plainto_tsquery(configuracion, " ".join(palabras))
+    relevancia = func.ts_rank_cd(vector, consulta).label("relevancia")
+    fragmento = func.ts_headline(
+        configuracion, texto, consulta,
+        f"StartSel={MARCA_INICIO}, StopSel={MARCA_FIN}, FragmentDelimiter={ELIPSIS}, "
+        f"MaxFragments=1, MaxWords={PALABRAS_FRAGMENTO}, MinWords={PALABRAS_FRAGMENTO // 2}"
+    ).label("fragmento")
+    clave = getattr(modelo, indice.clave)
+    return (
+        select(*columnas, fragmento, relevancia)
+        .where(vector.op("@@")(consulta))
+        .order_by(relevancia.desc(), clave)
+        .limit(limite)
+    )
+
+
+async def buscar_texto(db: AsyncSession, modelo, columnas, texto: str, limite: int) -> Optional[list]:
+    """
+    Filas de ``modelo`` cuyo texto indexado contiene todas las palabras de
+    ``texto``, con ``columnas`` + ``fragmento`` + ``relevancia``. Devuelve
+    ``None`` si el dialecto no tiene índice de texto completo.
+    """
+    palabras = palabras_busqueda(texto)
+    if not palabras:
+        return []
+
+    dialecto = db.bind.dialect.name
+    if dialecto == "sqlite":
+        consulta = _consulta_fts5(palabras, modelo, columnas, limite)
+    elif dialecto == "postgresql":
+        consulta = _consulta_postgresql(palabras, modelo, columnas, limite)
+    else:
+        return None
+    resultado = await db.execute(consulta)
+    filas = [dict(fila) for fila in resultado.mappings()]
+    for fila in filas:
+        fila["fragmento"] = fragmento_html(fila["fragmento"])
+    return filas
+
+
+COLUMNAS_EVENTOS = (Eventos.eventos_id, Eventos.nombre, Eventos.fecha, Eventos.starts_at)
+COLUMNAS_FEEDBACK = (Feedback.feedback_id, Feedback.evento_id, Feedback.voluntario_id, Feedback.calificacion)
@@ -0,0 +1,61 @@
+"""
+Selección de campos (``?fields=``) para los endpoints de listado y detalle.
+
+Los campos pedidos se traducen a ``load_only`` en la consulta, de modo que las
+columnas no solicitadas (en especial las de tipo Text) no se leen de la base
+de datos. La clave primaria se incluye siempre porque la usa la paginación.
+"""
+from typing import Any, List, Optional, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+def parsear_campos(fields: Optional[str], modelo, respuesta: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Valida el parámetro ``fields`` contra los campos del modelo de respuesta.
+
+    Returns:
+        Lista de campos (con la clave primaria al principio) o None si no se
+        pidió una selección
+    """
+    if not fields:
+        return None
+
+    pedidos = [campo.strip() for campo in fields.split(",") if campo.strip()]
+    desconocidos = [campo for campo in pedidos if campo not in respuesta.model_fields]
+    if desconocidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos no válidos: {', '.join(desconocidos)}"
+        )
+
+    clave_primaria = inspect(modelo).primary_key[0].key
+    campos = [clave_primaria]
+    campos.extend(campo for campo in pedidos if campo not in campos)
+    return campos
+
+
+def aplicar_campos(consulta, modelo, campos: Optional[List[str]]):
+    """Limita las columnas cargadas por ``consulta`` a ``campos``."""
+    if campos is None:
+        return consulta
+    return consulta.options(load_only(*(getattr(modelo, campo) for campo in campos)))
+
+
+def proyectar(objeto, campos: Optional[List[str]]) -> Any:
+    """
+    Convierte un objeto cargado con ``load_only`` en un diccionario con sólo
+    los campos pedidos, sin acceder a los atributos diferidos.
+    """
+    if campos is None or objeto is None:
+        return objeto
+    return {campo: getattr(objeto, campo) for campo in campos}
+
+
+def proyectar_filas(filas: List[Any], campos: Optional[List[str]]) -> List[Any]:
+    if campos is None:
+        return filas
+    return [proyectar(fila, campos) for fila in filas]
@@ -0,0 +1,98 @@
+"""
+Endpoints de exportación masiva en streaming (NDJSON / CSV).
+
+Las filas se leen con un cursor en streaming (``AsyncConnection.stream`` + ``yield_per``)
+y se escriben por lotes a través de un ``StreamingResponse``, de modo que la
+memoria usada es constante sin importar el tamaño de la tabla.
+"""
+import csv
+import io
+from typing import AsyncIterator, List
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.db.async_session import get_async_db
+from app.models.models import Voluntarios, Eventos, Asignaciones, Feedback
+
+router = APIRouter()
+
+# Filas leídas del cursor y escritas en cada fragmento de la respuesta
+TAMANO_LOTE = 1000
+
+RECURSOS_EXPORTABLES = {
+    "voluntarios": Voluntarios.__table__,
+    "eventos": Eventos.__table__,
+    "asignaciones": Asignaciones.__table__,
+    "feedback": Feedback.__table__,
+}
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def _leer_por_lotes(engine: AsyncEngine, tabla) -> AsyncIterator[List]:
+    """Recorre la tabla ordenada por clave primaria en lotes de ``TAMANO_LOTE`` filas."""
+    consulta = select(tabla).order_by(*tabla.primary_key.columns)
+    async with engine.connect() as conn:
+        resultado = await conn.stream(consulta.execution_options(yield_per=TAMANO_LOTE))
+        async for lote in resultado.partitions():
+            yield lote
+
+
+async def _generar_ndjson(engine: AsyncEngine, tabla) -> AsyncIterator[bytes]:
+    async for lote in _leer_por_lotes(engine, tabla):
+        yield b"".join(orjson.dumps(dict(fila._mapping)) + b"\n" for fila in lote)
+
+
+async def _generar_csv(engine: AsyncEngine, tabla) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # La cabecera se envía antes de ejecutar la consulta
+    writer.writerow([columna.name for columna in tabla.columns])
+    yield buffer.getvalue()
+
+    async for lote in _leer_por_lotes(engine, tabla):
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(lote)
+        yield buffer.getvalue()
+
+
+@router.get("/export/{recurso}", tags=["exportacion"])
+async def exportar_recurso(
+    recurso: str,
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Exporta todas las filas de un recurso en NDJSON o CSV.
+
+    La sesión de la petición sólo se usa para resolver el engine: el generador
+    abre su propia conexión porque el cuerpo se envía después de que la
+    dependencia ``get_async_db`` haya cerrado la sesión.
+    """
+    tabla = RECURSOS_EXPORTABLES.get(recurso)
+    if tabla is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Recurso '{recurso}' no exportable"
+        )
+
+    engine = db.bind
+    if formato == "csv":
+        contenido = _generar_csv(engine, tabla)
+    else:
+        contenido = _generar_ndjson(engine, tabla)
+
+    return StreamingResponse(
+        contenido,
+        media_type=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="{recurso}.{formato}"'}
+    )
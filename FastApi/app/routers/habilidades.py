@@ -0,0 +1,194 @@
+"""
+Habilidades normalizadas e índice invertido habilidad -> voluntarios.
+
+``Voluntarios.habilidades`` sigue siendo el texto separado por comas que envía
+el cliente; al crear o actualizar un voluntario se descompone en filas de
+``habilidades`` y ``voluntarios_habilidades``. Buscar voluntarios con varias
+habilidades es entonces una intersección de listas ordenadas: se recorre la
+lista de la habilidad menos frecuente y se comprueba cada voluntario en las
+demás por clave primaria, sin leer la tabla de voluntarios entera.
+
+Las funciones de este módulo no hacen commit: se llaman dentro de la misma
+transacción que la escritura del voluntario.
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.models import Habilidades, Voluntarios, VoluntariosHabilidades
+from app.routers.bulk import INSERT_CON_CONFLICTO, MAX_PARAMETROS_IN
+
+SEPARADORES = re.compile(r"[,;\n]")
+
+
+def normalizar_habilidad(nombre: str) -> str:
+    """Minúsculas y espacios simples: "  Trabajo  en Equipo" -> "trabajo en equipo"."""
+    return " ".join(nombre.split()).casefold()
+
+
+def separar_habilidades(texto: Optional[str]) -> List[str]:
+    """Habilidades normalizadas y sin repetir de un texto separado por comas."""
+    if not texto:
+        return []
+    nombres = (normalizar_habilidad(parte) for parte in SEPARADORES.split(texto))
+    return list(dict.fromkeys(nombre for nombre in nombres if nombre))
+
+
+def _trozos(valores: List, tamano: int = MAX_PARAMETROS_IN):
+    for inicio in range(0, len(valores), tamano):
+        yield valores[inicio:inicio + tamano]
+
+
+async def _ids_habilidades(db: AsyncSession, nombres: Iterable[str], crear: bool) -> Dict[str, int]:
+    """ID de cada nombre del catálogo; con ``crear`` se dan de alta los que falten."""
+    nombres = list(dict.fromkeys(nombres))
+    ids: Dict[str, int] = {}
+    for trozo in _trozos(nombres):
+        resultado = await db.execute(
+            select(Habilidades.nombre, Habilidades.habilidades_id).where(Habilidades.nombre.in_(trozo))
+        )
+        ids.update(resultado.all())
+
+    nuevas = [nombre for nombre in nombres if nombre not in ids]
+    if crear and nuevas:
+        # Otra petición puede dar de alta el mismo nombre entre el SELECT y el
+        # INSERT: el conflicto con el UNIQUE de nombre se ignora y se vuelve a leer
+        insertar = INSERT_CON_CONFLICTO.get(db.bind.dialect.name)
+        if insertar is not None:
+            sentencia = insertar(Habilidades).on_conflict_do_nothing(index_elements=["nombre"])
+        else:
+            sentencia = insert(Habilidades)
+        await db.execute(sentencia, [{"nombre": nombre, "total_voluntarios": 0} for nombre in nuevas])
+        for trozo in _trozos(nuevas):
+            resultado = await db.execute(
+                select(Habilidades.nombre, Habilidades.habilidades_id).where(Habilidades.nombre.in_(trozo))
+            )
+            ids.update(resultado.all())
+    return ids
+
+
+async def sincronizar_habilidades(db: AsyncSession, habilidades_por_voluntario: Mapping[int, Optional[str]]) -> None:
+    """
+    Actualiza el índice invertido de los voluntarios indicados
+    (``{voluntario_id: texto de habilidades}``) escribiendo sólo la diferencia
+    con lo que ya había, y ajusta ``total_voluntarios`` de las habilidades tocadas.
+    """
+    if not habilidades_por_voluntario:
+        return
+
+    nombres = {vid: separar_habilidades(texto) for vid, texto in habilidades_por_voluntario.items()}
+    ids = await _ids_habilidades(db, (nombre for lista in nombres.values() for nombre in lista), crear=True)
+
+    actuales: Dict[int, Set[int]] = {vid: set() for vid in nombres}
+    for trozo in _trozos(list(nombres)):
+        resultado = await db.execute(
+            select(VoluntariosHabilidades.voluntario_id, VoluntariosHabilidades.habilidad_id)
+            .where(VoluntariosHabilidades.voluntario_id.in_(trozo))
+        )
+        for voluntario_id, habilidad_id in resultado:
+            actuales[voluntario_id].add(habilidad_id)
+
+    altas, bajas = [], []
+    cambios: Counter = Counter()
+    for voluntario_id, lista in nombres.items():
+        nuevas = {ids[nombre] for nombre in lista}
+        for habilidad_id in nuevas - actuales[voluntario_id]:
+            altas.append({"voluntario_id": voluntario_id, "habilidad_id": habilidad_id})
+            cambios[habilidad_id] += 1
+        for habilidad_id in actuales[voluntario_id] - nuevas:
+            bajas.append((voluntario_id, habilidad_id))
+            cambios[habilidad_id] -= 1
+
+    for voluntario_id, habilidad_id in bajas:
+        await db.execute(
+            delete(VoluntariosHabilidades)
+            .where(VoluntariosHabilidades.voluntario_id == voluntario_id, VoluntariosHabilidades.habilidad_id == habilidad_id)
+            .execution_options(synchronize_session=False)
+        )
+    if altas:
+        await db.execute(insert(VoluntariosHabilidades), altas)
+
+    # Un UPDATE por cada incremento distinto (normalmente +1 y -1)
+    por_incremento: Dict[int, List[int]] = {}
+    for habilidad_id, incremento in cambios.items():
+        if incremento:
+            por_incremento.setdefault(incremento, []).append(habilidad_id)
+    for incremento, habilidad_ids in por_incremento.items():
+        for trozo in _trozos(habilidad_ids):
+            await db.execute(
+                update(Habilidades)
+                .where(Habilidades.habilidades_id.in_(trozo))
+                .values(total_voluntarios=Habilidades.total_voluntarios + incremento)
+                .execution_options(synchronize_session=False)
+            )
+
+
+async def habilidades_de_voluntarios(db: AsyncSession, voluntario_ids: Iterable[int]) -> Set[int]:
+    """Habilidades de los voluntarios indicados; se consulta antes de borrarlos."""
+    habilidad_ids: Set[int] = set()
+    for trozo in _trozos(list(voluntario_ids)):
+        resultado = await db.execute(
+            select(VoluntariosHabilidades.habilidad_id).where(VoluntariosHabilidades.voluntario_id.in_(trozo))
+        )
+        habilidad_ids.update(resultado.scalars())
+    return habilidad_ids
+
+
+async def recalcular_totales(db: AsyncSession, habilidad_ids: Iterable[int]) -> None:
+    """
+    Vuelve a contar ``total_voluntarios`` tras borrar voluntarios, cuando el
+    ON DELETE CASCADE ya ha quitado sus filas del índice invertido.
+    """
+    conteo = (
+        select(func.count())
+        .where(VoluntariosHabilidades.habilidad_id == Habilidades.habilidades_id)
+        .scalar_subquery()
+    )
+    for trozo in _trozos(sorted(habilidad_ids)):
+        await db.execute(
+            update(Habilidades)
+            .where(Habilidades.habilidades_id.in_(trozo))
+            .values(total_voluntarios=conteo)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def consulta_voluntarios_con_habilidades(db: AsyncSession, nombres: Iterable[str]):
+    """
+    ``select(Voluntarios)`` de los voluntarios que tienen todas las habilidades
+    de ``nombres``, o ``None`` si alguna no existe (el resultado sería vacío).
+
+    La lista de la habilidad con menos voluntarios dirige la consulta; cada
+    candidato se comprueba en las demás listas con una búsqueda por clave
+    primaria, así que el coste crece con la lista más corta, no con la tabla.
+    """
+    nombres = list(dict.fromkeys(normalizar_habilidad(nombre) for nombre in nombres if nombre.strip()))
+    ids = await _ids_habilidades(db, nombres, crear=False)
+    if not nombres or len(ids) < len(nombres):
+        return None
+
+    resultado = await db.execute(
+        select(Habilidades.habilidades_id)
+        .where(Habilidades.habilidades_id.in_(ids.values()))
+        .order_by(Habilidades.total_voluntarios, Habilidades.habilidades_id)
+    )
+    habilidad_ids = resultado.scalars().all()
+
+    listas = [aliased(VoluntariosHabilidades) for _ in habilidad_ids]
+    principal = listas[0]
+    consulta = (
+        select(Voluntarios)
+        .select_from(principal)
+        .join(Voluntarios, Voluntarios.voluntarios_id == principal.voluntario_id)
+        .where(principal.habilidad_id == habilidad_ids[0])
+    )
+    for lista, habilidad_id in zip(listas[1:], habilidad_ids[1:]):
+        consulta = consulta.join(
+            lista,
+            and_(lista.habilidad_id == habilidad_id, lista.voluntario_id == principal.voluntario_id)
+        )
+    return consulta
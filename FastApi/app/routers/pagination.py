@@ -0,0 +1,51 @@
+"""
+Paginación por cursor (keyset) para los endpoints de listado.
+
+En lugar de OFFSET se filtra por la clave primaria (``pk > cursor``) y se ordena
+por ella, de modo que cada página cuesta lo mismo sin importar cuántas filas
+tenga la tabla.
+"""
+from typing import Any, List, Optional, Tuple
+
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 500
+
+# Cabecera en la que se devuelve el cursor de la siguiente página
+CABECERA_CURSOR = "X-Next-Cursor"
+
+
+async def paginar_keyset(db: AsyncSession, consulta, columna_pk, cursor: Optional[int], limite: int) -> Tuple[List[Any], Optional[int]]:
+    """
+    Aplica paginación keyset sobre la columna de clave primaria.
+
+    Se pide una fila de más para saber si existe una página siguiente sin
+    necesidad de un COUNT(*).
+
+    Args:
+        db: Sesión asíncrona de base de datos
+        consulta: Sentencia ``select(Modelo)`` con los filtros ya aplicados
+
+    Returns:
+        Tupla con las filas de la página y el cursor de la siguiente (o None)
+    """
+    limite = max(1, min(limite, LIMITE_MAXIMO))
+    if cursor is not None:
+        consulta = consulta.where(columna_pk > cursor)
+
+    resultado = await db.execute(consulta.order_by(columna_pk).limit(limite + 1))
+    filas = resultado.scalars().all()
+
+    siguiente_cursor = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        siguiente_cursor = getattr(filas[-1], columna_pk.key)
+    return filas, siguiente_cursor
+
+
+def escribir_cursor(response: Response, siguiente_cursor: Optional[int]) -> None:
+    """Expone el cursor de la siguiente página en la cabecera de la respuesta."""
+    if siguiente_cursor is not None:
+        response.headers[CABECERA_CURSOR] = str(siguiente_cursor)
@@ -0,0 +1,118 @@
+"""
+Agregados de feedback por voluntario y por evento.
+
+``resumen_feedback_voluntario`` y ``resumen_feedback_evento`` guardan el número
+de calificaciones, su suma, el promedio y la fecha de la última, de modo que
+el ranking y las fichas leen una fila en lugar de agregar toda la tabla
+``feedback`` en cada petición.
+
+Las funciones de este módulo no hacen commit: se llaman dentro de la misma
+transacción que la escritura del feedback.
+"""
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Feedback, ResumenFeedbackVoluntario, ResumenFeedbackEvento
+from app.routers.bulk import INSERT_CON_CONFLICTO, MAX_PARAMETROS_IN
+
+# (modelo de resumen, columna clave del resumen, columna agrupada en feedback)
+RESUMENES = (
+    (ResumenFeedbackVoluntario, ResumenFeedbackVoluntario.voluntario_id, Feedback.voluntario_id),
+    (ResumenFeedbackEvento, ResumenFeedbackEvento.evento_id, Feedback.evento_id),
+)
+
+
+async def sumar_calificacion(db: AsyncSession, feedback: Feedback) -> None:
+    """
+    Incorpora un feedback recién insertado a los agregados en O(1): suma uno
+    al total y la calificación a la suma, sin volver a leer la tabla feedback.
+    """
+    if feedback.calificacion is None:
+        return
+
+    fecha = feedback.fecha_creacion or datetime.utcnow()
+    insertar = INSERT_CON_CONFLICTO.get(db.bind.dialect.name)
+    for resumen, columna_clave, columna_feedback in RESUMENES:
+        clave = getattr(feedback, columna_feedback.key)
+        if clave is None:
+            continue
+        sumado = {
+            "total": resumen.total + 1,
+            "suma": resumen.suma + feedback.calificacion,
+            "promedio": (resumen.suma + feedback.calificacion) * 1.0 / (resumen.total + 1),
+            "ultima_fecha": case(
+                (resumen.ultima_fecha.is_(None) | (resumen.ultima_fecha < fecha), fecha),
+                else_=resumen.ultima_fecha
+            ),
+        }
+        nuevo = {
+            columna_clave.key: clave,
+            "total": 1,
+            "suma": feedback.calificacion,
+            "promedio": float(feedback.calificacion),
+            "ultima_fecha": fecha,
+        }
+        if insertar is not None:
+            # Un solo upsert: dos primeros feedbacks concurrentes de la misma
+            # clave no chocan con la clave primaria del resumen
+            await db.execute(
+                insertar(resumen).values(nuevo).on_conflict_do_update(index_elements=[columna_clave.key], set_=sumado)
+            )
+            continue
+        resultado = await db.execute(
+            update(resumen).where(columna_clave == clave).values(sumado).execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount == 0:
+            await db.execute(insert(resumen).values(nuevo))
+
+
+async def recalcular_resumenes(
+    db: AsyncSession,
+    voluntario_ids: Optional[Iterable[int]] = None,
+    evento_ids: Optional[Iterable[int]] = None,
+    completo: bool = False
+) -> None:
+    """
+    Vuelve a calcular los agregados de las claves indicadas a partir de la
+    tabla feedback (una consulta agrupada por clave, apoyada en sus índices).
+
+    Se usa tras actualizar o borrar feedback, donde la última fecha no puede
+    obtenerse por diferencia, y tras las inserciones en lote. Con
+    ``completo=True`` reconstruye las dos tablas enteras.
+    """
+    for (resumen, columna_clave, columna_feedback), ids in zip(RESUMENES, (voluntario_ids, evento_ids)):
+        if completo:
+            await _recalcular(db, resumen, columna_clave, columna_feedback, None)
+            continue
+        ids = sorted({i for i in ids or () if i is not None})
+        for inicio in range(0, len(ids), MAX_PARAMETROS_IN):
+            await _recalcular(db, resumen, columna_clave, columna_feedback, ids[inicio:inicio + MAX_PARAMETROS_IN])
+
+
+async def _recalcular(db: AsyncSession, resumen, columna_clave, columna_feedback, ids) -> None:
+    borrado = delete(resumen)
+    agregado = (
+        select(
+            columna_feedback,
+            func.count(Feedback.calificacion),
+            func.sum(Feedback.calificacion),
+            func.avg(Feedback.calificacion),
+            func.max(Feedback.fecha_creacion)
+        )
+        .where(columna_feedback.isnot(None), Feedback.calificacion.isnot(None))
+        .group_by(columna_feedback)
+    )
+    if ids is not None:
+        borrado = borrado.where(columna_clave.in_(ids))
+        agregado = agregado.where(columna_feedback.in_(ids))
+
+    await db.execute(borrado.execution_options(synchronize_session=False))
+    await db.execute(
+        insert(resumen).from_select(
+            [columna_clave.key, "total", "suma", "promedio", "ultima_fecha"],
+            agregado
+        )
+    )
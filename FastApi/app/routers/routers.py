@@ -1,33 +1,88 @@
-from typing import List
+from dataclasses import asdict
+from typing import List, Optional
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from app.models.models import Usuarios, Voluntarios, Eventos, Asignaciones, Feedback
-from app.models.schema import UsuariosModel, VoluntariosModel, EventosModel, AsignacionesModel, FeedbackModel
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import Usuarios, Voluntarios, Eventos, Asignaciones, Feedback, ResumenFeedbackVoluntario, \
+    ResumenFeedbackEvento
+from app.models.schema import UsuariosModel, VoluntariosModel, EventosModel, AsignacionesModel, FeedbackModel, \
+    TransicionEstadoAsignacionesModel
+from app.schemas.recursos import UsuariosRespuesta, VoluntariosRespuesta, EventosRespuesta, AsignacionesRespuesta, \
+    FeedbackRespuesta, ResumenPersonalEventoRespuesta, ResumenFeedbackVoluntarioRespuesta, ResumenFeedbackEventoRespuesta, \
+    ResultadoBusquedaEvento, ResultadoBusquedaFeedback
 from fastapi import APIRouter
-from app.database.database import SessionLocal, get_db
+from app.db.async_session import get_async_db
+from app.db.repositorio import obtener_por_id, usuario_por_correo
 from fastapi import Depends
+from fastapi import Body, Query, Request, Response
 from fastapi import status
 from fastapi.encoders import jsonable_encoder
+from app.routers.pagination import paginar_keyset, escribir_cursor, LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+from app.routers.bulk import insertar_en_lote, borrar_en_lote, referencias_inexistentes, MAX_FILAS_POR_PETICION, \
+    MAX_PARAMETROS_IN
+from app.routers.versiones import incrementar_version, responder_si_no_modificado
+from app.routers.campos import parsear_campos, aplicar_campos, proyectar, proyectar_filas
+from app.routers.resumen_feedback import sumar_calificacion, recalcular_resumenes
+from app.models.fechas import inicio_de_hoy, rango_proximos_dias
+from app.routers.habilidades import sincronizar_habilidades, habilidades_de_voluntarios, recalcular_totales, \
+    consulta_voluntarios_con_habilidades
+from app.routers.busqueda import buscar_texto, COLUMNAS_EVENTOS, COLUMNAS_FEEDBACK
 
 router = APIRouter()
 
+# Estados de asignación que no cubren plaza en el resumen de personal
+ESTADOS_SIN_PLAZA = ("cancelada", "rechazada")
+
 
 @router.get("/", tags=["root"])
 async def root():
     return {"message": "Bienvenido a la API de FoodBank"}
 
-@router.get("/usuarios", response_model=None, tags=["usuarios"])
-async def get_usuarios(db: Session = Depends(get_db)) -> List[UsuariosModel]:
-    db = SessionLocal()
-    usuarios = db.query(Usuarios).all()
-    db.close()
-    return usuarios
-
-
-@router.post("/add-usuarios/", response_model=UsuariosModel, status_code=status.HTTP_201_CREATED, tags=["usuarios"])
-async def insert_usuario(usuario: UsuariosModel, db: Session = Depends(get_db)):
+@router.get("/usuarios", response_model=List[UsuariosRespuesta], response_model_exclude_unset=True, tags=["usuarios"])
+async def get_usuarios(
+    request: Request,
+    response: Response,
+    cursor: Optional[int] = Query(None, description="Último usuarios_id recibido en la página anterior"),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    tipo: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Usuarios, UsuariosRespuesta)
+    no_modificado = await responder_si_no_modificado(db, request, response, Usuarios.__tablename__)
+    if no_modificado is not None:
+        return no_modificado
+
+    query = aplicar_campos(select(Usuarios), Usuarios, campos)
+    if tipo is not None:
+        query = query.where(Usuarios.tipo == tipo)
+    if is_active is not None:
+        query = query.where(Usuarios.is_active == is_active)
+
+    usuarios, siguiente_cursor = await paginar_keyset(db, query, Usuarios.usuarios_id, cursor, limit)
+    escribir_cursor(response, siguiente_cursor)
+    return proyectar_filas(usuarios, campos)
+
+
+@router.get("/usuarios/{usuarios_id}", response_model=UsuariosRespuesta, response_model_exclude_unset=True, tags=["usuarios"])
+async def get_usuario(
+    usuarios_id: int,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Usuarios, UsuariosRespuesta)
+    consulta = aplicar_campos(select(Usuarios), Usuarios, campos).where(Usuarios.usuarios_id == usuarios_id)
+    usuario = await db.scalar(consulta)
+    if usuario is None:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return proyectar(usuario, campos)
+
+
+@router.post("/add-usuarios/", response_model=UsuariosRespuesta, status_code=status.HTTP_201_CREATED, tags=["usuarios"])
+async def insert_usuario(usuario: UsuariosModel, db: AsyncSession = Depends(get_async_db)):
     # Verificar si el correo ya está registrado
-    db_usuario = db.query(Usuarios).filter(Usuarios.correo == usuario.correo).first()
+    db_usuario = await usuario_por_correo(db, usuario.correo)
     if db_usuario:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,7 +90,7 @@ async def insert_usuario(usuario: UsuariosModel, db: Session = Depends(get_db)):
         )
     
     # Verificar si el ID ya existe
-    db_usuario = db.query(Usuarios).filter(Usuarios.usuarios_id == usuario.usuarios_id).first()
+    db_usuario = await obtener_por_id(db, Usuarios, usuario.usuarios_id)
     if db_usuario:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -57,83 +112,377 @@ async def insert_usuario(usuario: UsuariosModel, db: Session = Depends(get_db)):
         )
 
         db.add(new_usuario)
-        db.commit()
-        db.refresh(new_usuario)
+        await incrementar_version(db, Usuarios.__tablename__)
+        await db.commit()
+        await db.refresh(new_usuario)
         return new_usuario
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al crear el usuario: {str(e)}"
         )
 
 
-@router.put("/update-usuarios/", tags=["usuarios"])
-async def update_usuario(updated_usuario: UsuariosModel, db: Session = Depends(get_db)):
-    print(updated_usuario)
-    existing_usuario = db.query(Usuarios).filter(Usuarios.usuarios_id == updated_usuario.usuarios_id).first()
+@router.put("/update-usuarios/", response_model=UsuariosRespuesta, tags=["usuarios"])
+async def update_usuario(updated_usuario: UsuariosModel, db: AsyncSession = Depends(get_async_db)):
+    existing_usuario = await obtener_por_id(db, Usuarios, updated_usuario.usuarios_id)
 
     if existing_usuario:
         # Update the attributes of the existing usuario
         for field, value in jsonable_encoder(updated_usuario).items():
-            print(field, value)
             if value:
                 setattr(existing_usuario, field, value)
 
-        db.commit()
-        db.refresh(existing_usuario)
+        await incrementar_version(db, Usuarios.__tablename__)
+        await db.commit()
+        await db.refresh(existing_usuario)
         return existing_usuario
-
-    return {"message": "Usuario not found"}
+    else:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
 
 @router.delete("/delete-usuarios/{usuarios_id}", tags=["usuarios"])
-async def delete_usuario(usuarios_id: int, db: Session = Depends(get_db)):
-    existing_usuario = db.query(Usuarios).filter(Usuarios.usuarios_id == usuarios_id).first()
+async def delete_usuario(usuarios_id: int, db: AsyncSession = Depends(get_async_db)):
+    existing_usuario = await obtener_por_id(db, Usuarios, usuarios_id)
 
     if existing_usuario:
-        db.delete(existing_usuario)
-        db.commit()
+        await db.delete(existing_usuario)
+        # ON DELETE borra o pone a NULL las filas hijas en la base de datos
+        await incrementar_version(db, Usuarios.__tablename__, Voluntarios.__tablename__)
+        await db.commit()
         return True
 
     return False
 
 
-@router.get("/voluntarios", response_model=None, tags=["voluntarios"])
-async def get_voluntarios()->List[VoluntariosModel]:
-    voluntarios = db.query(Voluntarios).all()
-    return voluntarios
-
-
-@router.get("/eventos", response_model=None, tags=["eventos"])
-async def get_eventos(db: Session = Depends(get_db)) ->List[EventosModel]:
-    db = SessionLocal()
-    eventos = db.query(Eventos).all()
-    db.close()
-    return eventos
-
-
+@router.get("/voluntarios", response_model=List[VoluntariosRespuesta], response_model_exclude_unset=True, tags=["voluntarios"])
+async def get_voluntarios(
+    request: Request,
+    response: Response,
+    cursor: Optional[int] = Query(None, description="Último voluntarios_id recibido en la página anterior"),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    usuario_id: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Voluntarios, VoluntariosRespuesta)
+    no_modificado = await responder_si_no_modificado(db, request, response, Voluntarios.__tablename__)
+    if no_modificado is not None:
+        return no_modificado
+
+    query = aplicar_campos(select(Voluntarios), Voluntarios, campos)
+    if usuario_id is not None:
+        query = query.where(Voluntarios.usuario_id == usuario_id)
+
+    voluntarios, siguiente_cursor = await paginar_keyset(db, query, Voluntarios.voluntarios_id, cursor, limit)
+    escribir_cursor(response, siguiente_cursor)
+    return proyectar_filas(voluntarios, campos)
+
+
+@router.get("/voluntarios/{voluntarios_id}", response_model=VoluntariosRespuesta, response_model_exclude_unset=True, tags=["voluntarios"])
+async def get_voluntario(
+    voluntarios_id: int,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Voluntarios, VoluntariosRespuesta)
+    consulta = aplicar_campos(select(Voluntarios), Voluntarios, campos).where(Voluntarios.voluntarios_id == voluntarios_id)
+    voluntario = await db.scalar(consulta)
+    if voluntario is None:
+        raise HTTPException(status_code=404, detail="Voluntario no encontrado")
+    return proyectar(voluntario, campos)
+
+
+@router.get("/eventos", response_model=List[EventosRespuesta], response_model_exclude_unset=True, tags=["eventos"])
+async def get_eventos(
+    request: Request,
+    response: Response,
+    cursor: Optional[int] = Query(None, description="Último eventos_id recibido en la página anterior"),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    fecha: Optional[str] = None,
+    proximos_dias: Optional[int] = Query(None, ge=1, description="Sólo eventos que empiezan en los próximos N días"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Eventos, EventosRespuesta)
+    no_modificado = await responder_si_no_modificado(db, request, response, Eventos.__tablename__)
+    if no_modificado is not None:
+        return no_modificado
+
+    query = aplicar_campos(select(Eventos), Eventos, campos)
+    if fecha is not None:
+        query = query.where(Eventos.fecha == fecha)
+    if proximos_dias is not None:
+        # Rango sobre el índice de starts_at
+        desde, hasta = rango_proximos_dias(proximos_dias)
+        query = query.where(Eventos.starts_at >= desde, Eventos.starts_at < hasta)
+
+    eventos, siguiente_cursor = await paginar_keyset(db, query, Eventos.eventos_id, cursor, limit)
+    escribir_cursor(response, siguiente_cursor)
+    return proyectar_filas(eventos, campos)
+
+
+@router.get("/eventos/{eventos_id}", response_model=EventosRespuesta, response_model_exclude_unset=True, tags=["eventos"])
+async def get_evento(
+    eventos_id: int,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Eventos, EventosRespuesta)
+    consulta = aplicar_campos(select(Eventos), Eventos, campos).where(Eventos.eventos_id == eventos_id)
+    evento = await db.scalar(consulta)
+    if evento is None:
+        raise HTTPException(status_code=404, detail="Evento no encontrado")
+    return proyectar(evento, campos)
+
+
+@router.get("/resumen-eventos", response_model=List[ResumenPersonalEventoRespuesta], tags=["eventos"])
+async def get_resumen_personal_eventos(
+    proximos: bool = Query(False, description="Sólo eventos con fecha igual o posterior a hoy"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Voluntarios necesarios frente a asignados por evento.
+
+    Se calcula con una única consulta agrupada por (evento, estado) sobre un
+    LEFT JOIN, de modo que los eventos sin asignaciones también aparecen.
+    Las asignaciones en ``ESTADOS_SIN_PLAZA`` se cuentan por estado pero no
+    reducen las plazas faltantes.
+    """
+    consulta = (
+        select(
+            Eventos.eventos_id,
+            Eventos.nombre,
+            Eventos.fecha,
+            Eventos.voluntarios_necesarios,
+            Asignaciones.estado,
+            func.count(Asignaciones.asignaciones_id).label("total")
+        )
+        .outerjoin(Asignaciones, Asignaciones.evento_id == Eventos.eventos_id)
+        .group_by(Eventos.eventos_id, Asignaciones.estado)
+        .order_by(Eventos.eventos_id)
+    )
+    if proximos:
+        consulta = consulta.where(Eventos.starts_at >= inicio_de_hoy())
+
+    resumen = {}
+    for fila in await db.execute(consulta):
+        evento = resumen.get(fila.eventos_id)
+        if evento is None:
+            evento = resumen[fila.eventos_id] = {
+                "eventos_id": fila.eventos_id,
+                "nombre": fila.nombre,
+                "fecha": fila.fecha,
+                "voluntarios_necesarios": fila.voluntarios_necesarios,
+                "asignados": 0,
+                "por_estado": {},
+                "faltantes": fila.voluntarios_necesarios
+            }
+        if fila.total == 0:
+            continue
+        evento["por_estado"][fila.estado or "sin_estado"] = fila.total
+        if (fila.estado or "").lower() not in ESTADOS_SIN_PLAZA:
+            evento["asignados"] += fila.total
+            if evento["voluntarios_necesarios"] is not None:
+                evento["faltantes"] = max(evento["voluntarios_necesarios"] - evento["asignados"], 0)
+
+    return list(resumen.values())
+
+
+@router.get("/voluntarios/{voluntarios_id}/resumen-feedback", response_model=ResumenFeedbackVoluntarioRespuesta, tags=["feedback"])
+async def get_resumen_feedback_voluntario(voluntarios_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Calificaciones agregadas de un voluntario (una lectura por clave primaria)."""
+    resumen = await obtener_por_id(db, ResumenFeedbackVoluntario, voluntarios_id)
+    return resumen or ResumenFeedbackVoluntarioRespuesta(voluntario_id=voluntarios_id)
+
+
+@router.get("/eventos/{eventos_id}/resumen-feedback", response_model=ResumenFeedbackEventoRespuesta, tags=["feedback"])
+async def get_resumen_feedback_evento(eventos_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Calificaciones agregadas de un evento (una lectura por clave primaria)."""
+    resumen = await obtener_por_id(db, ResumenFeedbackEvento, eventos_id)
+    return resumen or ResumenFeedbackEventoRespuesta(evento_id=eventos_id)
+
+
+@router.get("/ranking-voluntarios", response_model=List[ResumenFeedbackVoluntarioRespuesta], tags=["feedback"])
+async def get_ranking_voluntarios(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    min_calificaciones: int = Query(1, ge=1, description="Número mínimo de calificaciones para aparecer"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Voluntarios ordenados por calificación media, leídos del resumen indexado por promedio."""
+    resultado = await db.execute(
+        select(ResumenFeedbackVoluntario)
+        .where(ResumenFeedbackVoluntario.total >= min_calificaciones)
+        .order_by(ResumenFeedbackVoluntario.promedio.desc(), ResumenFeedbackVoluntario.total.desc())
+        .limit(limit)
+    )
+    return resultado.scalars().all()
+
+
+@router.get("/buscar-voluntarios", response_model=List[VoluntariosRespuesta], response_model_exclude_unset=True, tags=["voluntarios"])
+async def buscar_voluntarios(
+    request: Request,
+    response: Response,
+    habilidades: str = Query(..., description="Habilidades separadas por comas; se devuelven los voluntarios que las tienen todas"),
+    cursor: Optional[int] = Query(None, description="Último voluntarios_id recibido en la página anterior"),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Voluntarios con todas las habilidades pedidas, por intersección de las
+    listas del índice invertido (``voluntarios_habilidades``).
+    """
+    campos = parsear_campos(fields, Voluntarios, VoluntariosRespuesta)
+    no_modificado = await responder_si_no_modificado(db, request, response, Voluntarios.__tablename__)
+    if no_modificado is not None:
+        return no_modificado
+
+    consulta = await consulta_voluntarios_con_habilidades(db, habilidades.split(","))
+    if consulta is None:
+        return []
+
+    voluntarios, siguiente_cursor = await paginar_keyset(
+        db, aplicar_campos(consulta, Voluntarios, campos), Voluntarios.voluntarios_id, cursor, limit
+    )
+    escribir_cursor(response, siguiente_cursor)
+    return proyectar_filas(voluntarios, campos)
 
-@router.get("/asignaciones", response_model=None, tags=["asignaciones"])
-async def get_asignaciones() ->List[AsignacionesModel]:
-    asignaciones = db.query(Asignaciones).all()
-    return asignaciones
 
+async def _buscar_texto(db: AsyncSession, request: Request, response: Response, modelo, columnas, q: str, limit: int):
+    no_modificado = await responder_si_no_modificado(db, request, response, modelo.__tablename__)
+    if no_modificado is not None:
+        return no_modificado
 
-@router.get("/feedback", response_model=None, tags=["feedback"])
-async def get_feedback() ->List[FeedbackModel]:
-    feedback = db.query(Feedback).all()
-    return feedback
+    resultados = await buscar_texto(db, modelo, columnas, q, limit)
+    if resultados is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="La base de datos no tiene búsqueda de texto completo"
+        )
+    return resultados
+
+
+@router.get("/buscar-eventos", response_model=List[ResultadoBusquedaEvento], tags=["eventos"])
+async def buscar_eventos(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200, description="Palabras a buscar en la descripción del evento"),
+    limit: int = Query(20, ge=1, le=LIMITE_MAXIMO),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Eventos cuya descripción contiene todas las palabras, de más a menos relevante."""
+    return await _buscar_texto(db, request, response, Eventos, COLUMNAS_EVENTOS, q, limit)
+
+
+@router.get("/buscar-feedback", response_model=List[ResultadoBusquedaFeedback], tags=["feedback"])
+async def buscar_feedback(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200, description="Palabras a buscar en el comentario"),
+    limit: int = Query(20, ge=1, le=LIMITE_MAXIMO),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Feedback cuyo comentario contiene todas las palabras, de más a menos relevante."""
+    return await _buscar_texto(db, request, response, Feedback, COLUMNAS_FEEDBACK, q, limit)
+
+
+@router.get("/asignaciones", response_model=List[AsignacionesRespuesta], response_model_exclude_unset=True, tags=["asignaciones"])
+async def get_asignaciones(
+    request: Request,
+    response: Response,
+    cursor: Optional[int] = Query(None, description="Último asignaciones_id recibido en la página anterior"),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    evento_id: Optional[int] = None,
+    voluntario_id: Optional[int] = None,
+    estado: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Asignaciones, AsignacionesRespuesta)
+    no_modificado = await responder_si_no_modificado(db, request, response, Asignaciones.__tablename__)
+    if no_modificado is not None:
+        return no_modificado
+
+    query = aplicar_campos(select(Asignaciones), Asignaciones, campos)
+    if evento_id is not None:
+        query = query.where(Asignaciones.evento_id == evento_id)
+    if voluntario_id is not None:
+        query = query.where(Asignaciones.voluntario_id == voluntario_id)
+    if estado is not None:
+        query = query.where(Asignaciones.estado == estado)
+
+    asignaciones, siguiente_cursor = await paginar_keyset(db, query, Asignaciones.asignaciones_id, cursor, limit)
+    escribir_cursor(response, siguiente_cursor)
+    return proyectar_filas(asignaciones, campos)
+
+
+@router.get("/asignaciones/{asignaciones_id}", response_model=AsignacionesRespuesta, response_model_exclude_unset=True, tags=["asignaciones"])
+async def get_asignacion(
+    asignaciones_id: int,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Asignaciones, AsignacionesRespuesta)
+    consulta = aplicar_campos(select(Asignaciones), Asignaciones, campos).where(Asignaciones.asignaciones_id == asignaciones_id)
+    asignacion = await db.scalar(consulta)
+    if asignacion is None:
+        raise HTTPException(status_code=404, detail="Asignacion no encontrada")
+    return proyectar(asignacion, campos)
+
+
+@router.get("/feedback", response_model=List[FeedbackRespuesta], response_model_exclude_unset=True, tags=["feedback"])
+async def get_feedback(
+    request: Request,
+    response: Response,
+    cursor: Optional[int] = Query(None, description="Último feedback_id recibido en la página anterior"),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    voluntario_id: Optional[int] = None,
+    evento_id: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Feedback, FeedbackRespuesta)
+    no_modificado = await responder_si_no_modificado(db, request, response, Feedback.__tablename__)
+    if no_modificado is not None:
+        return no_modificado
+
+    query = aplicar_campos(select(Feedback), Feedback, campos)
+    if voluntario_id is not None:
+        query = query.where(Feedback.voluntario_id == voluntario_id)
+    if evento_id is not None:
+        query = query.where(Feedback.evento_id == evento_id)
+
+    feedback, siguiente_cursor = await paginar_keyset(db, query, Feedback.feedback_id, cursor, limit)
+    escribir_cursor(response, siguiente_cursor)
+    return proyectar_filas(feedback, campos)
+
+
+@router.get("/feedback/{feedback_id}", response_model=FeedbackRespuesta, response_model_exclude_unset=True, tags=["feedback"])
+async def get_feedback_por_id(
+    feedback_id: int,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    campos = parsear_campos(fields, Feedback, FeedbackRespuesta)
+    consulta = aplicar_campos(select(Feedback), Feedback, campos).where(Feedback.feedback_id == feedback_id)
+    feedback = await db.scalar(consulta)
+    if feedback is None:
+        raise HTTPException(status_code=404, detail="Feedback no encontrado")
+    return proyectar(feedback, campos)
 
 
-@router.get("/asignaciones", response_model=None, tags=["asignaciones"])
-async def get_asignaciones() -> List[AsignacionesModel]:
-    asignaciones = db.query(Asignaciones).all()
-    return asignaciones
+async def _comprobar_referencias(db: AsyncSession, modelo, fila) -> None:
+    """400 si alguna clave foránea de ``fila`` apunta a una fila que no existe, antes de que falle el INSERT."""
+    errores = await referencias_inexistentes(db, modelo, asdict(fila))
+    if errores:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="; ".join(errores))
 
 
-@router.post("/add-voluntarios/", tags=["voluntarios"])
-async def insert_voluntario(voluntario: VoluntariosModel, db: Session = Depends(get_db)):
+@router.post("/add-voluntarios/", response_model=VoluntariosRespuesta, tags=["voluntarios"])
+async def insert_voluntario(voluntario: VoluntariosModel, db: AsyncSession = Depends(get_async_db)):
+    await _comprobar_referencias(db, Voluntarios, voluntario)
     new_voluntario = Voluntarios(
         voluntarios_id=voluntario.voluntarios_id,
         habilidades=voluntario.habilidades,
@@ -142,67 +491,56 @@ async def insert_voluntario(voluntario: VoluntariosModel, db: Session = Depends(
     )
     
     db.add(new_voluntario)
-    db.commit()
-    db.refresh(new_voluntario)
+    await db.flush()
+    await sincronizar_habilidades(db, {new_voluntario.voluntarios_id: new_voluntario.habilidades})
+    await incrementar_version(db, Voluntarios.__tablename__)
+    await db.commit()
+    await db.refresh(new_voluntario)
     return new_voluntario
 
 
-@router.put("/update-voluntario/", tags=["voluntarios"])
-async def update_voluntario(updated_voluntario: VoluntariosModel, db: Session = Depends(get_db)):
-    existing_voluntario = db.query(Voluntarios).filter(Voluntarios.voluntarios_id == updated_voluntario.voluntarios_id).first()
-
-    if existing_voluntario:
-        # Update the attributes of the existing buyer excluding 'buyer_id'
-        update_item_encoded = jsonable_encoder(updated_voluntario)
-        for field, value in update_item_encoded.items():
-            if field != "voluntarios_id":
-                setattr(existing_voluntario, field, value)
+@router.put("/update-voluntario/", response_model=VoluntariosRespuesta, tags=["voluntarios"])
+async def update_voluntario(updated_voluntario: VoluntariosModel, db: AsyncSession = Depends(get_async_db)):
+    existing_voluntario = await obtener_por_id(db, Voluntarios, updated_voluntario.voluntarios_id)
+    if existing_voluntario is None:
+        raise HTTPException(status_code=404, detail="Voluntario no encontrado")
+    await _comprobar_referencias(db, Voluntarios, updated_voluntario)
 
-        db.commit()
-        db.refresh(existing_voluntario)
-        return existing_voluntario
+    # Sólo los campos enviados (no None); ni la clave ni la relación usuario,
+    # que vendría a None y dejaría usuario_id a NULL
+    for field, value in jsonable_encoder(updated_voluntario).items():
+        if field not in ("voluntarios_id", "usuario") and value is not None:
+            setattr(existing_voluntario, field, value)
 
-    return {"message": "Voluntario not found"}
+    await db.flush()
+    await sincronizar_habilidades(db, {existing_voluntario.voluntarios_id: existing_voluntario.habilidades})
+    await incrementar_version(db, Voluntarios.__tablename__)
+    await db.commit()
+    await db.refresh(existing_voluntario)
+    return existing_voluntario
 
 
 @router.delete("/delete-voluntario/{voluntario_id}", tags=["voluntarios"])
-async def delete_voluntario(voluntario_id: int, db: Session = Depends(get_db)):
-    existing_voluntario = db.query(Voluntarios).filter(Voluntarios.voluntarios_id == voluntario_id).first()
+async def delete_voluntario(voluntario_id: int, db: AsyncSession = Depends(get_async_db)):
+    existing_voluntario = await obtener_por_id(db, Voluntarios, voluntario_id)
 
     if existing_voluntario:
-        db.delete(existing_voluntario)
-        db.commit()
+        habilidades = await habilidades_de_voluntarios(db, [voluntario_id])
+        await db.delete(existing_voluntario)
+        await db.flush()
+        # ON DELETE borra o pone a NULL las filas hijas en la base de datos
+        await recalcular_resumenes(db, voluntario_ids=[voluntario_id])
+        await recalcular_totales(db, habilidades)
+        await incrementar_version(db, Voluntarios.__tablename__, Asignaciones.__tablename__, Feedback.__tablename__)
+        await db.commit()
         return True
 
     return False
 
 
-@router.get("/eventos", response_model=None, tags=["eventos"])
-async def get_eventos(db: Session = Depends(get_db))->List[EventosModel]:
-    eventos = db.query(Eventos).all()
-    return eventos
-
-
-@router.get("/asignaciones", response_model=None, tags=["asignaciones"])
-async def get_asignaciones() -> List[AsignacionesModel]:
-    asignaciones = db.query(Asignaciones).all()
-    return asignaciones
-
-
-@router.get("/feedback", response_model=None, tags=["feedback"])
-async def get_feedback() -> List[FeedbackModel]:
-    feedback = db.query(Feedback).all()
-    return feedback
-
-
-@router.get("/asignaciones", response_model=None, tags=["asignaciones"])
-async def get_asignaciones() -> List[AsignacionesModel]:
-    asignaciones = db.query(Asignaciones).all()
-    return asignaciones
-
-
-@router.post("/add-asignacion/", tags=["asignaciones"])
-async def insert_asignacion(asignacion: AsignacionesModel, db: Session = Depends(get_db)):
+@router.post("/add-asignacion/", response_model=AsignacionesRespuesta, tags=["asignaciones"])
+async def insert_asignacion(asignacion: AsignacionesModel, db: AsyncSession = Depends(get_async_db)):
+    await _comprobar_referencias(db, Asignaciones, asignacion)
     new_asignacion = Asignaciones(
         asignaciones_id=asignacion.asignaciones_id,
         voluntario_id=asignacion.voluntario_id,
@@ -211,13 +549,14 @@ async def insert_asignacion(asignacion: AsignacionesModel, db: Session = Depends
     )
     
     db.add(new_asignacion)
-    db.commit()
-    db.refresh(new_asignacion)
+    await incrementar_version(db, Asignaciones.__tablename__)
+    await db.commit()
+    await db.refresh(new_asignacion)
     return new_asignacion
 
 
-@router.post("/add-evento/", tags=["eventos"])
-async def insert_evento(evento: EventosModel, db: Session = Depends(get_db)):
+@router.post("/add-evento/", response_model=EventosRespuesta, tags=["eventos"])
+async def insert_evento(evento: EventosModel, db: AsyncSession = Depends(get_async_db)):
     new_evento = Eventos(
         eventos_id=evento.eventos_id,
         nombre=evento.nombre,
@@ -229,12 +568,14 @@ async def insert_evento(evento: EventosModel, db: Session = Depends(get_db)):
     )
     
     db.add(new_evento)
-    db.commit()
-    db.refresh(new_evento)
+    await incrementar_version(db, Eventos.__tablename__)
+    await db.commit()
+    await db.refresh(new_evento)
     return new_evento
 
-@router.post("/add-feedback/", tags=["feedback"])
-async def insert_feedback(feedback: FeedbackModel, db: Session = Depends(get_db)):
+@router.post("/add-feedback/", response_model=FeedbackRespuesta, tags=["feedback"])
+async def insert_feedback(feedback: FeedbackModel, db: AsyncSession = Depends(get_async_db)):
+    await _comprobar_referencias(db, Feedback, feedback)
     new_feedback = Feedback(
         feedback_id=feedback.feedback_id,
         voluntario_id=feedback.voluntario_id,
@@ -244,14 +585,124 @@ async def insert_feedback(feedback: FeedbackModel, db: Session = Depends(get_db)
     )
     
     db.add(new_feedback)
-    db.commit()
-    db.refresh(new_feedback)
+    await db.flush()
+    await sumar_calificacion(db, new_feedback)
+    await incrementar_version(db, Feedback.__tablename__)
+    await db.commit()
+    await db.refresh(new_feedback)
     return new_feedback
 
 
-@router.put("/update-asignacion/", tags=["asignaciones"])
-async def update_asignacion(updated_asignacion: AsignacionesModel, db: Session = Depends(get_db)):
-    existing_asignacion = db.query(Asignaciones).filter(Asignaciones.asignaciones_id == updated_asignacion.asignaciones_id).first()
+@router.post("/bulk/add-voluntarios/", tags=["voluntarios"])
+async def insert_voluntarios_lote(
+    voluntarios: List[VoluntariosModel] = Body(..., max_length=MAX_FILAS_POR_PETICION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    async def indexar_habilidades(db: AsyncSession, filas):
+        await sincronizar_habilidades(db, {fila["voluntarios_id"]: fila.get("habilidades") for fila in filas})
+
+    return await insertar_en_lote(db, Voluntarios, [asdict(v) for v in voluntarios], al_insertar=indexar_habilidades)
+
+
+@router.post("/bulk/add-eventos/", tags=["eventos"])
+async def insert_eventos_lote(
+    eventos: List[EventosModel] = Body(..., max_length=MAX_FILAS_POR_PETICION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await insertar_en_lote(db, Eventos, [asdict(e) for e in eventos])
+
+
+@router.post("/bulk/add-asignaciones/", tags=["asignaciones"])
+async def insert_asignaciones_lote(
+    asignaciones: List[AsignacionesModel] = Body(..., max_length=MAX_FILAS_POR_PETICION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await insertar_en_lote(db, Asignaciones, [asdict(a) for a in asignaciones])
+
+
+@router.post("/bulk/add-feedback/", tags=["feedback"])
+async def insert_feedback_lote(
+    feedback: List[FeedbackModel] = Body(..., max_length=MAX_FILAS_POR_PETICION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    async def actualizar_resumenes(db: AsyncSession, insertadas):
+        await recalcular_resumenes(
+            db,
+            voluntario_ids=[fila.get("voluntario_id") for fila in insertadas],
+            evento_ids=[fila.get("evento_id") for fila in insertadas]
+        )
+
+    return await insertar_en_lote(db, Feedback, [asdict(f) for f in feedback], al_insertar=actualizar_resumenes)
+
+
+@router.post("/bulk/delete-usuarios/", tags=["usuarios"])
+async def delete_usuarios_lote(
+    usuarios_ids: List[int] = Body(..., max_length=MAX_FILAS_POR_PETICION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await borrar_en_lote(db, Usuarios, usuarios_ids)
+
+
+@router.post("/bulk/delete-voluntarios/", tags=["voluntarios"])
+async def delete_voluntarios_lote(
+    voluntarios_ids: List[int] = Body(..., max_length=MAX_FILAS_POR_PETICION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    habilidades = await habilidades_de_voluntarios(db, voluntarios_ids)
+
+    async def actualizar_resumenes(db: AsyncSession, ids):
+        await recalcular_resumenes(db, voluntario_ids=ids)
+        await recalcular_totales(db, habilidades)
+
+    return await borrar_en_lote(db, Voluntarios, voluntarios_ids, al_borrar=actualizar_resumenes)
+
+
+@router.post("/bulk/delete-eventos/", tags=["eventos"])
+async def delete_eventos_lote(
+    eventos_ids: List[int] = Body(..., max_length=MAX_FILAS_POR_PETICION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    async def actualizar_resumenes(db: AsyncSession, ids):
+        await recalcular_resumenes(db, evento_ids=ids)
+
+    return await borrar_en_lote(db, Eventos, eventos_ids, al_borrar=actualizar_resumenes)
+
+
+@router.post("/bulk/delete-asignaciones/", tags=["asignaciones"])
+async def delete_asignaciones_lote(
+    asignaciones_ids: List[int] = Body(..., max_length=MAX_FILAS_POR_PETICION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await borrar_en_lote(db, Asignaciones, asignaciones_ids)
+
+
+@router.post("/bulk/delete-feedback/", tags=["feedback"])
+async def delete_feedback_lote(
+    feedback_ids: List[int] = Body(..., max_length=MAX_FILAS_POR_PETICION),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Claves afectadas, leídas antes del borrado en la misma transacción
+    claves = []
+    for inicio in range(0, len(feedback_ids), MAX_PARAMETROS_IN):
+        resultado = await db.execute(
+            select(Feedback.voluntario_id, Feedback.evento_id)
+            .where(Feedback.feedback_id.in_(feedback_ids[inicio:inicio + MAX_PARAMETROS_IN]))
+        )
+        claves.extend(resultado.all())
+
+    async def actualizar_resumenes(db: AsyncSession, ids):
+        await recalcular_resumenes(
+            db,
+            voluntario_ids=[voluntario_id for voluntario_id, _ in claves],
+            evento_ids=[evento_id for _, evento_id in claves]
+        )
+
+    return await borrar_en_lote(db, Feedback, feedback_ids, al_borrar=actualizar_resumenes)
+
+
+@router.put("/update-asignacion/", response_model=AsignacionesRespuesta, tags=["asignaciones"])
+async def update_asignacion(updated_asignacion: AsignacionesModel, db: AsyncSession = Depends(get_async_db)):
+    existing_asignacion = await obtener_por_id(db, Asignaciones, updated_asignacion.asignaciones_id)
 
     if existing_asignacion:
         # Update the attributes of the existing asignacion
@@ -259,15 +710,63 @@ async def update_asignacion(updated_asignacion: AsignacionesModel, db: Session =
             if value is not None:  # Only update fields that are provided (not None)
                 setattr(existing_asignacion, field, value)
         
-        db.commit()
-        db.refresh(existing_asignacion)
+        await incrementar_version(db, Asignaciones.__tablename__)
+        await db.commit()
+        await db.refresh(existing_asignacion)
         return existing_asignacion
     else:
         raise HTTPException(status_code=404, detail="Asignacion no encontrada")
 
-@router.put("/update-evento/", tags=["eventos"])
-async def update_evento(updated_evento: EventosModel, db: Session = Depends(get_db)):
-    existing_evento = db.query(Eventos).filter(Eventos.eventos_id == updated_evento.eventos_id).first()
+
+@router.put("/bulk/update-asignaciones/estado/", tags=["asignaciones"])
+async def update_estado_asignaciones(transicion: TransicionEstadoAsignacionesModel, db: AsyncSession = Depends(get_async_db)):
+    """
+    Cambia el estado de muchas asignaciones con un único UPDATE.
+
+    Se seleccionan por lista de IDs y/o por evento, opcionalmente restringidas
+    a un estado de origen (p. ej. todas las 'pendiente' del evento X). Las filas
+    que ya tienen el estado destino no se cuentan como cambiadas.
+    """
+    if not transicion.asignaciones_ids and transicion.evento_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Se requiere asignaciones_ids o evento_id"
+        )
+    if transicion.asignaciones_ids and len(transicion.asignaciones_ids) > MAX_FILAS_POR_PETICION:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se admiten como máximo {MAX_FILAS_POR_PETICION} asignaciones_ids"
+        )
+
+    condiciones = [or_(Asignaciones.estado.is_(None), Asignaciones.estado != transicion.estado)]
+    if transicion.asignaciones_ids:
+        condiciones.append(Asignaciones.asignaciones_id.in_(transicion.asignaciones_ids))
+    if transicion.evento_id is not None:
+        condiciones.append(Asignaciones.evento_id == transicion.evento_id)
+    if transicion.estado_actual is not None:
+        condiciones.append(Asignaciones.estado == transicion.estado_actual)
+
+    try:
+        resultado = await db.execute(
+            update(Asignaciones)
+            .where(*condiciones)
+            .values(estado=transicion.estado)
+            .execution_options(synchronize_session=False)
+        )
+        await incrementar_version(db, Asignaciones.__tablename__)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al actualizar las asignaciones: {str(e)}"
+        )
+
+    return {"estado": transicion.estado, "actualizadas": resultado.rowcount}
+
+@router.put("/update-evento/", response_model=EventosRespuesta, tags=["eventos"])
+async def update_evento(updated_evento: EventosModel, db: AsyncSession = Depends(get_async_db)):
+    existing_evento = await obtener_por_id(db, Eventos, updated_evento.eventos_id)
 
     if existing_evento:
         # Update the attributes of the existing evento
@@ -275,73 +774,78 @@ async def update_evento(updated_evento: EventosModel, db: Session = Depends(get_
             if value is not None:  # Only update fields that are provided (not None)
                 setattr(existing_evento, field, value)
         
-        db.commit()
-        db.refresh(existing_evento)
+        await incrementar_version(db, Eventos.__tablename__)
+        await db.commit()
+        await db.refresh(existing_evento)
         return existing_evento
     else:
         raise HTTPException(status_code=404, detail="Evento no encontrado")
 
-@router.put("/update-feedback/", tags=["feedback"])
-async def update_feedback(updated_feedback: FeedbackModel, db: Session = Depends(get_db)):
-    existing_feedback = db.query(Feedback).filter(Feedback.feedback_id == updated_feedback.feedback_id).first()
+@router.put("/update-feedback/", response_model=FeedbackRespuesta, tags=["feedback"])
+async def update_feedback(updated_feedback: FeedbackModel, db: AsyncSession = Depends(get_async_db)):
+    existing_feedback = await obtener_por_id(db, Feedback, updated_feedback.feedback_id)
 
     if existing_feedback:
+        claves_anteriores = (existing_feedback.voluntario_id, existing_feedback.evento_id)
         # Update the attributes of the existing feedback
         for field, value in jsonable_encoder(updated_feedback).items():
             if value is not None:  # Only update fields that are provided (not None)
                 setattr(existing_feedback, field, value)
         
-        db.commit()
-        db.refresh(existing_feedback)
+        await db.flush()
+        await recalcular_resumenes(
+            db,
+            voluntario_ids=[claves_anteriores[0], existing_feedback.voluntario_id],
+            evento_ids=[claves_anteriores[1], existing_feedback.evento_id]
+        )
+        await incrementar_version(db, Feedback.__tablename__)
+        await db.commit()
+        await db.refresh(existing_feedback)
         return existing_feedback
     else:
         raise HTTPException(status_code=404, detail="Feedback no encontrado")
 
-@router.put("/update-voluntario/", tags=["voluntarios"])
-async def update_voluntario(updated_voluntario: VoluntariosModel, db: Session = Depends(get_db)):
-    existing_voluntario = db.query(Voluntarios).filter(Voluntarios.voluntarios_id == updated_voluntario.voluntarios_id).first()
-
-    if existing_voluntario:
-        # Update the attributes of the existing voluntario
-        for field, value in jsonable_encoder(updated_voluntario).items():
-            if value is not None:  # Only update fields that are provided (not None)
-                setattr(existing_voluntario, field, value)
-        
-        db.commit()
-        db.refresh(existing_voluntario)
-        return existing_voluntario
-    else:
-        raise HTTPException(status_code=404, detail="Voluntario no encontrado")
-
 @router.delete("/delete-asignacion/{asignacion_id}", tags=["asignaciones"])
-async def delete_asignacion(asignacion_id: int, db: Session = Depends(get_db)):
-    existing_asignacion = db.query(Asignaciones).filter(Asignaciones.asignaciones_id == asignacion_id).first()
+async def delete_asignacion(asignacion_id: int, db: AsyncSession = Depends(get_async_db)):
+    existing_asignacion = await obtener_por_id(db, Asignaciones, asignacion_id)
 
     if existing_asignacion:
-        db.delete(existing_asignacion)
-        db.commit()
+        await db.delete(existing_asignacion)
+        await incrementar_version(db, Asignaciones.__tablename__)
+        await db.commit()
         return True
 
     return False
 
 @router.delete("/delete-evento/{evento_id}", tags=["eventos"])
-async def delete_evento(evento_id: int, db: Session = Depends(get_db)):
-    existing_evento = db.query(Eventos).filter(Eventos.eventos_id == evento_id).first()
+async def delete_evento(evento_id: int, db: AsyncSession = Depends(get_async_db)):
+    existing_evento = await obtener_por_id(db, Eventos, evento_id)
 
     if existing_evento:
-        db.delete(existing_evento)
-        db.commit()
+        await db.delete(existing_evento)
+        await db.flush()
+        # ON DELETE borra o pone a NULL las filas hijas en la base de datos
+        await recalcular_resumenes(db, evento_ids=[evento_id])
+        await incrementar_version(db, Eventos.__tablename__, Asignaciones.__tablename__, Feedback.__tablename__)
+        await db.commit()
         return True
 
     return False
 
 @router.delete("/delete-feedback/{feedback_id}", tags=["feedback"])
-async def delete_feedback(feedback_id: int, db: Session = Depends(get_db)):
-    existing_feedback = db.query(Feedback).filter(Feedback.feedback_id == feedback_id).first()
+async def delete_feedback(feedback_id: int, db: AsyncSession = Depends(get_async_db)):
+    existing_feedback = await obtener_por_id(db, Feedback, feedback_id)
 
     if existing_feedback:
-        db.delete(existing_feedback)
-        db.commit()
+        await db.delete(existing_feedback)
+        await db.flush()
+        await recalcular_resumenes(
+            db,
+            voluntario_ids=[existing_feedback.voluntario_id],
+            evento_ids=[existing_feedback.evento_id]
+        )
+        await incrementar_version(db, Feedback.__tablename__)
+        await db.commit()
         return True
 
     return False
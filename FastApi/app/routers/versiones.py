@@ -0,0 +1,78 @@
+"""
+Versiones por tabla para respuestas condicionales (ETag / If-None-Match).
+
+Cada tabla tiene un contador en ``versiones_tablas`` que los endpoints de
+escritura incrementan en la misma transacción que el cambio. Los listados
+construyen el ETag a partir de ese contador y de los parámetros de la
+petición, de modo que si el cliente ya tiene esa versión se responde
+``304 Not Modified`` con una sola lectura por clave primaria, sin ejecutar la
+consulta del listado ni serializar nada.
+"""
+import zlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import VersionesTablas
+
+
+async def obtener_version(db: AsyncSession, tabla: str) -> int:
+    """Devuelve la versión actual de ``tabla`` (0 si nunca se ha modificado)."""
+    version = await db.scalar(select(VersionesTablas.version).where(VersionesTablas.tabla == tabla))
+    return version or 0
+
+
+async def incrementar_version(db: AsyncSession, *tablas: str) -> None:
+    """
+    Incrementa el contador de cada tabla modificada.
+
+    No hace commit: debe llamarse antes del commit del propio cambio para que
+    ambos queden en la misma transacción.
+    """
+    for tabla in tablas:
+        resultado = await db.execute(
+            update(VersionesTablas)
+            .where(VersionesTablas.tabla == tabla)
+            .values(version=VersionesTablas.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount == 0:
+            await db.execute(insert(VersionesTablas).values(tabla=tabla, version=1))
+
+
+def calcular_etag(tabla: str, version: int, request: Request) -> str:
+    """ETag de un listado: versión de la tabla más los parámetros de la consulta."""
+    parametros = zlib.crc32(str(request.query_params).encode())
+    return f'"{tabla}-{version}-{parametros:08x}"'
+
+
+def etag_coincide(request: Request, etag: str) -> bool:
+    """Comprueba si ``etag`` aparece en la cabecera If-None-Match de la petición."""
+    cabecera = request.headers.get("if-none-match")
+    if not cabecera:
+        return False
+    if cabecera.strip() == "*":
+        return True
+    candidatos = {valor.strip().removeprefix("W/") for valor in cabecera.split(",")}
+    return etag in candidatos
+
+
+async def responder_si_no_modificado(
+    db: AsyncSession,
+    request: Request,
+    response: Response,
+    tabla: str
+) -> Optional[Response]:
+    """
+    Calcula el ETag del listado y devuelve una respuesta 304 si el cliente ya
+    tiene esa versión. En caso contrario añade el ETag a ``response`` y
+    devuelve None para que el endpoint ejecute la consulta.
+    """
+    etag = calcular_etag(tabla, await obtener_version(db, tabla), request)
+    cabeceras = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_coincide(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabeceras)
+    response.headers.update(cabeceras)
+    return None
@@ -0,0 +1,126 @@
+"""
+Modelos de respuesta de los endpoints REST.
+
+Se validan directamente desde los objetos ORM (``from_attributes``) y se
+serializan con el núcleo en Rust de pydantic antes de pasar por
+``ORJSONResponse``, evitando el recorrido campo a campo de ``jsonable_encoder``.
+
+Salvo la clave primaria, todos los campos son opcionales para poder devolver
+sólo los pedidos con ``?fields=`` (las rutas usan ``response_model_exclude_unset``).
+"""
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class UsuariosRespuesta(BaseModel):
+    usuarios_id: int
+    nombre: Optional[str] = None
+    apellido: Optional[str] = None
+    correo: Optional[str] = None
+    telefono: Optional[str] = None
+    tipo: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+
+    class Config:
+        from_attributes = True
+
+
+class VoluntariosRespuesta(BaseModel):
+    voluntarios_id: int
+    habilidades: Optional[str] = None
+    disponibilidad: Optional[str] = None
+    usuario_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class EventosRespuesta(BaseModel):
+    eventos_id: int
+    nombre: Optional[str] = None
+    fecha: Optional[str] = None
+    hora: Optional[str] = None
+    starts_at: Optional[datetime] = None
+    ubicacion: Optional[str] = None
+    voluntarios_necesarios: Optional[int] = None
+    descripcion_eventos: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class AsignacionesRespuesta(BaseModel):
+    asignaciones_id: int
+    evento_id: Optional[int] = None
+    voluntario_id: Optional[int] = None
+    rol: Optional[str] = None
+    estado: Optional[str] = None
+    fecha_asignacion: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FeedbackRespuesta(BaseModel):
+    feedback_id: int
+    evento_id: Optional[int] = None
+    voluntario_id: Optional[int] = None
+    calificacion: Optional[int] = None
+    comentario: Optional[str] = None
+    fecha_creacion: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ResumenPersonalEventoRespuesta(BaseModel):
+    eventos_id: int
+    nombre: Optional[str] = None
+    fecha: Optional[str] = None
+    voluntarios_necesarios: Optional[int] = None
+    asignados: int
+    por_estado: Dict[str, int]
+    faltantes: Optional[int] = None
+
+
+class ResumenFeedbackVoluntarioRespuesta(BaseModel):
+    voluntario_id: int
+    total: int = 0
+    suma: int = 0
+    promedio: Optional[float] = None
+    ultima_fecha: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ResumenFeedbackEventoRespuesta(BaseModel):
+    evento_id: int
+    total: int = 0
+    suma: int = 0
+    promedio: Optional[float] = None
+    ultima_fecha: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ResultadoBusquedaEvento(BaseModel):
+    eventos_id: int
+    nombre: Optional[str] = None
+    fecha: Optional[str] = None
+    starts_at: Optional[datetime] = None
+    fragmento: Optional[str] = None
+    relevancia: float
+
+
+class ResultadoBusquedaFeedback(BaseModel):
+    feedback_id: int
+    evento_id: Optional[int] = None
+    voluntario_id: Optional[int] = None
+    calificacion: Optional[int] = None
+    fragmento: Optional[str] = None
+    relevancia: float
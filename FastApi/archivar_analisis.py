@@ -0,0 +1,36 @@
+"""
+Mueve a volunteer_analysis_archive los análisis terminados que quedan fuera
+de los N más recientes de cada voluntario (ver app/agent_flow/archivo_analisis.py).
+
+La aplicación lo hace periódicamente; este script sirve para vaciar de una vez
+un historial acumulado, p. ej. justo después de aplicar la migración.
+
+Uso:
+    python archivar_analisis.py [--retener 20] [--lote 500] [--pausa 0.5]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.agent_flow.archivo_analisis import archivar_analisis
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal, async_engine
+from app.models.agent_models import VolunteerAnalysis
+
+
+async def main(retener: int, lote: int, pausa: float):
+    movidos = await archivar_analisis(retener=retener, lote=lote, pausa=pausa)
+    async with AsyncSessionLocal() as db:
+        activos = await db.scalar(select(func.count()).select_from(VolunteerAnalysis))
+    await async_engine.dispose()
+    print(f"Análisis archivados: {movidos}; quedan {activos} en volunteer_analysis")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retener", type=int, default=settings.ANALISIS_RETENER_POR_VOLUNTARIO)
+    parser.add_argument("--lote", type=int, default=settings.ANALISIS_ARCHIVO_LOTE)
+    parser.add_argument("--pausa", type=float, default=settings.ANALISIS_ARCHIVO_PAUSA_S)
+    args = parser.parse_args()
+    asyncio.run(main(args.retener, args.lote, args.pausa))
@@ -0,0 +1,109 @@
+"""
+Benchmark de la búsqueda de texto completo en comentarios de feedback (FTS5):
+inserta ``--comentarios`` comentarios aleatorios en un fichero SQLite temporal
+y mide la latencia de ``buscar_texto`` frente a un ``LIKE '%palabra%'``.
+
+Las palabras siguen una distribución de Zipf sobre un vocabulario de 5.000
+términos más las palabras vacías, como un texto real: el coste de FTS5 crece
+con el número de filas que contienen las palabras buscadas (bm25 puntúa todas
+antes de quedarse con las mejores), mientras que LIKE sin coincidencias
+suficientes recorre la tabla entera.
+
+Uso:
+    python benchmarks/busqueda_texto.py --comentarios 300000 --repeticiones 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz al path de Python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.models.models import Feedback
+from app.routers.busqueda import buscar_texto, COLUMNAS_FEEDBACK, PALABRAS_VACIAS
+
+VOCABULARIO = sorted(PALABRAS_VACIAS) + [f"termino{i}" for i in range(5000)]
+PESOS = [1 / (posicion + 1) for posicion in range(len(VOCABULARIO))]
+# Frecuente (~8% de las filas), media, rara y varias palabras con palabras vacías
+BUSQUEDAS = {
+    "frecuente": "termino0",
+    "media": "termino200",
+    "rara": "termino3000",
+    "varias": "el termino50 de la termino400",
+}
+
+
+def poblar(ruta: str, comentarios: int) -> None:
+    engine = create_engine(f"sqlite:///{ruta}")
+    Base.metadata.create_all(bind=engine)
+    aleatorio = random.Random(0)
+    with engine.begin() as conexion:
+        for inicio in range(0, comentarios, 10_000):
+            conexion.execute(insert(Feedback), [
+                {
+                    "feedback_id": i,
+                    "calificacion": aleatorio.randint(1, 5),
+                    "comentario": " ".join(aleatorio.choices(VOCABULARIO, PESOS, k=aleatorio.randint(5, 30))),
+                }
+                for i in range(inicio + 1, min(inicio + 10_000, comentarios) + 1)
+            ])
+    engine.dispose()
+
+
+async def medir(ruta: str, repeticiones: int) -> dict:
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{ruta}")
+    fabrica = sessionmaker(async_engine, class_=AsyncSession)
+    tiempos = {(nombre, metodo): [] for nombre in BUSQUEDAS for metodo in ("fts5", "like")}
+    async with fabrica() as db:
+        for _ in range(repeticiones):
+            for nombre, texto in BUSQUEDAS.items():
+                inicio = time.perf_counter()
+                await buscar_texto(db, Feedback, COLUMNAS_FEEDBACK, texto, 20)
+                tiempos[nombre, "fts5"].append(time.perf_counter() - inicio)
+
+                consulta = select(*COLUMNAS_FEEDBACK).limit(20)
+                for palabra in texto.split():
+                    consulta = consulta.where(Feedback.comentario.like(f"% {palabra} %"))
+                inicio = time.perf_counter()
+                (await db.execute(consulta)).all()
+                tiempos[nombre, "like"].append(time.perf_counter() - inicio)
+    await async_engine.dispose()
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comentarios", type=int, default=300_000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    fd, ruta = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        inicio = time.perf_counter()
+        poblar(ruta, args.comentarios)
+        print(f"{args.comentarios} comentarios insertados e indexados en {time.perf_counter() - inicio:.1f} s")
+        tiempos = asyncio.run(medir(ruta, args.repeticiones))
+    finally:
+        for sufijo in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(ruta + sufijo):
+                os.remove(ruta + sufijo)
+
+    print(f"{'busqueda':<12}{'metodo':<8}{'p50 ms':>10}{'p95 ms':>10}")
+    for (nombre, metodo), muestras in tiempos.items():
+        percentiles = statistics.quantiles(muestras, n=20)
+        print(f"{nombre:<12}{metodo:<8}{statistics.median(muestras) * 1000:>10.2f}{percentiles[18] * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Microbenchmark de las búsquedas por ID y por correo de ``app.db.repositorio``
+frente a construir la sentencia en cada llamada (``select(...).where(...)``)
+y frente a ``AsyncSession.get``.
+
+Cada iteración abre una sesión, hace una búsqueda y la cierra, como una
+petición autenticada. El fichero SQLite es temporal y la fila está en la
+caché de páginas, así que la diferencia es casi toda trabajo de Python.
+
+Uso:
+    python benchmarks/consultas_por_id.py --iteraciones 5000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz al path de Python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.db.repositorio import obtener_por_id, usuario_por_correo, usuario_por_id
+from app.models.models import Usuarios
+
+CORREO = "benchmark@example.com"
+
+VARIANTES = {
+    "select por id": lambda db: db.scalar(select(Usuarios).where(Usuarios.usuarios_id == 1)),
+    "session.get": lambda db: db.get(Usuarios, 1),
+    "usuario_por_id": lambda db: usuario_por_id(db, 1),
+    "obtener_por_id": lambda db: obtener_por_id(db, Usuarios, 1),
+    "select por correo": lambda db: db.scalar(select(Usuarios).where(Usuarios.correo == CORREO)),
+    "usuario_por_correo": lambda db: usuario_por_correo(db, CORREO),
+}
+
+
+async def medir(ruta: str, iteraciones: int, rondas: int) -> dict:
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{ruta}")
+    fabrica = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    resultados = {nombre: [] for nombre in VARIANTES}
+    # Rondas alternas para que el ruido afecte por igual a todas las variantes
+    for _ in range(rondas):
+        for nombre, buscar in VARIANTES.items():
+            inicio = time.perf_counter()
+            for _ in range(iteraciones):
+                async with fabrica() as db:
+                    assert (await buscar(db)) is not None
+            resultados[nombre].append((time.perf_counter() - inicio) / iteraciones * 1e6)
+    await async_engine.dispose()
+    return {nombre: statistics.median(muestras) for nombre, muestras in resultados.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iteraciones", type=int, default=5000)
+    parser.add_argument("--rondas", type=int, default=3)
+    args = parser.parse_args()
+
+    fd, ruta = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        engine = create_engine(f"sqlite:///{ruta}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conexion:
+            conexion.execute(Usuarios.__table__.insert().values(
+                usuarios_id=1, nombre="Bench", apellido="Mark", correo=CORREO, tipo="voluntario", hashed_password="x"
+            ))
+        engine.dispose()
+        tiempos = asyncio.run(medir(ruta, args.iteraciones, args.rondas))
+    finally:
+        for sufijo in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(ruta + sufijo):
+                os.remove(ruta + sufijo)
+
+    print(f"{args.iteraciones} búsquedas por variante, mediana de {args.rondas} rondas")
+    print(f"{'variante':<20}{'µs/búsqueda':>14}")
+    for nombre, microsegundos in tiempos.items():
+        print(f"{nombre:<20}{microsegundos:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Benchmark de latencia y rendimiento de los endpoints: listados e inserciones
+REST, ``getVoluntarios``/``getEventos`` de GraphQL y las rutas de análisis
+del agente.
+
+Se ejecuta sin red: la aplicación corre en el mismo proceso (cliente httpx
+sobre ASGI, sin servidor ni eventos de arranque) contra una base de datos
+SQLite cargada con ``generar_datos.py``. La llamada a n8n al iniciar un
+análisis se sustituye por una corrutina vacía: se mide la API, no n8n.
+
+Cada escenario hace ``--calentamiento`` peticiones que no cuentan y luego
+``--peticiones`` repartidas entre ``--concurrencia`` clientes simultáneos.
+Se guardan en JSON las latencias p50/p95/p99 y las peticiones por segundo
+de cada escenario, con el commit y el entorno. Con ``--comparar`` se
+contrasta el resultado con un JSON anterior y se termina con código 1 si
+algún escenario empeora más de ``--tolerancia`` por ciento (p95 o
+peticiones por segundo).
+
+Uso:
+    python benchmarks/endpoints.py --escala 100000 --peticiones 500 --concurrencia 8
+        [--base carga.db] [--salida resultado.json] [--comparar anterior.json] [--tolerancia 15]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
+
+# Agregar el directorio raíz al path de Python
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import sqlalchemy
+
+LIMITE = 50
+
+
+@dataclass
+class Escenario:
+    nombre: str
+    # Argumentos de ``AsyncClient.request`` para la petición número i
+    peticion: Callable[[int], dict]
+
+
+def percentil(ordenadas: List[float], p: float) -> float:
+    """Percentil por interpolación lineal de una lista ya ordenada."""
+    posicion = (len(ordenadas) - 1) * p / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenadas) - 1)
+    return ordenadas[inferior] + (ordenadas[superior] - ordenadas[inferior]) * (posicion - inferior)
+
+
+def resumir(latencias_ms: List[float], errores: int, duracion: float) -> dict:
+    ordenadas = sorted(latencias_ms)
+    return {
+        "peticiones": len(ordenadas),
+        "errores": errores,
+        "rps": round(len(ordenadas) / duracion, 1),
+        "media_ms": round(statistics.fmean(ordenadas), 2),
+        "p50_ms": round(percentil(ordenadas, 50), 2),
+        "p95_ms": round(percentil(ordenadas, 95), 2),
+        "p99_ms": round(percentil(ordenadas, 99), 2),
+        "max_ms": round(ordenadas[-1], 2),
+    }
+
+
+def comparar(anterior: dict, actual: dict, tolerancia: float) -> List[str]:
+    """Imprime la variación de cada escenario común y devuelve los que empeoran más de ``tolerancia`` %."""
+    regresiones = []
+    print(f"\n{'escenario':<36}{'p95 antes':>11}{'p95 ahora':>11}{'Δp95':>8}{'rps antes':>11}{'rps ahora':>11}{'Δrps':>8}")
+    for nombre, ahora in actual["escenarios"].items():
+        antes = anterior.get("escenarios", {}).get(nombre)
+        if antes is None:
+            continue
+        delta_p95 = (ahora["p95_ms"] / antes["p95_ms"] - 1) * 100 if antes["p95_ms"] else 0.0
+        delta_rps = (ahora["rps"] / antes["rps"] - 1) * 100 if antes["rps"] else 0.0
+        marca = ""
+        if delta_p95 > tolerancia or delta_rps < -tolerancia:
+            regresiones.append(nombre)
+            marca = "  <- regresión"
+        print(f"{nombre:<36}{antes['p95_ms']:>11.2f}{ahora['p95_ms']:>11.2f}{delta_p95:>+7.1f}%"
+              f"{antes['rps']:>11.1f}{ahora['rps']:>11.1f}{delta_rps:>+7.1f}%{marca}")
+    return regresiones
+
+
+def crear_escenarios(maximos: Dict[str, int], token: str) -> List[Escenario]:
+    """Escenarios sobre los IDs existentes; las inserciones usan IDs por encima del máximo de cada tabla."""
+    autorizacion = {"Authorization": f"Bearer {token}"}
+    voluntarios, eventos, analisis = maximos["Voluntarios"], maximos["Eventos"], maximos["volunteer_analysis"]
+
+    def graphql(campo: str, seleccion: str, total: int) -> Callable[[int], dict]:
+        return lambda i: {"method": "POST", "url": "/graphql", "json": {
+            "query": f"query($after: Int) {{ {campo}(after: $after, limit: {LIMITE}) {{ {seleccion} }} }}",
+            "variables": {"after": (i * 7919) % total},
+        }}
+
+    def listado(ruta: str, total: int) -> Callable[[int], dict]:
+        # Páginas repartidas por toda la tabla, no siempre la primera
+        return lambda i: {"method": "GET", "url": ruta, "params": {"cursor": (i * 7919) % total, "limit": LIMITE}}
+
+    return [
+        Escenario("GET /api/usuarios", listado("/api/usuarios", maximos["Usuarios"])),
+        Escenario("GET /api/voluntarios", listado("/api/voluntarios", voluntarios)),
+        Escenario("GET /api/eventos", listado("/api/eventos", eventos)),
+        Escenario("GET /api/asignaciones", listado("/api/asignaciones", maximos["Asignaciones"])),
+        Escenario("GET /api/feedback", listado("/api/feedback", maximos["feedback"])),
+        Escenario("POST /api/add-voluntarios/", lambda i: {"method": "POST", "url": "/api/add-voluntarios/", "json": {
+            "voluntarios_id": voluntarios + 1 + i, "habilidades": "Logística, Cocina",
+            "disponibilidad": "Fines de semana", "usuario_id": None,
+        }}),
+        Escenario("POST /api/add-evento/", lambda i: {"method": "POST", "url": "/api/add-evento/", "json": {
+            "eventos_id": eventos + 1 + i, "nombre": "Reparto de alimentos", "fecha": "2026-06-01", "hora": "10:00",
+            "ubicacion": "Centro", "voluntarios_necesarios": 10, "descripcion_eventos": "Reparto en el almacén central.",
+        }}),
+        Escenario("POST /api/add-asignacion/", lambda i: {"method": "POST", "url": "/api/add-asignacion/", "json": {
+            "asignaciones_id": maximos["Asignaciones"] + 1 + i, "evento_id": 1 + i % eventos,
+            "voluntario_id": 1 + i % voluntarios, "rol": "Ayudante", "estado": "Pendiente",
+            "fecha_asignacion": "2026-05-20",
+        }}),
+        Escenario("POST /api/add-feedback/", lambda i: {"method": "POST", "url": "/api/add-feedback/", "json": {
+            "feedback_id": maximos["feedback"] + 1 + i, "evento_id": 1 + i % eventos,
+            "voluntario_id": 1 + i % voluntarios, "calificacion": 1 + i % 5, "comentario": "Muy buena organización.",
+        }}),
+        Escenario("GraphQL getVoluntarios", graphql("getVoluntarios", "voluntariosId habilidades disponibilidad usuarioId", voluntarios)),
+        Escenario("GraphQL getEventos", graphql("getEventos", "eventosId nombre fecha hora ubicacion descripcionEventos", eventos)),
+        Escenario("GET agent/analysis/{id}", lambda i: {
+            "method": "GET", "url": f"/api/v1/agent/analysis/{1 + (i * 7919) % analisis}", "headers": autorizacion,
+        }),
+        Escenario("GET agent/volunteer/{id}/analyses", lambda i: {
+            "method": "GET", "url": f"/api/v1/agent/volunteer/{1 + i % 50}/analyses", "headers": autorizacion,
+        }),
+        Escenario("GET agent/.../analyses (estado)", lambda i: {
+            "method": "GET", "url": f"/api/v1/agent/volunteer/{1 + i % 50}/analyses",
+            "params": {"incluir_resultado": False}, "headers": autorizacion,
+        }),
+        Escenario("POST agent/analyze-volunteer", lambda i: {
+            "method": "POST", "url": "/api/v1/agent/analyze-volunteer", "headers": autorizacion,
+            "json": {"voluntario_id": 1 + i % voluntarios},
+        }),
+        Escenario("POST agent/webhook/analysis-update", lambda i: {
+            "method": "POST", "url": "/api/v1/agent/webhook/analysis-update", "json": {
+                "analysis_id": 1 + (i * 7919) % analisis, "status": "completed",
+                "result": {"resumen": "Voluntario con buen desempeño y participación constante.", "puntuacion": i % 100},
+            },
+        }),
+    ]
+
+
+async def medir(cliente, escenario: Escenario, peticiones: int, concurrencia: int, calentamiento: int) -> dict:
+    numeros = itertools.count()
+    for _ in range(calentamiento):
+        await cliente.request(**escenario.peticion(next(numeros)))
+
+    latencias: List[float] = []
+    errores = 0
+
+    async def trabajador():
+        nonlocal errores
+        while len(latencias) + errores < peticiones:
+            argumentos = escenario.peticion(next(numeros))
+            inicio = time.perf_counter()
+            respuesta = await cliente.request(**argumentos)
+            if respuesta.status_code >= 400:
+                errores += 1
+                continue
+            latencias.append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    return resumir(latencias or [0.0], errores, time.perf_counter() - inicio)
+
+
+async def ejecutar(args, maximos: Dict[str, int], usuario_id: int) -> Dict[str, dict]:
+    import httpx
+
+    from app.agent_flow.n8n_integration import n8n
+    from app.core.security import create_access_token
+    from app.models.agent_models import add_relationship_to_volunteers
+    from main import app
+
+    async def sin_n8n(*args, **kwargs):
+        return None
+
+    n8n.trigger_volunteer_analysis = sin_n8n
+    add_relationship_to_volunteers()
+    token = create_access_token({"sub": str(usuario_id)})
+
+    resultados = {}
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark") as cliente:
+        for escenario in crear_escenarios(maximos, token):
+            if args.solo and not any(filtro in escenario.nombre for filtro in args.solo):
+                continue
+            resultado = await medir(cliente, escenario, args.peticiones, args.concurrencia, args.calentamiento)
+            resultados[escenario.nombre] = resultado
+            print(f"{escenario.nombre:<36}{resultado['p50_ms']:>9.2f}{resultado['p95_ms']:>9.2f}"
+                  f"{resultado['p99_ms']:>9.2f}{resultado['rps']:>10.1f}{resultado['errores']:>8}")
+    return resultados
+
+
+def generar_base(ruta: str, args) -> None:
+    """Carga en ``ruta`` una base de datos nueva con el generador de datos sintéticos."""
+    import generar_datos
+    from app.database.database import Base
+    from app.db.datos_sinteticos import Contexto, calcular_tamanos
+
+    url = f"sqlite:///{ruta}"
+    engine = generar_datos.crear_engine_carga(url)
+    Base.metadata.create_all(bind=engine)
+    generar_datos.quitar_indices(engine)
+    contexto = Contexto(
+        semilla=args.semilla,
+        tamanos=calcular_tamanos(args.escala),
+        referencia=date(2026, 1, 1),
+        # El benchmark se autentica con un JWT: la contraseña no se usa
+        hashed_password="!",
+    )
+    print(f"Generando {args.escala:,} filas en {ruta}...")
+    generar_datos.cargar(engine, url, contexto, os.cpu_count() or 1, 20_000)
+    generar_datos.reconstruir_derivados(engine, url)
+    engine.dispose()
+
+
+def leer_maximos(ruta: str) -> tuple:
+    """Máximo ID de cada tabla y un usuario activo con el que autenticarse."""
+    from app.database.database import Base
+    from app.models.models import Usuarios
+
+    engine = sqlalchemy.create_engine(f"sqlite:///{ruta}")
+    with engine.connect() as conexion:
+        maximos = {}
+        for nombre in ("Usuarios", "Voluntarios", "Eventos", "Asignaciones", "feedback", "volunteer_analysis"):
+            tabla = Base.metadata.tables[nombre]
+            clave = tabla.primary_key.columns[0]
+            maximos[nombre] = conexion.scalar(sqlalchemy.select(sqlalchemy.func.max(clave))) or 1
+        usuario_id = conexion.scalar(
+            sqlalchemy.select(Usuarios.usuarios_id).where(Usuarios.is_active.is_(True)).limit(1)
+        )
+    engine.dispose()
+    return maximos, usuario_id
+
+
+def commit_actual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escala", type=int, default=100_000, help="Filas de la base de datos generada")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--base", help="Base de datos SQLite ya cargada (no se genera una temporal)")
+    parser.add_argument("--peticiones", type=int, default=500)
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--calentamiento", type=int, default=20)
+    parser.add_argument("--solo", nargs="*", help="Ejecuta sólo los escenarios cuyo nombre contiene alguno de estos textos")
+    parser.add_argument("--salida", help="Fichero JSON de resultados (por defecto benchmarks/resultados/endpoints-<fecha>.json)")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--tolerancia", type=float, default=15.0, help="Empeoramiento en %% que cuenta como regresión")
+    args = parser.parse_args()
+
+    if args.base:
+        ruta = os.path.abspath(args.base)
+    else:
+        fd, ruta = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+    # La configuración se lee al importar app por primera vez: la URL tiene que fijarse antes
+    os.environ["DATABASE_URL"] = f"sqlite:///{ruta}"
+    if not args.base:
+        generar_base(ruta, args)
+    maximos, usuario_id = leer_maximos(ruta)
+    # Sin el log INFO de cada petición (app.sql, httpx), que falsearía las medidas
+    logging.disable(logging.INFO)
+
+    print(f"{'escenario':<36}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'rps':>10}{'errores':>8}")
+    try:
+        escenarios = asyncio.run(ejecutar(args, maximos, usuario_id))
+    finally:
+        if not args.base:
+            for sufijo in ("", "-wal", "-shm"):
+                if os.path.exists(ruta + sufijo):
+                    os.remove(ruta + sufijo)
+
+    resultado = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit_actual(),
+        "entorno": {
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "parametros": {
+            "escala": None if args.base else args.escala,
+            "semilla": args.semilla,
+            "base": args.base,
+            "peticiones": args.peticiones,
+            "concurrencia": args.concurrencia,
+            "calentamiento": args.calentamiento,
+        },
+        "escenarios": escenarios,
+    }
+    salida = args.salida or os.path.join(
+        RAIZ, "benchmarks", "resultados", f"endpoints-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as fichero:
+        json.dump(resultado, fichero, ensure_ascii=False, indent=2)
+    print(f"\nResultados guardados en {salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as fichero:
+            regresiones = comparar(json.load(fichero), resultado, args.tolerancia)
+        if regresiones:
+            print(f"\nRegresiones de más del {args.tolerancia:g}%: {', '.join(regresiones)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
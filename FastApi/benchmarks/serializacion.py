@@ -0,0 +1,91 @@
+"""
+Benchmark de serialización de listados: ``jsonable_encoder`` + ``JSONResponse``
+(camino anterior, ``response_model=None``) frente a ``response_model`` tipado
++ ``ORJSONResponse`` (camino actual).
+
+Ambos endpoints devuelven las mismas filas ORM ya cargadas en memoria, así que
+se mide sólo la serialización, no la consulta.
+
+Uso:
+    python benchmarks/serializacion.py --filas 10000 --repeticiones 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+# Agregar el directorio raíz al path de Python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app.models.models import Eventos
+from app.schemas.recursos import EventosRespuesta
+
+
+def crear_eventos(filas: int) -> List[Eventos]:
+    return [
+        Eventos(
+            eventos_id=i,
+            nombre=f"Recolecta {i}",
+            fecha="2030-01-01",
+            hora="10:00",
+            ubicacion="Almacén central",
+            voluntarios_necesarios=i % 20,
+            descripcion_eventos="Clasificación y reparto de alimentos. " * 4
+        )
+        for i in range(1, filas + 1)
+    ]
+
+
+def crear_app(eventos: List[Eventos]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/anterior", response_model=None, response_class=JSONResponse)
+    async def anterior():
+        return eventos
+
+    @app.get("/tipado", response_model=List[EventosRespuesta], response_class=ORJSONResponse)
+    async def tipado():
+        return eventos
+
+    return app
+
+
+def medir(client: TestClient, ruta: str, repeticiones: int) -> List[float]:
+    # Calentamiento
+    client.get(ruta)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        response = client.get(ruta)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        assert response.status_code == 200
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    client = TestClient(crear_app(crear_eventos(args.filas)))
+    assert client.get("/anterior").json() == client.get("/tipado").json()
+
+    print(f"{args.filas} eventos, {args.repeticiones} repeticiones")
+    print(f"{'camino':<12}{'mediana ms':>12}{'mín ms':>10}")
+    medianas = {}
+    for ruta in ("anterior", "tipado"):
+        tiempos = medir(client, f"/{ruta}", args.repeticiones)
+        medianas[ruta] = statistics.median(tiempos)
+        print(f"{ruta:<12}{medianas[ruta]:>12.1f}{min(tiempos):>10.1f}")
+    print(f"mejora: {medianas['anterior'] / medianas['tipado']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
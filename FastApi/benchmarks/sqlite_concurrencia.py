@@ -0,0 +1,119 @@
+"""
+Benchmark de concurrencia en SQLite: perfil por defecto (journal DELETE, sin
+pragmas, sin cola de escritura) frente al perfil de producción
+(``aplicar_perfil_sqlite`` + cola de escritura de ``app.db.escritura``).
+
+Lanza a la vez ``--escritores`` tareas que insertan eventos y ``--lectores``
+tareas que leen páginas del listado durante ``--segundos`` sobre un fichero
+temporal, y cuenta operaciones por segundo y errores "database is locked".
+Cada escritura deja la transacción abierta ``--trabajo-ms`` entre el flush y
+el commit, como un handler que actualiza agregados antes de confirmar.
+
+Uso:
+    python benchmarks/sqlite_concurrencia.py --escritores 8 --lectores 16 --segundos 5
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz al path de Python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.database.database import Base
+from app.database.engines import activar_claves_foraneas, aplicar_perfil_sqlite
+from app.db.enrutamiento import crear_fabrica_sesiones
+from app.models.models import Eventos
+
+
+async def ejecutar(
+    ruta: str, produccion: bool, escritores: int, lectores: int, segundos: float, trabajo_ms: float
+) -> dict:
+    # Mismo pool en los dos perfiles: sólo cambian los pragmas y la cola
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{ruta}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=escritores + lectores
+    )
+    activar_claves_foraneas(async_engine.sync_engine)
+    if produccion:
+        aplicar_perfil_sqlite(async_engine.sync_engine)
+    fabrica = crear_fabrica_sesiones(async_engine, serializar_escrituras=produccion)
+
+    ids = itertools.count(1)
+    resultado = {"escrituras": 0, "lecturas": 0, "errores": 0}
+    fin = time.perf_counter() + segundos
+
+    async def escritor():
+        while time.perf_counter() < fin:
+            try:
+                async with fabrica() as db:
+                    i = next(ids)
+                    db.add(Eventos(eventos_id=i, nombre=f"Evento {i}", ubicacion="Almacén"))
+                    await db.flush()
+                    await asyncio.sleep(trabajo_ms / 1000)
+                    await db.commit()
+                resultado["escrituras"] += 1
+            except OperationalError:
+                resultado["errores"] += 1
+
+    async def lector():
+        while time.perf_counter() < fin:
+            try:
+                async with fabrica() as db:
+                    await db.execute(select(Eventos).order_by(Eventos.eventos_id.desc()).limit(50))
+                resultado["lecturas"] += 1
+            except OperationalError:
+                resultado["errores"] += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*[escritor() for _ in range(escritores)], *[lector() for _ in range(lectores)])
+    duracion = time.perf_counter() - inicio
+    await async_engine.dispose()
+    return {
+        "escrituras/s": resultado["escrituras"] / duracion,
+        "lecturas/s": resultado["lecturas"] / duracion,
+        "errores": resultado["errores"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escritores", type=int, default=8)
+    parser.add_argument("--lectores", type=int, default=16)
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--trabajo-ms", type=float, default=2)
+    args = parser.parse_args()
+
+    print(
+        f"{args.escritores} escritores, {args.lectores} lectores, {args.segundos:g} s por perfil, "
+        f"{args.trabajo_ms:g} ms de trabajo por escritura"
+    )
+    print(f"{'perfil':<12}{'escrituras/s':>14}{'lecturas/s':>12}{'errores':>9}")
+    for nombre, produccion in (("defecto", False), ("produccion", True)):
+        fd, ruta = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        engine = create_engine(f"sqlite:///{ruta}")
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+        try:
+            r = asyncio.run(ejecutar(
+                ruta, produccion, args.escritores, args.lectores, args.segundos, args.trabajo_ms
+            ))
+        finally:
+            for sufijo in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(ruta + sufijo):
+                    os.remove(ruta + sufijo)
+        print(f"{nombre:<12}{r['escrituras/s']:>14.0f}{r['lecturas/s']:>12.0f}{r['errores']:>9}")
+
+
+if __name__ == "__main__":
+    main()
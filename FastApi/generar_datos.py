@@ -0,0 +1,265 @@
+"""
+Llena una base de datos con datos sintéticos para pruebas de carga
+(ver app/db/datos_sinteticos.py).
+
+La escala es el número aproximado de filas entre todas las tablas
+principales (de 1e3 a 1e7). Varios procesos generan los trozos en paralelo.
+En SQLite, que admite un solo escritor, los procesos dejan cada trozo listo
+para el driver (tuplas ya convertidas con los tipos de cada columna) y el
+proceso principal sólo lo inserta con ``executemany``, un trozo por
+transacción; en el resto de bases de datos cada proceso inserta los suyos.
+Durante la carga se quitan los índices secundarios y los de texto completo, y
+al terminar se reconstruyen junto con el índice de habilidades, los
+resúmenes de feedback y las estadísticas del planificador.
+
+La base de datos debe estar migrada (``alembic upgrade head``) o crearse con
+``--crear-tablas``, y las tablas deben estar vacías (o usar ``--vaciar``).
+Todos los usuarios tienen la contraseña ``CONTRASENA``.
+
+Uso:
+    python generar_datos.py --escala 10000000 --semilla 42 [--procesos 8] [--lote 20000]
+        [--url sqlite:///./carga.db] [--referencia 2026-01-01] [--crear-tablas] [--vaciar]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Index, create_engine, event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.database.database import Base
+from app.database.engines import url_asincrona
+from app.db.datos_sinteticos import Contexto, calcular_tamanos, catalogo_habilidades, generar_trozo, trozos
+from app.models import Habilidades, VoluntariosHabilidades
+from app.models.models import pwd_context
+from app.models.texto_completo import INDICES_TEXTO, borrar_indice_texto, crear_indice_texto, reconstruir_indice_texto
+from app.routers.resumen_feedback import recalcular_resumenes
+
+CONTRASENA = "voluntario123"
+# Tablas que rellena el generador, en orden de inserción
+TABLAS_CARGADAS = ("habilidades", "Usuarios", "Voluntarios", "voluntarios_habilidades", "Eventos",
+                   "Asignaciones", "feedback", "volunteer_analysis")
+# Tablas derivadas que se recalculan (y se vacían con --vaciar)
+TABLAS_DERIVADAS = ("resumen_feedback_voluntario", "resumen_feedback_evento", "volunteer_analysis_archive")
+
+# Estado de cada proceso de trabajo (ver _iniciar_trabajador)
+_contexto: Optional[Contexto] = None
+_engine = None
+
+
+def crear_engine_carga(url: str):
+    """
+    Engine propio para la carga. En SQLite sin ``synchronous`` ni claves
+    foráneas: los datos generados ya son coherentes y una caída a medias
+    obliga a repetir la carga de todos modos.
+    """
+    engine = create_engine(url)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _pragmas_carga(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in ("PRAGMA journal_mode=WAL", "PRAGMA synchronous=OFF", "PRAGMA cache_size=-262144"):
+                cursor.execute(pragma)
+            cursor.close()
+    return engine
+
+
+def escribir(conexion, filas_por_tabla: Dict[str, List[dict]]) -> int:
+    for nombre, filas in filas_por_tabla.items():
+        if filas:
+            conexion.execute(Base.metadata.tables[nombre].insert(), filas)
+    return sum(len(filas) for filas in filas_por_tabla.values())
+
+
+def preparar_sqlite(dialecto, filas_por_tabla: Dict[str, List[dict]]) -> List[Tuple[str, str, List[tuple]]]:
+    """
+    Tabla, INSERT y tuplas de parámetros de cada tabla, con los valores ya convertidos
+    por el tipo de cada columna (fechas, enums, JSON comprimido...) como haría
+    SQLAlchemy al ejecutar, para insertarlas directamente con el driver.
+    """
+    preparador = dialecto.identifier_preparer
+    sentencias = []
+    for nombre, filas in filas_por_tabla.items():
+        if not filas:
+            continue
+        tabla = Base.metadata.tables[nombre]
+        claves = list(filas[0])
+        conversores = [tabla.c[clave].type.dialect_impl(dialecto).bind_processor(dialecto) for clave in claves]
+        sql = (
+            f"INSERT INTO {preparador.format_table(tabla)} "
+            f"({', '.join(preparador.quote(clave) for clave in claves)}) VALUES ({', '.join('?' * len(claves))})"
+        )
+        # Los bytes ya están listos para el driver (y el memoryview del binario no se puede enviar entre procesos)
+        tuplas = [
+            tuple(valor if conversor is None or valor is None or isinstance(valor, bytes) else conversor(valor)
+                  for valor, conversor in zip(fila.values(), conversores))
+            for fila in filas
+        ]
+        sentencias.append((nombre, sql, tuplas))
+    return sentencias
+
+
+def _iniciar_trabajador(contexto: Contexto, url: str) -> None:
+    global _contexto, _engine
+    _contexto = contexto
+    # create_engine no conecta: en SQLite sólo se usa su dialecto
+    _engine = crear_engine_carga(url)
+
+
+def _trabajo(tabla: str, inicio: int, fin: int):
+    filas = generar_trozo(tabla, inicio, fin, _contexto)
+    if _engine.dialect.name == "sqlite":
+        return preparar_sqlite(_engine.dialect, filas)
+    with _engine.begin() as conexion:
+        return escribir(conexion, filas)
+
+
+def comprobar_vacias(engine, vaciar: bool) -> None:
+    tablas = [Base.metadata.tables[nombre] for nombre in TABLAS_CARGADAS + TABLAS_DERIVADAS]
+    with engine.begin() as conexion:
+        if vaciar:
+            for tabla in reversed(Base.metadata.sorted_tables):
+                if tabla in tablas:
+                    conexion.execute(tabla.delete())
+            return
+        ocupadas = [t.name for t in tablas if conexion.scalar(select(func.count()).select_from(t)) > 0]
+    if ocupadas:
+        sys.exit(f"Las tablas {', '.join(ocupadas)} ya tienen datos; usa --vaciar para borrarlos")
+
+
+def cargar(engine, url: str, contexto: Contexto, procesos: int, lote: int) -> Dict[str, int]:
+    """Genera e inserta las tablas principales; devuelve las filas insertadas por tabla."""
+    en_trabajadores = engine.dialect.name != "sqlite"
+    insertadas = {nombre: 0 for nombre in TABLAS_CARGADAS}
+    with engine.begin() as conexion:
+        insertadas["habilidades"] = escribir(conexion, {"habilidades": catalogo_habilidades()})
+
+    def terminar(tabla, futuro):
+        resultado = futuro.result()
+        if en_trabajadores:
+            insertadas[tabla] += resultado
+            return
+        with engine.begin() as conexion:
+            for nombre, sql, tuplas in resultado:
+                conexion.exec_driver_sql(sql, tuplas)
+                insertadas[nombre] += len(tuplas)
+
+    # Como mucho dos trozos en vuelo por proceso, para no acumular en memoria
+    # lo que el escritor aún no ha insertado
+    pendientes = deque()
+    tabla_actual = None
+    with ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador,
+                             initargs=(contexto, url)) as ejecutor:
+        for tabla, inicio, fin in trozos(contexto.tamanos, lote):
+            # Si escriben los trabajadores, una tabla no empieza hasta que la anterior
+            # está completa (claves foráneas)
+            if en_trabajadores and tabla != tabla_actual:
+                while pendientes:
+                    terminar(*pendientes.popleft())
+            tabla_actual = tabla
+            if len(pendientes) >= 2 * procesos:
+                terminar(*pendientes.popleft())
+            pendientes.append((tabla, ejecutor.submit(_trabajo, tabla, inicio, fin)))
+        while pendientes:
+            terminar(*pendientes.popleft())
+    return insertadas
+
+
+async def _recalcular_resumenes(url: str) -> None:
+    async_engine = create_async_engine(url_asincrona(url))
+    async with AsyncSession(async_engine) as db:
+        await recalcular_resumenes(db, completo=True)
+        await db.commit()
+    await async_engine.dispose()
+
+
+def indices_secundarios() -> List[Index]:
+    return [indice for nombre in TABLAS_CARGADAS for indice in Base.metadata.tables[nombre].indexes]
+
+
+def quitar_indices(engine) -> None:
+    """Los índices secundarios y de texto completo se construyen una vez al final y no fila a fila."""
+    with engine.begin() as conexion:
+        for nombre in INDICES_TEXTO:
+            borrar_indice_texto(Base.metadata.tables[nombre], conexion)
+        for indice in indices_secundarios():
+            indice.drop(conexion, checkfirst=True)
+
+
+def reconstruir_derivados(engine, url: str) -> None:
+    """Recrea los índices y recalcula todo lo que la API mantiene al escribir y que la carga se ha saltado."""
+    with engine.begin() as conexion:
+        for indice in indices_secundarios():
+            indice.create(conexion, checkfirst=True)
+        conexion.execute(update(Habilidades).values(
+            total_voluntarios=select(func.count())
+            .where(VoluntariosHabilidades.habilidad_id == Habilidades.habilidades_id)
+            .scalar_subquery()
+        ))
+        for nombre in INDICES_TEXTO:
+            crear_indice_texto(Base.metadata.tables[nombre], conexion)
+            reconstruir_indice_texto(Base.metadata.tables[nombre], conexion)
+        if engine.dialect.name == "postgresql":
+            # Los IDs son explícitos: las secuencias deben continuar tras el máximo
+            for nombre in TABLAS_CARGADAS:
+                tabla = Base.metadata.tables[nombre]
+                if len(tabla.primary_key.columns) == 1:
+                    columna = tabla.primary_key.columns[0].name
+                    conexion.exec_driver_sql(
+                        f"SELECT setval(pg_get_serial_sequence('\"{nombre}\"', '{columna}'), "
+                        f"(SELECT coalesce(max({columna}), 1) FROM \"{nombre}\"))"
+                    )
+    asyncio.run(_recalcular_resumenes(url))
+    with engine.begin() as conexion:
+        conexion.exec_driver_sql("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escala", type=int, default=100_000, help="Filas aproximadas entre todas las tablas")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--lote", type=int, default=20_000, help="Filas por trozo y por transacción")
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--referencia", type=date.fromisoformat, default=date.today(),
+                        help="Fecha en torno a la que se reparten los eventos (AAAA-MM-DD)")
+    parser.add_argument("--crear-tablas", action="store_true")
+    parser.add_argument("--vaciar", action="store_true", help="Borra antes los datos de las tablas afectadas")
+    args = parser.parse_args()
+
+    engine = crear_engine_carga(args.url)
+    if args.crear_tablas:
+        Base.metadata.create_all(bind=engine)
+    comprobar_vacias(engine, args.vaciar)
+    quitar_indices(engine)
+
+    contexto = Contexto(
+        semilla=args.semilla,
+        tamanos=calcular_tamanos(args.escala),
+        referencia=args.referencia,
+        hashed_password=pwd_context.hash(CONTRASENA),
+    )
+    inicio = time.perf_counter()
+    insertadas = cargar(engine, args.url, contexto, args.procesos, args.lote)
+    carga = time.perf_counter() - inicio
+    reconstruir_derivados(engine, args.url)
+    total = time.perf_counter() - inicio
+    engine.dispose()
+
+    filas = sum(insertadas.values())
+    for nombre, n in insertadas.items():
+        print(f"{nombre:<26}{n:>12,}")
+    print(f"{'total':<26}{filas:>12,}")
+    print(f"Carga: {carga:.1f} s ({filas / carga:,.0f} filas/s); con índices derivados: {total:.1f} s")
+    print(f"Contraseña de todos los usuarios: {CONTRASENA}")
+
+
+if __name__ == "__main__":
+    main()
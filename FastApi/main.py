@@ -1,5 +1,6 @@
 from fastapi import FastAPI, Depends, HTTPException, status, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
 from app.websocket.client import websocket_client
 import asyncio
@@ -7,12 +8,17 @@ import logging
 import uvicorn
 from typing import Dict, Any
 from app.db import engine, Base, get_db, SessionLocal
+from app.database.engines import cerrar_engines, estadisticas_pool
+from app.db.enrutamiento import enrutar_peticion
+from app.db.instrumentacion import instrumentar_peticion
 from app.graphql.schema import graphql_app
-from app.routers import routers
+from app.routers import routers, exportacion
 from app.auth.routes import router as auth_router
 from app.models.agent_models import add_relationship_to_volunteers, AnalysisStatus, VolunteerAnalysis
 from app.api.endpoints.agent import router as agent_router
 from app.agent_flow.n8n_integration import n8n, startup_n8n_client, shutdown_n8n_client
+from app.agent_flow.archivo_analisis import tarea_archivo_periodica
+from app.core.config import settings
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -28,7 +34,8 @@ async def connect_websocket():
 
 app = FastAPI(title="FoolBank Volunteers API",
                 description="API para la gestión de voluntarios de FoolBank",
-                version="1.0.0")
+                version="1.0.0",
+                default_response_class=ORJSONResponse)
 
 # Configuración de CORS
 app.add_middleware(
@@ -37,11 +44,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-DB-Consultas", "X-DB-Tiempo-Ms", "X-DB-Repetidas", "X-DB-Lentas",
+                    "Server-Timing"],
 )
 
+# Lecturas a réplicas y lectura de las propias escrituras en la primaria
+app.middleware("http")(enrutar_peticion)
+
+# Número, tiempo, repeticiones y consultas lentas de cada petición
+app.middleware("http")(instrumentar_peticion)
+
 # Incluir routers existentes
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(routers.router, prefix="/api", tags=["api"])
+app.include_router(exportacion.router, prefix="/api", tags=["api"])
 app.include_router(graphql_app, prefix="/graphql")
 app.include_router(agent_router, prefix="/api/v1/agent", tags=["agent"])
 
@@ -66,6 +82,10 @@ async def startup_event():
     
     # Iniciar cliente n8n
     await startup_n8n_client()
+
+    # Archivar periódicamente los análisis antiguos de volunteer_analysis
+    if settings.ANALISIS_ARCHIVO_INTERVALO_S:
+        app.state.tarea_archivo = asyncio.create_task(tarea_archivo_periodica())
     
     # Intentar conectar al WebSocket (no es crítico si falla)
     try:
@@ -140,9 +160,14 @@ async def shutdown():
     except Exception as e:
         logger.error(f"Error al cerrar la conexión WebSocket: {e}")
     
+    # Detener la tarea de archivo de análisis
+    tarea_archivo = getattr(app.state, "tarea_archivo", None)
+    if tarea_archivo is not None:
+        tarea_archivo.cancel()
+
     # Cerrar la conexión a la base de datos
     try:
-        engine.dispose()
+        await cerrar_engines()
         logger.info("Conexión a la base de datos cerrada correctamente")
     except Exception as e:
         logger.error(f"Error al cerrar la conexión a la base de datos: {e}")
@@ -156,6 +181,11 @@ async def shutdown():
     
     logger.info("Aplicación cerrada correctamente")
 
+@app.get("/health/db", tags=["monitorización"])
+async def estado_pool_db():
+    """Estado de los pools de conexiones de todos los engines registrados."""
+    return {"pools": estadisticas_pool()}
+
 @app.get("/test-ws")
 async def test_websocket():
     """Endpoint de prueba para enviar un mensaje a través del WebSocket."""
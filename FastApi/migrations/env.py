@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Importar los modelos
 from app.models import Base
 from app.database.database import SQLALCHEMY_DATABASE_URL
+from app.models.texto_completo import es_objeto_texto_completo
 
 # Configuración de Alembic
 config = context.config
@@ -25,12 +26,17 @@ if config.config_file_name is not None:
 # Metadatos de los modelos
 target_metadata = Base.metadata
 
+def incluir_objeto(objeto, nombre, tipo, reflejado, comparado_con):
+    """Excluye de autogenerate los índices de texto completo, creados con SQL propio."""
+    return not (reflejado and tipo in ("table", "index") and es_objeto_texto_completo(nombre))
+
 def run_migrations_offline() -> None:
     """Ejecuta migraciones en modo 'offline'."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=incluir_objeto,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -50,6 +56,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=incluir_objeto,
             render_as_batch=True
         )
 
@@ -0,0 +1,36 @@
+"""Add versiones_tablas for list ETags
+
+Revision ID: 0666502b9fb4
+Revises: 53ab259ec1c1
+Create Date: 2026-10-18 11:04:27.318240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0666502b9fb4'
+down_revision: Union[str, Sequence[str], None] = '53ab259ec1c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    versiones_tablas = op.create_table('versiones_tablas',
+    sa.Column('tabla', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tabla')
+    )
+    op.bulk_insert(versiones_tablas, [
+        {'tabla': tabla, 'version': 0}
+        for tabla in ('Usuarios', 'Voluntarios', 'Eventos', 'Asignaciones', 'feedback')
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('versiones_tablas')
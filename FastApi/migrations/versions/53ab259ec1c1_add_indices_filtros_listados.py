@@ -0,0 +1,60 @@
+"""Add indices for list endpoint filters
+
+Revision ID: 53ab259ec1c1
+Revises: d2109c0b85e9
+Create Date: 2026-10-18 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '53ab259ec1c1'
+down_revision: Union[str, Sequence[str], None] = 'd2109c0b85e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('Usuarios', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_Usuarios_tipo'), ['tipo'], unique=False)
+
+    with op.batch_alter_table('Voluntarios', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_Voluntarios_usuario_id'), ['usuario_id'], unique=False)
+
+    with op.batch_alter_table('Eventos', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_Eventos_fecha'), ['fecha'], unique=False)
+
+    with op.batch_alter_table('Asignaciones', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_Asignaciones_evento_id'), ['evento_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_Asignaciones_voluntario_id'), ['voluntario_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_Asignaciones_estado'), ['estado'], unique=False)
+
+    with op.batch_alter_table('feedback', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_feedback_evento_id'), ['evento_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_feedback_voluntario_id'), ['voluntario_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('feedback', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_feedback_voluntario_id'))
+        batch_op.drop_index(batch_op.f('ix_feedback_evento_id'))
+
+    with op.batch_alter_table('Asignaciones', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_Asignaciones_estado'))
+        batch_op.drop_index(batch_op.f('ix_Asignaciones_voluntario_id'))
+        batch_op.drop_index(batch_op.f('ix_Asignaciones_evento_id'))
+
+    with op.batch_alter_table('Eventos', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_Eventos_fecha'))
+
+    with op.batch_alter_table('Voluntarios', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_Voluntarios_usuario_id'))
+
+    with op.batch_alter_table('Usuarios', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_Usuarios_tipo'))
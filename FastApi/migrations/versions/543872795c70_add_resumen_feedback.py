@@ -0,0 +1,55 @@
+"""Add feedback fecha_creacion and feedback aggregate tables
+
+Revision ID: 543872795c70
+Revises: 0666502b9fb4
+Create Date: 2026-10-18 12:21:09.645813
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '543872795c70'
+down_revision: Union[str, Sequence[str], None] = '0666502b9fb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('feedback', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('fecha_creacion', sa.DateTime(), nullable=True))
+
+    for tabla, clave in (('resumen_feedback_voluntario', 'voluntario_id'), ('resumen_feedback_evento', 'evento_id')):
+        op.create_table(tabla,
+        sa.Column(clave, sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('suma', sa.Integer(), nullable=False),
+        sa.Column('promedio', sa.Float(), nullable=True),
+        sa.Column('ultima_fecha', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint(clave)
+        )
+        with op.batch_alter_table(tabla, schema=None) as batch_op:
+            batch_op.create_index(batch_op.f(f'ix_{tabla}_promedio'), ['promedio'], unique=False)
+
+    # Backfill de los agregados con el feedback existente
+    for tabla, clave in (('resumen_feedback_voluntario', 'voluntario_id'), ('resumen_feedback_evento', 'evento_id')):
+        op.execute(
+            f"INSERT INTO {tabla} ({clave}, total, suma, promedio, ultima_fecha) "
+            f"SELECT {clave}, COUNT(calificacion), SUM(calificacion), AVG(calificacion), MAX(fecha_creacion) "
+            f"FROM feedback WHERE {clave} IS NOT NULL AND calificacion IS NOT NULL GROUP BY {clave}"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for tabla in ('resumen_feedback_evento', 'resumen_feedback_voluntario'):
+        with op.batch_alter_table(tabla, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{tabla}_promedio'))
+        op.drop_table(tabla)
+
+    with op.batch_alter_table('feedback', schema=None) as batch_op:
+        batch_op.drop_column('fecha_creacion')
@@ -0,0 +1,81 @@
+"""Add habilidades and voluntarios_habilidades
+
+Revision ID: a9794d8a4b84
+Revises: dd7b65d405e6
+Create Date: 2026-10-18 11:50:44.947287
+
+"""
+from typing import Sequence, Union
+
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.routers.habilidades import separar_habilidades
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9794d8a4b84'
+down_revision: Union[str, Sequence[str], None] = 'dd7b65d405e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('habilidades',
+    sa.Column('habilidades_id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=False),
+    sa.Column('total_voluntarios', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('habilidades_id')
+    )
+    with op.batch_alter_table('habilidades', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_habilidades_nombre'), ['nombre'], unique=True)
+
+    op.create_table('voluntarios_habilidades',
+    sa.Column('habilidad_id', sa.Integer(), nullable=False),
+    sa.Column('voluntario_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['habilidad_id'], ['habilidades.habilidades_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['voluntario_id'], ['Voluntarios.voluntarios_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('habilidad_id', 'voluntario_id')
+    )
+    with op.batch_alter_table('voluntarios_habilidades', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_voluntarios_habilidades_voluntario_id'), ['voluntario_id'], unique=False)
+
+    # Backfill: se descompone el texto de habilidades de los voluntarios existentes
+    conexion = op.get_bind()
+    voluntarios = sa.table('Voluntarios', sa.column('voluntarios_id'), sa.column('habilidades'))
+    por_voluntario = {
+        fila.voluntarios_id: separar_habilidades(fila.habilidades)
+        for fila in conexion.execute(sa.select(voluntarios.c.voluntarios_id, voluntarios.c.habilidades))
+    }
+    totales = Counter(nombre for nombres in por_voluntario.values() for nombre in nombres)
+    if not totales:
+        return
+
+    habilidades = sa.table('habilidades', sa.column('habilidades_id'), sa.column('nombre'), sa.column('total_voluntarios'))
+    ids = {nombre: indice for indice, nombre in enumerate(sorted(totales), start=1)}
+    op.bulk_insert(habilidades, [
+        {"habilidades_id": ids[nombre], "nombre": nombre, "total_voluntarios": totales[nombre]}
+        for nombre in ids
+    ])
+    op.bulk_insert(
+        sa.table('voluntarios_habilidades', sa.column('habilidad_id'), sa.column('voluntario_id')),
+        [
+            {"habilidad_id": ids[nombre], "voluntario_id": voluntario_id}
+            for voluntario_id, nombres in por_voluntario.items()
+            for nombre in nombres
+        ]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('voluntarios_habilidades', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_voluntarios_habilidades_voluntario_id'))
+    op.drop_table('voluntarios_habilidades')
+
+    with op.batch_alter_table('habilidades', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_habilidades_nombre'))
+    op.drop_table('habilidades')
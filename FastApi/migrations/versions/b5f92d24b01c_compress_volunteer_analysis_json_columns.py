@@ -0,0 +1,81 @@
+"""Compress volunteer_analysis JSON columns
+
+Revision ID: b5f92d24b01c
+Revises: 0a22c1323f3f
+Create Date: 2026-10-18 12:12:54.968382
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.json_comprimido import comprimir_json, descomprimir_json
+
+TABLAS = ('volunteer_analysis', 'volunteer_analysis_archive')
+COLUMNAS = ('parametros', 'resultado')
+LOTE = 1000
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f92d24b01c'
+down_revision: Union[str, Sequence[str], None] = '0a22c1323f3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _convertir(tabla, tipo_origen, tipo_destino, convertir):
+    """
+    Reescribe parametros y resultado de ``tabla`` con otro tipo: columnas
+    nuevas, copia convertida por lotes de ``LOTE`` filas y cambio de nombre.
+    """
+    with op.batch_alter_table(tabla, schema=None) as batch_op:
+        for columna in COLUMNAS:
+            batch_op.add_column(sa.Column(f'{columna}_nuevo', tipo_destino, nullable=True))
+
+    t = sa.table(
+        tabla,
+        sa.column('id', sa.Integer),
+        *(sa.column(columna, tipo_origen) for columna in COLUMNAS),
+        *(sa.column(f'{columna}_nuevo', tipo_destino) for columna in COLUMNAS)
+    )
+    actualizar = t.update().where(t.c.id == sa.bindparam('_id')).values(
+        **{f'{columna}_nuevo': sa.bindparam(f'_{columna}') for columna in COLUMNAS}
+    )
+    conexion = op.get_bind()
+    ultimo = None
+    while True:
+        consulta = sa.select(t.c.id, *(t.c[columna] for columna in COLUMNAS)).order_by(t.c.id).limit(LOTE)
+        if ultimo is not None:
+            consulta = consulta.where(t.c.id > ultimo)
+        filas = conexion.execute(consulta).all()
+        if not filas:
+            break
+        conexion.execute(actualizar, [
+            {'_id': fila.id, **{f'_{columna}': convertir(fila._mapping[columna]) for columna in COLUMNAS}}
+            for fila in filas
+        ])
+        ultimo = filas[-1].id
+
+    with op.batch_alter_table(tabla, schema=None) as batch_op:
+        for columna in COLUMNAS:
+            batch_op.drop_column(columna)
+    with op.batch_alter_table(tabla, schema=None) as batch_op:
+        batch_op.alter_column('parametros_nuevo', new_column_name='parametros', nullable=False)
+        batch_op.alter_column('resultado_nuevo', new_column_name='resultado')
+
+
+def _comprimir(valor):
+    return None if valor is None else comprimir_json(valor)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabla in TABLAS:
+        _convertir(tabla, sa.JSON(), sa.LargeBinary(), _comprimir)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for tabla in TABLAS:
+        _convertir(tabla, sa.LargeBinary(), sa.JSON(), descomprimir_json)
@@ -0,0 +1,65 @@
+"""Add ON DELETE actions to foreign keys
+
+Revision ID: bea88d1e31cc
+Revises: 543872795c70
+Create Date: 2026-10-18 13:02:51.117904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bea88d1e31cc'
+down_revision: Union[str, Sequence[str], None] = '543872795c70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Las claves foráneas originales no tienen nombre: la convención permite
+# referirse a ellas al recrear las tablas en modo batch (SQLite)
+naming_convention = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+}
+
+# (tabla, columna, tabla referenciada, columna referenciada, ON DELETE)
+CLAVES_FORANEAS = (
+    ('Voluntarios', 'usuario_id', 'Usuarios', 'usuarios_id', 'SET NULL'),
+    ('Asignaciones', 'evento_id', 'Eventos', 'eventos_id', 'CASCADE'),
+    ('Asignaciones', 'voluntario_id', 'Voluntarios', 'voluntarios_id', 'CASCADE'),
+    ('feedback', 'evento_id', 'Eventos', 'eventos_id', 'SET NULL'),
+    ('feedback', 'voluntario_id', 'Voluntarios', 'voluntarios_id', 'SET NULL'),
+    ('volunteer_analysis', 'voluntario_id', 'Voluntarios', 'voluntarios_id', 'CASCADE'),
+)
+
+
+def _recrear_claves_foraneas(con_on_delete: bool) -> None:
+    for tabla in dict.fromkeys(fk[0] for fk in CLAVES_FORANEAS):
+        with op.batch_alter_table(tabla, schema=None, naming_convention=naming_convention) as batch_op:
+            for tabla_fk, columna, referida, columna_referida, on_delete in CLAVES_FORANEAS:
+                if tabla_fk != tabla:
+                    continue
+                nombre = f'fk_{tabla}_{columna}_{referida}'
+                batch_op.drop_constraint(nombre, type_='foreignkey')
+                batch_op.create_foreign_key(
+                    nombre, referida, [columna], [columna_referida],
+                    ondelete=on_delete if con_on_delete else None
+                )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recrear_claves_foraneas(con_on_delete=True)
+
+    # Sin índice, cada voluntario borrado recorre volunteer_analysis entera
+    with op.batch_alter_table('volunteer_analysis', schema=None) as batch_op:
+        batch_op.create_index('ix_volunteer_analysis_voluntario_fecha', ['voluntario_id', 'fecha_creacion'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('volunteer_analysis', schema=None) as batch_op:
+        batch_op.drop_index('ix_volunteer_analysis_voluntario_fecha')
+
+    _recrear_claves_foraneas(con_on_delete=False)
@@ -0,0 +1,49 @@
+"""Add Eventos starts_at
+
+Revision ID: dd7b65d405e6
+Revises: f2416cec533f
+Create Date: 2026-10-18 11:45:33.956414
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.fechas import calcular_inicio
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dd7b65d405e6'
+down_revision: Union[str, Sequence[str], None] = 'f2416cec533f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('Eventos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('starts_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_Eventos_starts_at'), ['starts_at'], unique=False)
+
+    # Backfill: se interpreta la fecha y hora libres de los eventos existentes;
+    # las que no se pueden interpretar quedan a NULL
+    eventos = sa.table('Eventos', sa.column('eventos_id'), sa.column('fecha'), sa.column('hora'), sa.column('starts_at'))
+    conexion = op.get_bind()
+    valores = [
+        {"id": fila.eventos_id, "starts_at": calcular_inicio(fila.fecha, fila.hora)}
+        for fila in conexion.execute(sa.select(eventos.c.eventos_id, eventos.c.fecha, eventos.c.hora))
+    ]
+    valores = [valor for valor in valores if valor["starts_at"] is not None]
+    if valores:
+        conexion.execute(
+            eventos.update().where(eventos.c.eventos_id == sa.bindparam('id')).values(starts_at=sa.bindparam('starts_at')),
+            valores
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('Eventos', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_Eventos_starts_at'))
+        batch_op.drop_column('starts_at')
@@ -0,0 +1,38 @@
+"""Add full-text search indexes
+
+Revision ID: eadbfa3438ab
+Revises: a9794d8a4b84
+Create Date: 2026-10-18 11:54:56.745186
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.texto_completo import borrar_indice_texto, crear_indice_texto, reconstruir_indice_texto
+
+# FTS5 en SQLite, GIN sobre to_tsvector en PostgreSQL
+TABLAS = [sa.table('Eventos'), sa.table('feedback')]
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eadbfa3438ab'
+down_revision: Union[str, Sequence[str], None] = 'a9794d8a4b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conexion = op.get_bind()
+    for tabla in TABLAS:
+        crear_indice_texto(tabla, conexion)
+        reconstruir_indice_texto(tabla, conexion)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conexion = op.get_bind()
+    for tabla in TABLAS:
+        borrar_indice_texto(tabla, conexion)
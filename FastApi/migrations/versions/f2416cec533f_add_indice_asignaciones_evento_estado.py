@@ -0,0 +1,34 @@
+"""Add composite index on Asignaciones evento_id estado
+
+Revision ID: f2416cec533f
+Revises: bea88d1e31cc
+Create Date: 2026-10-18 11:43:31.595776
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2416cec533f'
+down_revision: Union[str, Sequence[str], None] = 'bea88d1e31cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (evento_id, estado) sustituye al índice de evento_id: sirve para las
+    # mismas búsquedas y además cubre el resumen de personal por evento
+    with op.batch_alter_table('Asignaciones', schema=None) as batch_op:
+        batch_op.create_index('ix_Asignaciones_evento_estado', ['evento_id', 'estado'], unique=False)
+        batch_op.drop_index('ix_Asignaciones_evento_id')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('Asignaciones', schema=None) as batch_op:
+        batch_op.create_index('ix_Asignaciones_evento_id', ['evento_id'], unique=False)
+        batch_op.drop_index('ix_Asignaciones_evento_estado')
@@ -0,0 +1,30 @@
+"""
+Reconstruye las tablas de agregados de feedback a partir de la tabla feedback.
+
+Necesario tras aplicar la migración que las crea (backfill) o si alguna vez
+se escribe feedback sin pasar por la API.
+
+Uso:
+    python reconstruir_resumen_feedback.py
+"""
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.db.async_session import AsyncSessionLocal, async_engine
+from app.models.models import ResumenFeedbackVoluntario, ResumenFeedbackEvento
+from app.routers.resumen_feedback import recalcular_resumenes
+
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        await recalcular_resumenes(db, completo=True)
+        await db.commit()
+        voluntarios = await db.scalar(select(func.count()).select_from(ResumenFeedbackVoluntario))
+        eventos = await db.scalar(select(func.count()).select_from(ResumenFeedbackEvento))
+    await async_engine.dispose()
+    print(f"Resumen reconstruido: {voluntarios} voluntarios, {eventos} eventos")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
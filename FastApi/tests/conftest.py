@@ -1,22 +1,48 @@
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
-from app.database.database import Base, get_db
-from main import app
+# Configuración de la base de datos de prueba: un fichero temporal compartido
+# por el engine síncrono (fixtures) y el asíncrono (endpoints)
+_fd, RUTA_DB_PRUEBA = tempfile.mkstemp(suffix=".db")
+os.close(_fd)
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{RUTA_DB_PRUEBA}"
 
-# Configuración de la base de datos de prueba
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Los engines de la aplicación (arranque, GraphQL) también apuntan al fichero
+# temporal: así las pruebas no modifican sqlite.db (p. ej. al activar WAL)
+os.environ["DATABASE_URL"] = SQLALCHEMY_DATABASE_URL
+
+from app.database.database import Base, get_db, activar_claves_foraneas
+from app.db.async_session import get_async_db
+from main import app
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
+activar_claves_foraneas(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# NullPool: TestClient ejecuta cada petición en su propio event loop, así que
+# las conexiones aiosqlite no pueden reutilizarse entre peticiones
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{RUTA_DB_PRUEBA}",
+    poolclass=NullPool,
+)
+activar_claves_foraneas(async_engine.sync_engine)
+TestingAsyncSessionLocal = sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Crear las tablas en la base de datos de prueba
 Base.metadata.create_all(bind=engine)
 
@@ -28,8 +54,21 @@ def override_get_db():
     finally:
         db.close()
 
-# Sobrescribir la dependencia get_db en la aplicación
+async def override_get_async_db():
+    """Sobrescribe la dependencia get_async_db para usar la base de datos de prueba"""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+# Sobrescribir las dependencias de base de datos en la aplicación
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+
+def pytest_sessionfinish(session, exitstatus):
+    """Elimina el fichero de la base de datos de prueba al terminar."""
+    engine.dispose()
+    for ruta in (RUTA_DB_PRUEBA, f"{RUTA_DB_PRUEBA}-wal", f"{RUTA_DB_PRUEBA}-shm"):
+        if os.path.exists(ruta):
+            os.remove(ruta)
 
 # Fixture para el cliente de prueba
 @pytest.fixture(scope="module")
@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from app.agent_flow.archivo_analisis import archivar_analisis
+from app.agent_flow.volunteer_analyzer import VolunteerAnalyzer
+from app.models.agent_models import AnalysisStatus, VolunteerAnalysis, VolunteerAnalysisArchive
+from app.models.models import Voluntarios
+from tests.conftest import TestingSessionLocal, TestingAsyncSessionLocal
+
+BASE_ID = 9960
+INICIO = datetime(2030, 1, 1)
+
+
+@pytest.fixture
+def historial():
+    """Un voluntario con 25 análisis terminados y uno pendiente, el más antiguo de todos."""
+    db = TestingSessionLocal()
+    db.add(Voluntarios(voluntarios_id=BASE_ID, habilidades="", disponibilidad=""))
+    db.add(VolunteerAnalysis(
+        id=BASE_ID * 100, voluntario_id=BASE_ID, estado=AnalysisStatus.PENDING, parametros={},
+        fecha_creacion=INICIO - timedelta(days=1)
+    ))
+    db.add_all([
+        VolunteerAnalysis(
+            id=BASE_ID * 100 + i, voluntario_id=BASE_ID, estado=AnalysisStatus.COMPLETED,
+            parametros={"idioma": "es"}, resultado={"puntuacion": i}, fecha_creacion=INICIO + timedelta(days=i)
+        )
+        for i in range(1, 26)
+    ])
+    db.commit()
+    yield
+    db.query(Voluntarios).filter(Voluntarios.voluntarios_id == BASE_ID).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+def _ids(modelo):
+    db = TestingSessionLocal()
+    ids = [fila.id for fila in db.query(modelo).filter(modelo.voluntario_id == BASE_ID).order_by(modelo.id)]
+    db.close()
+    return ids
+
+
+def _archivar(**kwargs):
+    return asyncio.run(archivar_analisis(fabrica=TestingAsyncSessionLocal, **kwargs))
+
+
+# Pruebas para la retención y el archivo de volunteer_analysis
+class TestArchivoAnalisis:
+    def test_archiva_los_antiguos_por_lotes(self, historial):
+        """Test para dejar los N más recientes y mover los terminados anteriores en lotes"""
+        assert _archivar(retener=20, lote=2, pausa=0) == 5
+
+        # El pendiente se queda aunque sea el más antiguo
+        assert _ids(VolunteerAnalysis) == [BASE_ID * 100] + [BASE_ID * 100 + i for i in range(6, 26)]
+        assert _ids(VolunteerAnalysisArchive) == [BASE_ID * 100 + i for i in range(1, 6)]
+
+        db = TestingSessionLocal()
+        archivado = db.get(VolunteerAnalysisArchive, BASE_ID * 100 + 3)
+        assert archivado.resultado == {"puntuacion": 3}
+        assert archivado.parametros == {"idioma": "es"}
+        assert archivado.estado == AnalysisStatus.COMPLETED
+        assert archivado.fecha_archivado is not None
+        db.close()
+
+    def test_segunda_pasada_no_mueve_nada(self, historial):
+        """Test para que archivar dos veces seguidas no duplique filas"""
+        _archivar(retener=20, pausa=0)
+        assert _archivar(retener=20, pausa=0) == 0
+
+    def test_estado_de_un_analisis_archivado(self, historial):
+        """Test para consultar por ID un análisis que ya está en el archivo"""
+        _archivar(retener=20, pausa=0)
+
+        async def consultar():
+            async with TestingAsyncSessionLocal() as db:
+                return await VolunteerAnalyzer(db).get_analysis_status(BASE_ID * 100 + 1)
+
+        assert asyncio.run(consultar())["resultado"] == {"puntuacion": 1}
+
+    def test_borrar_voluntario_borra_su_archivo(self, historial):
+        """Test para que el archivo siga el ON DELETE CASCADE del voluntario"""
+        _archivar(retener=20, pausa=0)
+        db = TestingSessionLocal()
+        db.query(Voluntarios).filter(Voluntarios.voluntarios_id == BASE_ID).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+        assert _ids(VolunteerAnalysisArchive) == []
+
+    def test_filas_ya_copiadas_por_otro_worker(self, historial):
+        """Test para no chocar con la clave primaria si otro worker ya copió una fila al archivo"""
+        db = TestingSessionLocal()
+        db.add(VolunteerAnalysisArchive(
+            id=BASE_ID * 100 + 2, voluntario_id=BASE_ID, estado=AnalysisStatus.COMPLETED,
+            parametros={"idioma": "es"}, resultado={"puntuacion": 2}, fecha_creacion=INICIO + timedelta(days=2)
+        ))
+        db.commit()
+        db.close()
+
+        assert _archivar(retener=20, lote=2, pausa=0) == 5
+        assert _ids(VolunteerAnalysis) == [BASE_ID * 100] + [BASE_ID * 100 + i for i in range(6, 26)]
+        assert _ids(VolunteerAnalysisArchive) == [BASE_ID * 100 + i for i in range(1, 6)]
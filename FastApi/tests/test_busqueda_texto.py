@@ -0,0 +1,86 @@
+import pytest
+from fastapi import status
+from app.models.models import Eventos, Feedback
+from tests.conftest import TestingSessionLocal
+
+BASE_ID = 9900
+
+
+@pytest.fixture
+def textos():
+    db = TestingSessionLocal()
+    db.add_all([
+        Eventos(eventos_id=BASE_ID + 1, nombre="Reparto", descripcion_eventos="Reparto de alimentos frescos en el almacén"),
+        Eventos(eventos_id=BASE_ID + 2, nombre="Colecta", descripcion_eventos="Colecta de ropa de invierno"),
+        Feedback(feedback_id=BASE_ID + 1, calificacion=5, comentario="Zzorganización impecable, volveré"),
+        Feedback(feedback_id=BASE_ID + 2, calificacion=3,
+                 comentario="Zzorganización mejorable: faltó zzorganización en la zzorganización de turnos"),
+        Feedback(feedback_id=BASE_ID + 3, calificacion=4, comentario="Buen ambiente"),
+    ])
+    db.commit()
+    yield db
+    db.query(Feedback).filter(Feedback.feedback_id.between(BASE_ID, BASE_ID + 99)).delete(synchronize_session=False)
+    db.query(Eventos).filter(Eventos.eventos_id.between(BASE_ID, BASE_ID + 99)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+def _ids(data, clave):
+    return [fila[clave] for fila in data if BASE_ID < fila[clave] < BASE_ID + 100]
+
+
+# Pruebas para la búsqueda de texto completo en eventos y feedback
+class TestBusquedaTexto:
+    def test_busqueda_ordenada_con_fragmento(self, client, textos):
+        """Test para ordenar por relevancia y marcar las palabras en el fragmento"""
+        response = client.get("/api/buscar-feedback", params={"q": "zzorganizacion"})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert _ids(data, "feedback_id") == [BASE_ID + 2, BASE_ID + 1]
+        assert data[0]["relevancia"] > data[1]["relevancia"]
+        assert "<b>zzorganización</b>" in data[0]["fragmento"].lower()
+
+    def test_todas_las_palabras(self, client, textos):
+        """Test para devolver sólo las filas con todas las palabras, sin tener en cuenta acentos"""
+        response = client.get("/api/buscar-eventos", params={"q": "ALMACEN alimentos"})
+        assert response.status_code == status.HTTP_200_OK
+        assert _ids(response.json(), "eventos_id") == [BASE_ID + 1]
+
+        response = client.get("/api/buscar-eventos", params={"q": "alimentos ropa"})
+        assert _ids(response.json(), "eventos_id") == []
+
+    def test_operadores_del_usuario_no_fallan(self, client, textos):
+        """Test para tratar comillas y operadores de FTS5 como texto"""
+        response = client.get("/api/buscar-eventos", params={"q": '"ropa" OR -NEAR('})
+        assert response.status_code == status.HTTP_200_OK
+
+        response = client.get("/api/buscar-eventos", params={"q": '"" --'})
+        assert response.json() == []
+
+    def test_palabras_vacias(self, client, textos):
+        """Test para ignorar las palabras vacías de la búsqueda"""
+        response = client.get("/api/buscar-eventos", params={"q": "el reparto de los alimentos"})
+        assert _ids(response.json(), "eventos_id") == [BASE_ID + 1]
+
+    def test_indice_sigue_a_las_escrituras(self, client, textos):
+        """Test para que los triggers actualicen el índice al editar y borrar"""
+        evento = textos.get(Eventos, BASE_ID + 2)
+        evento.descripcion_eventos = "Colecta de juguetes"
+        textos.commit()
+        assert _ids(client.get("/api/buscar-eventos", params={"q": "ropa"}).json(), "eventos_id") == []
+        assert _ids(client.get("/api/buscar-eventos", params={"q": "juguetes"}).json(), "eventos_id") == [BASE_ID + 2]
+
+        textos.delete(textos.get(Feedback, BASE_ID + 3))
+        textos.commit()
+        assert _ids(client.get("/api/buscar-feedback", params={"q": "ambiente"}).json(), "feedback_id") == []
+
+    def test_fragmento_escapa_el_html(self, client, textos):
+        """Test para escapar el HTML del comentario y marcar sólo las palabras encontradas"""
+        textos.add(Feedback(feedback_id=BASE_ID + 4, calificacion=1,
+                            comentario='Zzinyeccion <img src=x onerror="alert(1)"> <b>falsa</b>'))
+        textos.commit()
+        response = client.get("/api/buscar-feedback", params={"q": "zzinyeccion"})
+        fragmento = response.json()[0]["fragmento"]
+        assert "<img" not in fragmento and "<b>falsa</b>" not in fragmento
+        assert "&lt;img" in fragmento and "&lt;b&gt;falsa&lt;/b&gt;" in fragmento
+        assert fragmento.startswith("<b>Zzinyeccion</b>")
@@ -0,0 +1,76 @@
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from app.models.models import Eventos
+from tests.conftest import TestingSessionLocal, async_engine
+
+BASE_ID = 9600
+
+
+@pytest.fixture
+def eventos_guardados():
+    db = TestingSessionLocal()
+    ids = [BASE_ID + i for i in range(1, 4)]
+    db.add_all([
+        Eventos(eventos_id=i, nombre=f"Evento {i}", fecha="2030-02-01", descripcion_eventos="Texto largo " * 50)
+        for i in ids
+    ])
+    db.commit()
+    yield ids
+    db.query(Eventos).filter(Eventos.eventos_id > BASE_ID).delete()
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def sentencias_sql():
+    """Registra las sentencias SQL que ejecutan los endpoints."""
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", registrar)
+    yield sentencias
+    event.remove(async_engine.sync_engine, "before_cursor_execute", registrar)
+
+
+# Pruebas para la selección de campos (?fields=) en listados y detalle
+class TestCampos:
+    def test_listado_con_campos(self, client, eventos_guardados, sentencias_sql):
+        """Test para devolver sólo los campos pedidos sin leer las columnas no solicitadas"""
+        response = client.get(
+            "/api/eventos",
+            params={"cursor": BASE_ID, "fields": "nombre,fecha"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [e["eventos_id"] for e in data] == eventos_guardados
+        assert all(set(e) == {"eventos_id", "nombre", "fecha"} for e in data)
+
+        consulta = next(s for s in sentencias_sql if 'FROM "Eventos"' in s)
+        assert "descripcion_eventos" not in consulta
+
+    def test_listado_sin_campos_devuelve_todo(self, client, eventos_guardados):
+        """Test para que sin fields se sigan devolviendo todas las columnas"""
+        response = client.get("/api/eventos", params={"cursor": BASE_ID, "limit": 1})
+        assert set(response.json()[0]) == {
+            "eventos_id", "nombre", "fecha", "hora", "starts_at", "ubicacion",
+            "voluntarios_necesarios", "descripcion_eventos"
+        }
+
+    def test_detalle_con_campos(self, client, eventos_guardados):
+        """Test para obtener un evento por ID con selección de campos"""
+        response = client.get(f"/api/eventos/{eventos_guardados[0]}", params={"fields": "nombre"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"eventos_id": eventos_guardados[0], "nombre": f"Evento {eventos_guardados[0]}"}
+
+    def test_detalle_no_encontrado(self, client):
+        """Test para devolver 404 cuando el ID no existe"""
+        response = client.get(f"/api/eventos/{BASE_ID + 99}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_campo_desconocido(self, client):
+        """Test para rechazar campos que no forman parte del modelo de respuesta"""
+        response = client.get("/api/usuarios", params={"fields": "nombre,hashed_password"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,88 @@
+import os
+import tempfile
+from datetime import date
+
+import pytest
+from sqlalchemy import func, inspect, select
+
+import generar_datos
+from app.database.database import Base
+from app.db.datos_sinteticos import Contexto, HABILIDADES, calcular_tamanos, generar_trozo
+from app.models.json_comprimido import descomprimir_json
+from app.models.models import Asignaciones, Eventos, Feedback, Habilidades, ResumenFeedbackVoluntario
+from app.routers.habilidades import separar_habilidades
+
+ESCALA = 2000
+
+
+def _contexto(semilla: int = 7) -> Contexto:
+    return Contexto(
+        semilla=semilla,
+        tamanos=calcular_tamanos(ESCALA),
+        referencia=date(2026, 1, 1),
+        hashed_password="$2b$12$" + "x" * 53,
+    )
+
+
+@pytest.fixture(scope="module")
+def base_cargada():
+    """Una base de datos SQLite nueva cargada con el generador, con dos procesos y trozos pequeños."""
+    fd, ruta = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    url = f"sqlite:///{ruta}"
+    engine = generar_datos.crear_engine_carga(url)
+    Base.metadata.create_all(bind=engine)
+    generar_datos.quitar_indices(engine)
+    insertadas = generar_datos.cargar(engine, url, _contexto(), procesos=2, lote=150)
+    generar_datos.reconstruir_derivados(engine, url)
+    yield engine, insertadas
+    engine.dispose()
+    for sufijo in ("", "-wal", "-shm"):
+        if os.path.exists(ruta + sufijo):
+            os.remove(ruta + sufijo)
+
+
+# Pruebas para el generador de datos sintéticos
+class TestDatosSinteticos:
+    def test_misma_semilla_mismos_datos(self):
+        """Test para generar exactamente las mismas filas con la misma semilla, en cualquier proceso"""
+        for tabla in ("Voluntarios", "feedback", "volunteer_analysis"):
+            assert generar_trozo(tabla, 1, 50, _contexto()) == generar_trozo(tabla, 1, 50, _contexto())
+        assert generar_trozo("feedback", 1, 50, _contexto()) != generar_trozo("feedback", 1, 50, _contexto(8))
+
+    def test_indice_de_habilidades_coherente(self):
+        """Test para que voluntarios_habilidades coincida con el texto de habilidades de cada voluntario"""
+        filas = generar_trozo("Voluntarios", 1, 200, _contexto())
+        catalogo = {i: nombre for i, nombre in enumerate(separar_habilidades(", ".join(HABILIDADES)), start=1)}
+        for voluntario in filas["Voluntarios"]:
+            indexadas = {
+                catalogo[fila["habilidad_id"]] for fila in filas["voluntarios_habilidades"]
+                if fila["voluntario_id"] == voluntario["voluntarios_id"]
+            }
+            assert indexadas == set(separar_habilidades(voluntario["habilidades"]))
+
+    def test_carga_completa(self, base_cargada):
+        """Test para insertar todas las filas con claves foráneas válidas y tablas derivadas reconstruidas"""
+        engine, insertadas = base_cargada
+        tamanos = calcular_tamanos(ESCALA)
+        with engine.connect() as conexion:
+            for tabla, n in tamanos.items():
+                assert insertadas[tabla] == n
+                assert conexion.scalar(select(func.count()).select_from(Base.metadata.tables[tabla])) == n
+            assert conexion.exec_driver_sql("PRAGMA foreign_key_check").fetchall() == []
+            assert conexion.scalar(select(func.sum(Habilidades.total_voluntarios))) == insertadas["voluntarios_habilidades"]
+            assert conexion.scalar(select(func.count()).select_from(ResumenFeedbackVoluntario)) > 0
+            assert conexion.scalar(select(func.count()).where(Eventos.starts_at.is_(None))) == 0
+            # Índice de texto completo reconstruido
+            assert conexion.exec_driver_sql(
+                "SELECT count(*) FROM eventos_fts WHERE eventos_fts MATCH 'camion'"
+            ).scalar() > 0
+            resultado = conexion.exec_driver_sql(
+                "SELECT resultado FROM volunteer_analysis WHERE estado = 'COMPLETED' LIMIT 1"
+            ).scalar()
+            assert "resumen" in descomprimir_json(resultado)
+
+        nombres = {indice["name"] for indice in inspect(engine).get_indexes(Asignaciones.__tablename__)}
+        assert {indice.name for indice in Asignaciones.__table__.indexes} <= nombres
+        nombres = {indice["name"] for indice in inspect(engine).get_indexes(Feedback.__tablename__)}
+        assert {indice.name for indice in Feedback.__table__.indexes} <= nombres
@@ -0,0 +1,35 @@
+from app.core.config import settings
+from app.database.engines import obtener_engine, obtener_engine_asincrono, _opciones_engine
+from app.database.database import engine
+from app.db import async_engine
+
+
+# Pruebas para el registro de engines y la configuración de los pools
+class TestEngines:
+    def test_registro_devuelve_un_engine_por_url(self):
+        """Test para devolver el mismo engine síncrono y asíncrono para la URL configurada"""
+        assert obtener_engine() is engine
+        assert obtener_engine_asincrono() is async_engine
+
+    def test_sqlite_en_fichero_usa_pool_configurado(self):
+        """Test para usar un pool con el tamaño configurado en SQLite en fichero"""
+        assert type(engine.pool).__name__ == "QueuePool"
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+        assert type(async_engine.sync_engine.pool).__name__ == "AsyncAdaptedQueuePool"
+
+    def test_timeout_de_sentencias_en_postgresql(self):
+        """Test para pasar el timeout de sentencias a los drivers de PostgreSQL"""
+        opciones = _opciones_engine("postgresql://u:p@localhost/db", asincrono=False)
+        assert opciones["connect_args"]["options"] == f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        opciones = _opciones_engine("postgresql+asyncpg://u:p@localhost/db", asincrono=True)
+        assert opciones["connect_args"]["server_settings"] == {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        assert opciones["pool_recycle"] == settings.DB_POOL_RECYCLE
+
+    def test_estadisticas_pool(self, client):
+        """Test para consultar el estado de los pools en /health/db"""
+        response = client.get("/health/db")
+        assert response.status_code == 200
+        pools = response.json()["pools"]
+        tipos = {p["tipo"] for p in pools}
+        assert tipos == {"sincrono", "asincrono"}
+        assert all("checkedout" in p for p in pools)
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import tempfile
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.database.database import Base
+from app.database.engines import aplicar_perfil_sqlite
+from app.db.enrutamiento import crear_fabrica_sesiones
+from app.db.escritura import SesionSerializada
+from app.models.models import Eventos
+
+ESCRITORES = 30
+
+
+# Pruebas para el perfil SQLite y la cola de escrituras
+class TestEscritura:
+    def test_perfil_sqlite_activa_wal(self):
+        """Test para activar WAL y synchronous=NORMAL en los engines SQLite en fichero"""
+        fd, ruta = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        engine = create_engine(f"sqlite:///{ruta}")
+        aplicar_perfil_sqlite(engine)
+        try:
+            with engine.connect() as conexion:
+                assert conexion.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+                assert conexion.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        finally:
+            engine.dispose()
+            for sufijo in ("", "-wal", "-shm"):
+                if os.path.exists(ruta + sufijo):
+                    os.remove(ruta + sufijo)
+
+    def test_escrituras_concurrentes_no_bloquean_la_base(self):
+        """Test para que muchos escritores a la vez no den "database is locked" con la cola de escritura"""
+        # SQLite no espera nada por el bloqueo (busy_timeout=0): sin la cola fallaría
+        fd, ruta = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        engine = create_engine(f"sqlite:///{ruta}")
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+
+        async def escribir_en_paralelo():
+            async_engine = create_async_engine(f"sqlite+aiosqlite:///{ruta}", poolclass=NullPool)
+
+            @event.listens_for(async_engine.sync_engine, "connect")
+            def _sin_espera(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA busy_timeout=0")
+                cursor.close()
+
+            fabrica = crear_fabrica_sesiones(async_engine, serializar_escrituras=True)
+
+            async def escritor(i):
+                async with fabrica() as db:
+                    await db.execute(select(func.count(Eventos.eventos_id)))
+                    db.add(Eventos(eventos_id=i, nombre=f"Evento {i}"))
+                    await db.flush()
+                    # Trabajo del handler con la transacción de escritura abierta
+                    await asyncio.sleep(0.001)
+                    await db.commit()
+
+            try:
+                await asyncio.gather(*(escritor(i) for i in range(1, ESCRITORES + 1)))
+                async with fabrica() as db:
+                    assert isinstance(db, SesionSerializada)
+                    return (await db.execute(select(func.count(Eventos.eventos_id)))).scalar()
+            finally:
+                await async_engine.dispose()
+
+        try:
+            assert asyncio.run(escribir_en_paralelo()) == ESCRITORES
+        finally:
+            for sufijo in ("", "-wal", "-shm"):
+                if os.path.exists(ruta + sufijo):
+                    os.remove(ruta + sufijo)
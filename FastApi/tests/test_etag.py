@@ -0,0 +1,91 @@
+from fastapi import status
+
+
+# Pruebas para las respuestas condicionales (ETag / If-None-Match) de los listados
+class TestETag:
+    def test_listado_devuelve_etag(self, client):
+        """Test para comprobar que los listados incluyen la cabecera ETag"""
+        response = client.get("/api/eventos")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"]
+
+    def test_304_si_no_hay_cambios(self, client):
+        """Test para responder 304 sin cuerpo cuando el cliente ya tiene la versión actual"""
+        etag = client.get("/api/voluntarios").headers["ETag"]
+
+        response = client.get("/api/voluntarios", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    def test_etag_depende_de_los_parametros(self, client):
+        """Test para que dos consultas distintas sobre la misma tabla no compartan ETag"""
+        etag = client.get("/api/eventos", params={"limit": 5}).headers["ETag"]
+
+        response = client.get("/api/eventos", params={"limit": 10}, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    def test_escritura_invalida_el_etag(self, client):
+        """Test para que crear, actualizar o borrar un evento cambie el ETag del listado"""
+        etag = client.get("/api/eventos").headers["ETag"]
+
+        evento = {
+            "eventos_id": 9701,
+            "nombre": "Evento ETag",
+            "fecha": "2030-05-01",
+            "hora": "10:00",
+            "ubicacion": "Almacén",
+            "voluntarios_necesarios": 3
+        }
+        assert client.post("/api/add-evento/", json=evento).status_code == status.HTTP_200_OK
+
+        response = client.get("/api/eventos", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert 9701 in [e["eventos_id"] for e in response.json()]
+
+        etag = response.headers["ETag"]
+        assert client.delete("/api/delete-evento/9701").json() is True
+        response = client.get("/api/eventos", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_actualizar_voluntario_invalida_el_etag(self, client):
+        """Test para que actualizar un voluntario cambie el ETag del listado y conserve su usuario"""
+        usuario = {"usuarios_id": 9703, "nombre": "Ana", "apellido": "ETag", "correo": "ana.etag@example.com"}
+        assert client.post("/api/add-usuarios/", json=usuario).status_code == status.HTTP_201_CREATED
+        voluntario = {"voluntarios_id": 9703, "habilidades": "Cocina", "disponibilidad": "Mañanas", "usuario_id": 9703}
+        assert client.post("/api/add-voluntarios/", json=voluntario).status_code == status.HTTP_200_OK
+        etag = client.get("/api/voluntarios").headers["ETag"]
+
+        cambios = {"voluntarios_id": 9703, "habilidades": None, "disponibilidad": "Tardes", "usuario_id": None}
+        assert client.put("/api/update-voluntario/", json=cambios).status_code == status.HTTP_200_OK
+        response = client.get("/api/voluntarios", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        actualizado = next(v for v in response.json() if v["voluntarios_id"] == 9703)
+        # Los campos a None no se tocan: usuario_id y habilidades se conservan
+        assert {"disponibilidad": "Tardes", "habilidades": "Cocina", "usuario_id": 9703}.items() <= actualizado.items()
+
+        assert client.delete("/api/delete-voluntario/9703").json() is True
+        assert client.delete("/api/delete-usuarios/9703").json() is True
+        response = client.put("/api/update-voluntario/", json=cambios)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_insercion_en_lote_invalida_el_etag(self, client):
+        """Test para que la creación en lote también incremente la versión de la tabla"""
+        etag = client.get("/api/eventos").headers["ETag"]
+
+        lote = [{
+            "eventos_id": 9702,
+            "nombre": "Evento ETag lote",
+            "fecha": "2030-05-02",
+            "hora": "10:00",
+            "ubicacion": "Almacén",
+            "voluntarios_necesarios": 3
+        }]
+        assert client.post("/api/bulk/add-eventos/", json=lote).json()["creados"] == 1
+
+        response = client.get("/api/eventos", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        client.delete("/api/delete-evento/9702")
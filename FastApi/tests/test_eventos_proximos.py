@@ -0,0 +1,140 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from app.agent_flow.volunteer_analyzer import VolunteerAnalyzer
+from app.core.config import settings
+from app.models.fechas import calcular_inicio, inicio_de_hoy
+from app.models.models import Eventos
+from tests.conftest import TestingSessionLocal, TestingAsyncSessionLocal
+
+BASE_ID = 9800
+
+
+def _dia(dias: int) -> str:
+    return (datetime.utcnow() + timedelta(days=dias)).date().isoformat()
+
+
+@pytest.fixture
+def eventos_futuros():
+    db = TestingSessionLocal()
+    db.add_all([
+        Eventos(eventos_id=BASE_ID + 1, nombre="Esta semana", fecha=_dia(3), hora="10:00"),
+        Eventos(eventos_id=BASE_ID + 2, nombre="En dos meses", fecha=_dia(60), hora="10:00"),
+        Eventos(eventos_id=BASE_ID + 3, nombre="Pasado", fecha=_dia(-3), hora="10:00"),
+        Eventos(eventos_id=BASE_ID + 4, nombre="Sin fecha legible", fecha="pronto"),
+    ])
+    db.commit()
+    yield
+    db.query(Eventos).filter(Eventos.eventos_id > BASE_ID, Eventos.eventos_id < BASE_ID + 100).delete()
+    db.commit()
+    db.close()
+
+
+def _ids(data):
+    return sorted(e["eventos_id"] for e in data if BASE_ID < e["eventos_id"] < BASE_ID + 100)
+
+
+# Pruebas para la fecha de inicio tipada de los eventos
+class TestEventosProximos:
+    def test_calcular_inicio(self, monkeypatch):
+        """Test para interpretar los formatos de fecha y hora habituales"""
+        assert calcular_inicio("2030-05-01", "10:30") == datetime(2030, 5, 1, 10, 30)
+        assert calcular_inicio("01/05/2030", "6:00 pm") == datetime(2030, 5, 1, 18, 0)
+        assert calcular_inicio("2030-05-01") == datetime(2030, 5, 1)
+        assert calcular_inicio("mañana", "10:00") is None
+
+        monkeypatch.setattr(settings, "EVENTOS_ZONA_HORARIA", "America/Mexico_City")
+        assert calcular_inicio("2030-05-01", "10:00") == datetime(2030, 5, 1, 16, 0)
+
+    def test_inicio_de_hoy_en_la_zona_de_los_eventos(self, monkeypatch):
+        """Test para tomar el día de hoy en EVENTOS_ZONA_HORARIA y no en la zona del servidor"""
+        for zona in ("Pacific/Kiritimati", "Pacific/Pago_Pago", "UTC"):
+            monkeypatch.setattr(settings, "EVENTOS_ZONA_HORARIA", zona)
+            ahora = datetime.utcnow()
+            assert ahora - timedelta(days=1) < inicio_de_hoy() <= ahora
+
+    def test_starts_at_al_insertar_y_actualizar(self, eventos_futuros):
+        """Test para calcular starts_at al insertar y recalcularlo al cambiar la fecha"""
+        db = TestingSessionLocal()
+        evento = db.get(Eventos, BASE_ID + 1)
+        assert evento.starts_at == calcular_inicio(_dia(3), "10:00")
+        assert db.get(Eventos, BASE_ID + 4).starts_at is None
+
+        evento.hora = "18:00"
+        db.commit()
+        assert db.get(Eventos, BASE_ID + 1).starts_at == calcular_inicio(_dia(3), "18:00")
+        db.close()
+
+    def test_starts_at_en_lote(self, client):
+        """Test para calcular starts_at en las inserciones en lote"""
+        response = client.post("/api/bulk/add-eventos/", json=[
+            {"eventos_id": BASE_ID + 50, "nombre": "Lote", "fecha": "2030-06-01", "hora": "09:00",
+             "ubicacion": "Almacén", "voluntarios_necesarios": 2}
+        ])
+        assert response.status_code == status.HTTP_200_OK
+
+        db = TestingSessionLocal()
+        assert db.get(Eventos, BASE_ID + 50).starts_at == datetime(2030, 6, 1, 9, 0)
+        db.query(Eventos).filter(Eventos.eventos_id == BASE_ID + 50).delete()
+        db.commit()
+        db.close()
+
+    def test_listado_proximos_dias(self, client, eventos_futuros):
+        """Test para listar sólo los eventos que empiezan en los próximos N días"""
+        response = client.get("/api/eventos", params={"proximos_dias": 7, "limit": 500})
+        assert response.status_code == status.HTTP_200_OK
+        assert _ids(response.json()) == [BASE_ID + 1]
+
+        response = client.get("/api/eventos", params={"proximos_dias": 90, "limit": 500})
+        assert _ids(response.json()) == [BASE_ID + 1, BASE_ID + 2]
+        assert response.json()[0]["starts_at"]
+
+    def test_eventos_futuros_del_analizador(self, eventos_futuros, monkeypatch):
+        """Test para que el analizador lea los eventos futuros de la base de datos"""
+        monkeypatch.setattr(settings, "AGENT_DIAS_EVENTOS_FUTUROS", 30)
+
+        async def leer():
+            async with TestingAsyncSessionLocal() as db:
+                return await VolunteerAnalyzer(db)._get_future_events()
+
+        eventos = [e for e in asyncio.run(leer()) if BASE_ID < e["id"] < BASE_ID + 100]
+        assert [e["nombre"] for e in eventos] == ["Esta semana"]
+
+    def test_eventos_futuros_limitados(self, eventos_futuros, monkeypatch):
+        """Test para leer como mucho AGENT_MAX_EVENTOS_FUTUROS eventos, los más próximos"""
+        monkeypatch.setattr(settings, "AGENT_DIAS_EVENTOS_FUTUROS", 90)
+
+        async def leer():
+            async with TestingAsyncSessionLocal() as db:
+                return await VolunteerAnalyzer(db)._get_future_events()
+
+        monkeypatch.setattr(settings, "AGENT_MAX_EVENTOS_FUTUROS", 10_000)
+        todos = asyncio.run(leer())
+        monkeypatch.setattr(settings, "AGENT_MAX_EVENTOS_FUTUROS", 1)
+        assert asyncio.run(leer()) == todos[:1]
+
+    def test_una_geocodificacion_por_ubicacion(self, monkeypatch):
+        """Test para geocodificar una sola vez los eventos que comparten ubicación"""
+        analizador = VolunteerAnalyzer(None)
+        direcciones = []
+
+        async def geocodificar(direccion):
+            direcciones.append(direccion)
+            return (40.0, -3.0)
+
+        async def eventos():
+            return [{"nombre": f"Evento {i}", "ubicacion": "Almacén" if i % 2 else "Sede"} for i in range(6)]
+
+        async def distancias(origenes, destinos):
+            return [[1.0] * len(destinos)]
+
+        monkeypatch.setattr(analizador, "_get_geocode", geocodificar)
+        monkeypatch.setattr(analizador, "_get_future_events", eventos)
+        monkeypatch.setattr(analizador, "_calculate_distance_matrix", distancias)
+        resultado = asyncio.run(analizador._generate_analysis(
+            {"id": 1, "direccion": "Calle Mayor 1"}, {"total_eventos": 0, "eventos": [{}]}
+        ))
+        assert sorted(direcciones) == ["Almacén", "Calle Mayor 1", "Sede"]
+        assert len(resultado.compatibilidad_eventos_futuros) == 6
@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi import status
+from app.models.models import Eventos
+from app.routers import exportacion
+from tests.conftest import TestingSessionLocal
+
+BASE_ID = 9100
+
+
+@pytest.fixture
+def eventos_exportables(monkeypatch):
+    # Lotes pequeños para forzar varios fragmentos en la respuesta
+    monkeypatch.setattr(exportacion, "TAMANO_LOTE", 2)
+    db = TestingSessionLocal()
+    ids = [BASE_ID + i for i in range(1, 6)]
+    db.add_all([Eventos(eventos_id=i, nombre=f"Evento {i}", descripcion_eventos="Línea, con coma") for i in ids])
+    db.commit()
+    yield ids
+    db.query(Eventos).filter(Eventos.eventos_id.in_(ids)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+# Pruebas para los endpoints de exportación en streaming
+class TestExportacion:
+    def test_exportar_eventos_ndjson(self, client, eventos_exportables):
+        """Test para exportar eventos en NDJSON, una fila por línea"""
+        response = client.get("/api/export/eventos")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        filas = [json.loads(linea) for linea in response.text.splitlines()]
+        exportados = [f["eventos_id"] for f in filas if f["eventos_id"] in eventos_exportables]
+        assert exportados == eventos_exportables
+
+    def test_exportar_eventos_csv(self, client, eventos_exportables):
+        """Test para exportar eventos en CSV con cabecera"""
+        response = client.get("/api/export/eventos", params={"formato": "csv"})
+        assert response.status_code == status.HTTP_200_OK
+        filas = list(csv.DictReader(io.StringIO(response.text)))
+        exportados = [f for f in filas if int(f["eventos_id"]) in eventos_exportables]
+        assert len(exportados) == len(eventos_exportables)
+        assert exportados[0]["descripcion_eventos"] == "Línea, con coma"
+
+    def test_exportar_recurso_desconocido(self, client):
+        """Test para validar que sólo se exporten los recursos permitidos"""
+        response = client.get("/api/export/usuarios")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
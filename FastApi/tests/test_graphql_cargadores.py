@@ -0,0 +1,91 @@
+import json
+import logging
+
+import pytest
+from fastapi import status
+
+from app.models.models import Eventos, Feedback, Usuarios, Voluntarios
+from tests.conftest import TestingSessionLocal
+
+BASE_ID = 9990
+CONSULTA = """
+query Feedback($after: Int, $limit: Int!) {
+  getFeedback(after: $after, limit: $limit) {
+    feedbackId
+    evento { nombre }
+    usuario { correo }
+    voluntario { voluntariosId usuario { correo voluntarios { voluntariosId } } }
+  }
+}
+"""
+
+
+@pytest.fixture
+def feedback_anidado():
+    """Tres usuarios con su voluntario, dos eventos y ocho feedback repartidos entre ellos."""
+    db = TestingSessionLocal()
+    for i in range(3):
+        db.add(Usuarios(
+            usuarios_id=BASE_ID + i, nombre=f"Nombre {i}", apellido="Apellido", correo=f"cargador{i}@example.com",
+            tipo="voluntario", hashed_password="x"
+        ))
+        db.add(Voluntarios(voluntarios_id=BASE_ID + i, habilidades="", disponibilidad="", usuario_id=BASE_ID + i))
+    db.add_all([Eventos(eventos_id=BASE_ID + i, nombre=f"Evento {i}") for i in range(2)])
+    db.flush()
+    db.add_all([
+        Feedback(feedback_id=BASE_ID + i, voluntario_id=BASE_ID + i % 3, evento_id=BASE_ID + i % 2, calificacion=5)
+        for i in range(8)
+    ])
+    db.commit()
+    yield
+    for modelo, clave in ((Feedback, Feedback.feedback_id), (Voluntarios, Voluntarios.voluntarios_id),
+                          (Usuarios, Usuarios.usuarios_id), (Eventos, Eventos.eventos_id)):
+        db.query(modelo).filter(clave.between(BASE_ID, BASE_ID + 9)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+def _consultar(client, caplog, limite: int):
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        response = client.post("/graphql", json={
+            "query": CONSULTA, "operationName": "Feedback", "variables": {"after": BASE_ID - 1, "limit": limite}
+        })
+    assert response.status_code == status.HTTP_200_OK
+    assert "errors" not in response.json(), response.json()
+    resumen = next(
+        json.loads(r.getMessage()) for r in reversed(caplog.records) if r.name == "app.sql" and r.levelno == logging.INFO
+    )
+    return response.json()["data"]["getFeedback"], resumen["consultas"]
+
+
+# Pruebas para los DataLoaders de las relaciones de GraphQL
+class TestCargadoresGraphQL:
+    def test_relaciones_anidadas(self, client, caplog, feedback_anidado):
+        """Test para resolver voluntario, evento y usuario del feedback y las relaciones de vuelta"""
+        filas, _ = _consultar(client, caplog, 8)
+        assert [f["feedbackId"] for f in filas] == [BASE_ID + i for i in range(8)]
+        for i, fila in enumerate(filas):
+            assert fila["evento"] == {"nombre": f"Evento {i % 2}"}
+            assert fila["usuario"] == {"correo": f"cargador{i % 3}@example.com"}
+            assert fila["voluntario"] == {
+                "voluntariosId": BASE_ID + i % 3,
+                "usuario": {"correo": f"cargador{i % 3}@example.com", "voluntarios": {"voluntariosId": BASE_ID + i % 3}},
+            }
+
+    def test_consultas_constantes(self, client, caplog, feedback_anidado):
+        """Test para hacer el mismo número de consultas con el doble de filas (sin N+1)"""
+        _, pocas = _consultar(client, caplog, 4)
+        _, todas = _consultar(client, caplog, 8)
+        assert todas == pocas
+        # Feedback + una consulta IN por relación: voluntarios, eventos, usuarios y voluntarios por usuario
+        assert todas == 5
+
+    def test_voluntarios_con_usuario(self, client, feedback_anidado):
+        """Test para resolver el usuario de cada voluntario del listado"""
+        response = client.post("/graphql", json={
+            "query": "query($after: Int) { getVoluntarios(after: $after, limit: 3) { voluntariosId usuario { nombre } } }",
+            "variables": {"after": BASE_ID - 1}
+        })
+        voluntarios = response.json()["data"]["getVoluntarios"]
+        assert [v["usuario"] for v in voluntarios] == [{"nombre": f"Nombre {i}"} for i in range(3)]
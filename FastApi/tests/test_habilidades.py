@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+
+from app.models.models import Habilidades, Voluntarios, VoluntariosHabilidades
+from app.routers.habilidades import _ids_habilidades, consulta_voluntarios_con_habilidades, separar_habilidades
+from tests.conftest import TestingSessionLocal, TestingAsyncSessionLocal, engine
+
+BASE_ID = 9850
+
+
+def _voluntario(voluntario_id: int, habilidades: str) -> dict:
+    return {"voluntarios_id": voluntario_id, "habilidades": habilidades, "disponibilidad": "Mañanas", "usuario_id": None}
+
+
+def _habilidades_de(voluntario_id: int):
+    db = TestingSessionLocal()
+    nombres = db.execute(
+        select(Habilidades.nombre)
+        .join(VoluntariosHabilidades, VoluntariosHabilidades.habilidad_id == Habilidades.habilidades_id)
+        .where(VoluntariosHabilidades.voluntario_id == voluntario_id)
+    ).scalars().all()
+    db.close()
+    return sorted(nombres)
+
+
+def _total(nombre: str):
+    db = TestingSessionLocal()
+    total = db.execute(select(Habilidades.total_voluntarios).where(Habilidades.nombre == nombre)).scalar()
+    db.close()
+    return total
+
+
+def _ids(data):
+    return [v["voluntarios_id"] for v in data]
+
+
+@pytest.fixture
+def limpiar(client):
+    yield
+    db = TestingSessionLocal()
+    ids = [v for (v,) in db.execute(select(Voluntarios.voluntarios_id).where(Voluntarios.voluntarios_id.between(BASE_ID, BASE_ID + 49)))]
+    db.close()
+    for voluntario_id in ids:
+        client.delete(f"/api/delete-voluntario/{voluntario_id}")
+
+
+# Pruebas para el índice invertido de habilidades de los voluntarios
+class TestHabilidades:
+    def test_separar_habilidades(self):
+        """Test para normalizar y quitar repetidas del texto de habilidades"""
+        assert separar_habilidades(" Primeros  Auxilios, cocina;COCINA\nConducción ,") == [
+            "primeros auxilios", "cocina", "conducción"
+        ]
+        assert separar_habilidades(None) == []
+
+    def test_alta_actualizacion_y_borrado(self, client, limpiar):
+        """Test para mantener el índice y los totales al crear, editar y borrar voluntarios"""
+        client.post("/api/add-voluntarios/", json=_voluntario(BASE_ID, "Zz-Cocina, Zz-Conducción"))
+        client.post("/api/add-voluntarios/", json=_voluntario(BASE_ID + 1, "zz-cocina"))
+        assert _habilidades_de(BASE_ID) == ["zz-cocina", "zz-conducción"]
+        assert _total("zz-cocina") == 2
+
+        response = client.put("/api/update-voluntario/", json=_voluntario(BASE_ID, "zz-conducción, zz-idiomas"))
+        assert response.status_code == status.HTTP_200_OK
+        assert _habilidades_de(BASE_ID) == ["zz-conducción", "zz-idiomas"]
+        assert (_total("zz-cocina"), _total("zz-idiomas")) == (1, 1)
+
+        client.delete(f"/api/delete-voluntario/{BASE_ID + 1}")
+        assert _habilidades_de(BASE_ID + 1) == []
+        assert _total("zz-cocina") == 0
+
+    def test_lote(self, client, limpiar):
+        """Test para indexar las habilidades en las altas y bajas en lote"""
+        response = client.post("/api/bulk/add-voluntarios/", json=[
+            _voluntario(BASE_ID + 10 + i, "zz-lote, zz-radio" if i % 2 else "zz-lote") for i in range(4)
+        ])
+        assert response.status_code == status.HTTP_200_OK
+        assert (_total("zz-lote"), _total("zz-radio")) == (4, 2)
+
+        response = client.post("/api/bulk/delete-voluntarios/", json=[BASE_ID + 10, BASE_ID + 11])
+        assert response.status_code == status.HTTP_200_OK
+        assert (_total("zz-lote"), _total("zz-radio")) == (2, 1)
+
+    def test_busqueda_por_varias_habilidades(self, client, limpiar):
+        """Test para devolver sólo los voluntarios con todas las habilidades, paginados"""
+        for i, habilidades in enumerate(["zz-a, zz-b", "zz-a", "zz-a, zz-b, zz-c", "zz-b", "ZZ-B, zz-a"]):
+            client.post("/api/add-voluntarios/", json=_voluntario(BASE_ID + 20 + i, habilidades))
+
+        response = client.get("/api/buscar-voluntarios", params={"habilidades": "zz-a, ZZ-B"})
+        assert response.status_code == status.HTTP_200_OK
+        assert _ids(response.json()) == [BASE_ID + 20, BASE_ID + 22, BASE_ID + 24]
+
+        response = client.get("/api/buscar-voluntarios", params={"habilidades": "zz-a,zz-b", "limit": 2})
+        assert _ids(response.json()) == [BASE_ID + 20, BASE_ID + 22]
+        siguiente = client.get(
+            "/api/buscar-voluntarios", params={"habilidades": "zz-a,zz-b", "limit": 2, "cursor": BASE_ID + 22}
+        )
+        assert _ids(siguiente.json()) == [BASE_ID + 24]
+
+        response = client.get("/api/buscar-voluntarios", params={"habilidades": "zz-a,zz-inexistente"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+
+    def test_busqueda_no_recorre_voluntarios(self, client, limpiar):
+        """Test para que la intersección empiece por la lista más corta y no lea toda la tabla"""
+        client.post("/api/add-voluntarios/", json=_voluntario(BASE_ID + 30, "zz-comun, zz-rara"))
+        client.post("/api/add-voluntarios/", json=_voluntario(BASE_ID + 31, "zz-comun"))
+
+        async def construir():
+            async with TestingAsyncSessionLocal() as db:
+                return await consulta_voluntarios_con_habilidades(db, ["zz-comun", "zz-rara"])
+
+        consulta = asyncio.run(construir())
+        sql = consulta.compile(engine, compile_kwargs={"literal_binds": True})
+        with engine.connect() as conexion:
+            pasos = [fila[3] for fila in conexion.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+        assert not any(paso.startswith("SCAN") for paso in pasos), pasos
+        assert "SEARCH Voluntarios USING INTEGER PRIMARY KEY" in " ".join(pasos), pasos
+
+    def test_alta_concurrente_de_la_misma_habilidad(self):
+        """Test para no fallar si otra petición da de alta la habilidad entre el SELECT y el INSERT"""
+        async def dar_de_alta():
+            async with TestingAsyncSessionLocal() as db:
+                ejecutar = db.execute
+
+                async def execute_con_carrera(*args, **kwargs):
+                    resultado = await ejecutar(*args, **kwargs)
+                    if db.execute is execute_con_carrera:
+                        # Tras el primer SELECT otra petición crea la misma habilidad
+                        db.execute = ejecutar
+                        otra = TestingSessionLocal()
+                        otra.add(Habilidades(nombre="zz-carrera", total_voluntarios=0))
+                        otra.commit()
+                        otra.close()
+                    return resultado
+
+                db.execute = execute_con_carrera
+                ids = await _ids_habilidades(db, ["zz-carrera", "zz-sin-carrera"], crear=True)
+                await db.commit()
+                return ids
+
+        try:
+            ids = asyncio.run(dar_de_alta())
+            db = TestingSessionLocal()
+            filas = dict(db.execute(
+                select(Habilidades.nombre, Habilidades.habilidades_id)
+                .where(Habilidades.nombre.in_(["zz-carrera", "zz-sin-carrera"]))
+            ).all())
+            db.close()
+            assert ids == filas
+        finally:
+            db = TestingSessionLocal()
+            db.query(Habilidades).filter(Habilidades.nombre.in_(["zz-carrera", "zz-sin-carrera"])).delete(
+                synchronize_session=False
+            )
+            db.commit()
+            db.close()
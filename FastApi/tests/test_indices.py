@@ -0,0 +1,82 @@
+import re
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.agent_models import VolunteerAnalysis, VolunteerAnalysisArchive
+from app.models.models import Usuarios, Voluntarios, Eventos, Asignaciones, Feedback, ResumenFeedbackVoluntario
+from tests.conftest import engine
+
+# "SCAN tabla" sin "USING ... INDEX" es un recorrido completo de la tabla
+ESCANEO_COMPLETO = re.compile(r"^SCAN (\S+)(?!.*USING)")
+
+
+def plan(consulta):
+    sql = consulta.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conexion:
+        return [fila[3] for fila in conexion.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def escaneos_completos(pasos):
+    return [paso for paso in pasos if ESCANEO_COMPLETO.match(paso)]
+
+
+CONSULTAS = {
+    # Listado de análisis de un voluntario (get_volunteer_analyses)
+    "analisis_por_voluntario": select(VolunteerAnalysis)
+        .where(VolunteerAnalysis.voluntario_id == 1)
+        .order_by(VolunteerAnalysis.fecha_creacion.desc())
+        .limit(10),
+    "analisis_archivados_por_voluntario": select(VolunteerAnalysisArchive)
+        .where(VolunteerAnalysisArchive.voluntario_id == 1)
+        .order_by(VolunteerAnalysisArchive.fecha_creacion.desc())
+        .limit(10),
+    # Selección de análisis a archivar (app.agent_flow.archivo_analisis)
+    "analisis_por_voluntario_con_exceso": select(VolunteerAnalysis.voluntario_id)
+        .group_by(VolunteerAnalysis.voluntario_id)
+        .having(func.count() > 20),
+    # Filtros de los listados y búsquedas de hijas en los ON DELETE
+    "asignaciones_por_evento": select(Asignaciones).where(Asignaciones.evento_id == 1),
+    "asignaciones_por_voluntario": select(Asignaciones).where(Asignaciones.voluntario_id == 1),
+    "asignaciones_por_estado": select(Asignaciones).where(Asignaciones.estado == "Pendiente"),
+    "feedback_por_voluntario": select(Feedback).where(Feedback.voluntario_id == 1),
+    "feedback_por_evento": select(Feedback).where(Feedback.evento_id == 1),
+    "voluntarios_por_usuario": select(Voluntarios).where(Voluntarios.usuario_id == 1),
+    "usuario_por_correo": select(Usuarios).where(Usuarios.correo == "juan@example.com"),
+    # Paginación keyset
+    "pagina_de_eventos": select(Eventos).where(Eventos.eventos_id > 100).order_by(Eventos.eventos_id).limit(50),
+    "eventos_por_fecha": select(Eventos).where(Eventos.fecha >= "2030-01-01"),
+    # Eventos de los próximos días (listado y VolunteerAnalyzer._get_future_events)
+    "eventos_proximos_dias": select(Eventos)
+        .where(Eventos.starts_at >= "2030-01-01", Eventos.starts_at < "2030-01-08")
+        .order_by(Eventos.starts_at),
+    # Recalculo de agregados de feedback y ranking
+    "recalculo_resumen_feedback": select(Feedback.voluntario_id, func.count(Feedback.calificacion))
+        .where(Feedback.voluntario_id.in_([1, 2, 3]), Feedback.calificacion.isnot(None))
+        .group_by(Feedback.voluntario_id),
+    "ranking_voluntarios": select(ResumenFeedbackVoluntario)
+        .order_by(ResumenFeedbackVoluntario.promedio.desc())
+        .limit(10),
+}
+
+
+# Pruebas para los planes de consulta de las consultas frecuentes
+class TestIndices:
+    @pytest.mark.parametrize("nombre", list(CONSULTAS))
+    def test_consulta_usa_indice(self, nombre):
+        """Test para que ninguna consulta frecuente recorra una tabla entera"""
+        pasos = plan(CONSULTAS[nombre])
+        assert not escaneos_completos(pasos), pasos
+
+    def test_resumen_personal_no_lee_asignaciones(self):
+        """Test para que el resumen por evento cuente asignaciones sólo con el índice (evento, estado)"""
+        consulta = (
+            select(Eventos.eventos_id, Asignaciones.estado, func.count(Asignaciones.asignaciones_id))
+            .outerjoin(Asignaciones, Asignaciones.evento_id == Eventos.eventos_id)
+            .group_by(Eventos.eventos_id, Asignaciones.estado)
+            .order_by(Eventos.eventos_id)
+        )
+        pasos = plan(consulta)
+        assert any("Asignaciones USING COVERING INDEX ix_Asignaciones_evento_estado" in paso for paso in pasos), pasos
+        # Sin filtro se listan todos los eventos: sólo Eventos puede recorrerse entera
+        assert escaneos_completos(pasos) == ["SCAN Eventos"], pasos
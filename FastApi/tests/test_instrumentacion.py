@@ -0,0 +1,80 @@
+import json
+import logging
+
+import pytest
+from fastapi import status
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.instrumentacion import RegistroConsultas, forma_sentencia, registro_activo
+from app.models.models import Eventos
+from tests.conftest import engine
+
+
+def _resumenes(caplog):
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.sql" and r.levelno == logging.INFO]
+
+
+# Pruebas para la instrumentación de consultas por petición
+class TestInstrumentacion:
+    def test_forma_sentencia(self):
+        """Test para agrupar sentencias que sólo difieren en valores o en el tamaño de una lista IN"""
+        assert forma_sentencia("SELECT * FROM t WHERE id IN (?, ?, ?) AND x = 'a'") == \
+            forma_sentencia("SELECT *\n  FROM t WHERE id IN (?) AND x = 'otro'")
+        assert forma_sentencia("SELECT * FROM t WHERE id = 5 LIMIT 10") == "SELECT * FROM t WHERE id = ? LIMIT ?"
+
+    def test_detecta_n_mas_1_y_consultas_lentas(self, monkeypatch):
+        """Test para marcar sentencias repetidas y consultas por encima del umbral"""
+        monkeypatch.setattr(settings, "DB_N_MAS_1_UMBRAL", 5)
+        monkeypatch.setattr(settings, "DB_CONSULTA_LENTA_MS", 0)
+        registro = RegistroConsultas(nombre="prueba")
+        with registro_activo(registro), engine.connect() as conexion:
+            for evento_id in range(6):
+                conexion.execute(select(Eventos).where(Eventos.eventos_id == evento_id))
+            conexion.execute(select(Eventos).limit(1))
+
+        assert registro.consultas == 7
+        assert list(registro.repetidas().values()) == [6]
+        assert len(registro.lentas) == 7 and registro.tiempo_ms > 0
+
+    def test_sentencia_fallida_no_deja_restos(self):
+        """Test para no acumular en la conexión el inicio de las sentencias que fallan"""
+        registro = RegistroConsultas(nombre="prueba")
+        with registro_activo(registro), engine.connect() as conexion:
+            info = dict(conexion.info)
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conexion.execute(text("SELECT * FROM tabla_inexistente"))
+            assert dict(conexion.info) == info
+            conexion.execute(select(Eventos).limit(1))
+        assert registro.consultas == 1
+
+    def test_cabeceras_y_log_de_la_peticion(self, client, caplog, monkeypatch):
+        """Test para resumir las consultas de la petición en cabeceras (DEBUG) y en el log"""
+        monkeypatch.setattr(settings, "DEBUG", True)
+        with caplog.at_level(logging.INFO, logger="app.sql"):
+            response = client.get("/api/eventos", params={"limit": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert int(response.headers["X-DB-Consultas"]) >= 1
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+
+        resumen = _resumenes(caplog)[-1]
+        assert resumen["peticion"] == "GET /api/eventos"
+        assert resumen["consultas"] == int(response.headers["X-DB-Consultas"])
+
+    def test_sin_cabeceras_fuera_de_debug(self, client, monkeypatch):
+        """Test para no exponer las cabeceras de depuración en producción"""
+        monkeypatch.setattr(settings, "DEBUG", False)
+        response = client.get("/api/eventos", params={"limit": 1})
+        assert "X-DB-Consultas" not in response.headers
+
+    def test_operacion_graphql(self, client, caplog):
+        """Test para nombrar el registro con la operación GraphQL"""
+        with caplog.at_level(logging.INFO, logger="app.sql"):
+            response = client.post("/graphql", json={
+                "query": "query ListaUsuarios { getUsuarios(limit: 1) { usuariosId } }",
+                "operationName": "ListaUsuarios"
+            })
+        assert response.status_code == status.HTTP_200_OK
+        assert _resumenes(caplog)[-1]["peticion"] == "graphql ListaUsuarios"
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import app.models.json_comprimido as json_comprimido
+from app.core.security import get_current_active_user
+from app.models.agent_models import AnalysisStatus, VolunteerAnalysis
+from app.models.json_comprimido import SIN_COMPRIMIR, ZLIB, comprimir_json, descomprimir_json
+from app.models.models import Voluntarios
+from main import app
+from tests.conftest import TestingSessionLocal
+
+BASE_ID = 9970
+RESULTADO = {
+    "resumen": "El voluntario participa con regularidad en los repartos de alimentos y en la clasificación "
+               "de donaciones, con una valoración muy positiva de los coordinadores de cada evento.",
+    "recomendaciones": [f"Asignar al voluntario a tareas de coordinación en el evento de reparto {i}" for i in range(10)],
+    "compatibilidad_eventos_futuros": {f"Reparto de alimentos en el barrio {i}": 0.75 for i in range(20)},
+}
+
+
+@pytest.fixture
+def analisis():
+    db = TestingSessionLocal()
+    db.add(Voluntarios(voluntarios_id=BASE_ID, habilidades="", disponibilidad=""))
+    db.add(VolunteerAnalysis(
+        id=BASE_ID, voluntario_id=BASE_ID, estado=AnalysisStatus.COMPLETED,
+        parametros={"idioma": "es"}, resultado=RESULTADO
+    ))
+    db.commit()
+    db.close()
+    yield BASE_ID
+    db = TestingSessionLocal()
+    db.query(Voluntarios).filter(Voluntarios.voluntarios_id == BASE_ID).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+# Pruebas para el JSON comprimido de los análisis de voluntarios
+class TestJSONComprimido:
+    def test_formato(self):
+        """Test para comprimir sólo cuando ahorra espacio y recuperar el mismo valor"""
+        pequeno = comprimir_json({"idioma": "es"})
+        assert pequeno[:1] == SIN_COMPRIMIR
+        grande = comprimir_json(RESULTADO)
+        assert grande[:1] == ZLIB
+        assert len(grande) * 3 < len(json.dumps(RESULTADO, ensure_ascii=False).encode("utf-8"))
+        assert descomprimir_json(pequeno) == {"idioma": "es"}
+        assert descomprimir_json(grande) == RESULTADO
+        with pytest.raises(ValueError):
+            descomprimir_json(b"\x07{}")
+
+    def test_decodifica_al_leer_el_atributo(self, analisis, monkeypatch):
+        """Test para descomprimir sólo al leer el atributo y una sola vez"""
+        llamadas = []
+        original = json_comprimido.descomprimir_json
+        monkeypatch.setattr(json_comprimido, "descomprimir_json", lambda datos: llamadas.append(1) or original(datos))
+
+        db = TestingSessionLocal()
+        fila = db.get(VolunteerAnalysis, analisis)
+        assert fila.estado == AnalysisStatus.COMPLETED
+        assert llamadas == []
+        assert fila.resultado == RESULTADO
+        assert fila.resultado["resumen"].startswith("El voluntario")
+        assert len(llamadas) == 1
+
+        fila.resultado = {"resumen": "Actualizado"}
+        db.commit()
+        db.expire_all()
+        assert db.get(VolunteerAnalysis, analisis).resultado == {"resumen": "Actualizado"}
+        db.close()
+
+    def test_listado_sin_resultado_no_lo_lee(self, client, analisis):
+        """Test para no leer ni devolver resultado cuando el cliente sólo quiere el estado"""
+        sentencias = []
+
+        def anotar(conn, cursor, statement, parameters, context, executemany):
+            sentencias.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", anotar)
+        app.dependency_overrides[get_current_active_user] = lambda: None
+        try:
+            url = f"/api/v1/agent/volunteer/{analisis}/analyses"
+            response = client.get(url, params={"incluir_resultado": False})
+            completo = client.get(url)
+        finally:
+            event.remove(Engine, "before_cursor_execute", anotar)
+            app.dependency_overrides.pop(get_current_active_user)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]["estado"] == "completed"
+        assert "resultado" not in response.json()[0]
+        listado = next(s for s in sentencias if "FROM volunteer_analysis" in s)
+        assert "volunteer_analysis.resultado" not in listado
+        assert "volunteer_analysis.parametros" not in listado
+        assert completo.json()[0]["resultado"] == RESULTADO
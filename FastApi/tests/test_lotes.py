@@ -0,0 +1,179 @@
+import pytest
+from fastapi import status
+from app.models.models import Eventos, Asignaciones, Voluntarios, Feedback
+from app.models.agent_models import VolunteerAnalysis
+from tests.conftest import TestingSessionLocal
+
+BASE_ID = 9200
+
+
+def _evento(eventos_id):
+    return {
+        "eventos_id": eventos_id,
+        "nombre": f"Evento {eventos_id}",
+        "fecha": "2030-05-01",
+        "hora": "09:00",
+        "ubicacion": "Plaza Central",
+        "voluntarios_necesarios": 5
+    }
+
+
+@pytest.fixture
+def limpiar_lotes():
+    yield
+    db = TestingSessionLocal()
+    db.query(Feedback).filter(Feedback.feedback_id.between(BASE_ID, BASE_ID + 99)).delete(synchronize_session=False)
+    db.query(Asignaciones).filter(Asignaciones.asignaciones_id.between(BASE_ID, BASE_ID + 99)).delete(synchronize_session=False)
+    db.query(Voluntarios).filter(Voluntarios.voluntarios_id.between(BASE_ID, BASE_ID + 99)).delete(synchronize_session=False)
+    db.query(Eventos).filter(Eventos.eventos_id.between(BASE_ID, BASE_ID + 99)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+# Pruebas para los endpoints de creación en lote
+class TestLotes:
+    def test_crear_eventos_en_lote(self, client, limpiar_lotes):
+        """Test para crear varios eventos en una sola petición"""
+        eventos = [_evento(BASE_ID + i) for i in range(1, 4)]
+        response = client.post("/api/bulk/add-eventos/", json=eventos)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 3
+        assert data["creados"] == 3
+        assert data["fallidos"] == 0
+
+        db = TestingSessionLocal()
+        assert db.query(Eventos).filter(Eventos.eventos_id.between(BASE_ID + 1, BASE_ID + 3)).count() == 3
+        db.close()
+
+    def test_informe_por_fila(self, client, limpiar_lotes):
+        """Test para validar que los errores se informan por fila sin abortar el lote"""
+        client.post("/api/bulk/add-eventos/", json=[_evento(BASE_ID + 10)])
+
+        eventos = [_evento(BASE_ID + 10), _evento(BASE_ID + 11), _evento(BASE_ID + 11)]
+        data = client.post("/api/bulk/add-eventos/", json=eventos).json()
+        assert data["creados"] == 1
+        assert [r["ok"] for r in data["resultados"]] == [False, True, False]
+        assert "ya existe" in data["resultados"][0]["error"]
+        assert "repetido" in data["resultados"][2]["error"]
+
+    def test_asignaciones_con_evento_inexistente(self, client, limpiar_lotes):
+        """Test para validar las claves foráneas de cada fila del lote"""
+        client.post("/api/bulk/add-eventos/", json=[_evento(BASE_ID + 20)])
+        asignaciones = [
+            {"asignaciones_id": BASE_ID + 1, "voluntario_id": None, "evento_id": BASE_ID + 20, "estado": "pendiente"},
+            {"asignaciones_id": BASE_ID + 2, "voluntario_id": None, "evento_id": BASE_ID + 99, "estado": "pendiente"},
+        ]
+        data = client.post("/api/bulk/add-asignaciones/", json=asignaciones).json()
+        assert data["creados"] == 1
+        assert data["resultados"][1]["error"] == f"evento_id {BASE_ID + 99} no existe"
+
+    def test_transicion_estado_por_evento(self, client, limpiar_lotes):
+        """Test para confirmar todas las asignaciones pendientes de un evento con un único UPDATE"""
+        client.post("/api/bulk/add-eventos/", json=[_evento(BASE_ID + 30), _evento(BASE_ID + 31)])
+        asignaciones = [
+            {"asignaciones_id": BASE_ID + 30, "voluntario_id": None, "evento_id": BASE_ID + 30, "estado": "pendiente"},
+            {"asignaciones_id": BASE_ID + 31, "voluntario_id": None, "evento_id": BASE_ID + 30, "estado": "pendiente"},
+            {"asignaciones_id": BASE_ID + 32, "voluntario_id": None, "evento_id": BASE_ID + 30, "estado": "cancelada"},
+            {"asignaciones_id": BASE_ID + 33, "voluntario_id": None, "evento_id": BASE_ID + 31, "estado": "pendiente"},
+        ]
+        client.post("/api/bulk/add-asignaciones/", json=asignaciones)
+
+        response = client.put("/api/bulk/update-asignaciones/estado/", json={
+            "estado": "confirmada",
+            "evento_id": BASE_ID + 30,
+            "estado_actual": "pendiente"
+        })
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"estado": "confirmada", "actualizadas": 2}
+
+        db = TestingSessionLocal()
+        estados = dict(db.query(Asignaciones.asignaciones_id, Asignaciones.estado)
+                       .filter(Asignaciones.asignaciones_id.between(BASE_ID + 30, BASE_ID + 33)))
+        db.close()
+        assert estados == {
+            BASE_ID + 30: "confirmada",
+            BASE_ID + 31: "confirmada",
+            BASE_ID + 32: "cancelada",
+            BASE_ID + 33: "pendiente",
+        }
+
+        # Repetir la transición no cambia ninguna fila
+        response = client.put("/api/bulk/update-asignaciones/estado/", json={
+            "estado": "confirmada",
+            "asignaciones_ids": [BASE_ID + 30, BASE_ID + 31]
+        })
+        assert response.json()["actualizadas"] == 0
+
+    def test_transicion_estado_sin_filtro(self, client):
+        """Test para validar que no se pueda cambiar el estado de toda la tabla por error"""
+        response = client.put("/api/bulk/update-asignaciones/estado/", json={"estado": "cancelada"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_borrar_voluntarios_en_lote_con_cascada(self, client, limpiar_lotes):
+        """Test para borrar voluntarios en lote dejando las filas dependientes a la base de datos"""
+        db = TestingSessionLocal()
+        db.add(Eventos(eventos_id=BASE_ID + 40, nombre="Evento borrado"))
+        db.add_all([Voluntarios(voluntarios_id=BASE_ID + i) for i in (41, 42, 43)])
+        db.flush()
+        db.add_all([
+            Asignaciones(asignaciones_id=BASE_ID + 41, evento_id=BASE_ID + 40, voluntario_id=BASE_ID + 41),
+            Asignaciones(asignaciones_id=BASE_ID + 42, evento_id=BASE_ID + 40, voluntario_id=BASE_ID + 43),
+            Feedback(feedback_id=BASE_ID + 41, evento_id=BASE_ID + 40, voluntario_id=BASE_ID + 41, calificacion=5),
+            VolunteerAnalysis(voluntario_id=BASE_ID + 41, parametros={}),
+        ])
+        db.commit()
+
+        response = client.post("/api/bulk/delete-voluntarios/", json=[BASE_ID + 41, BASE_ID + 42, BASE_ID + 99])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"solicitados": 3, "borrados": 2}
+
+        db.expire_all()
+        # ON DELETE CASCADE: asignaciones y análisis del voluntario borrados
+        assert db.query(Asignaciones).filter(Asignaciones.voluntario_id == BASE_ID + 41).count() == 0
+        assert db.query(VolunteerAnalysis).filter(VolunteerAnalysis.voluntario_id == BASE_ID + 41).count() == 0
+        assert db.get(Asignaciones, BASE_ID + 42) is not None
+        # ON DELETE SET NULL: el feedback del evento se conserva
+        assert db.get(Feedback, BASE_ID + 41).voluntario_id is None
+        db.close()
+
+    def test_borrar_eventos_en_lote(self, client, limpiar_lotes):
+        """Test para borrar eventos en lote con un DELETE por conjunto de IDs"""
+        client.post("/api/bulk/add-eventos/", json=[_evento(BASE_ID + i) for i in (50, 51)])
+
+        response = client.post("/api/bulk/delete-eventos/", json=[BASE_ID + 50, BASE_ID + 51])
+        assert response.json()["borrados"] == 2
+
+        db = TestingSessionLocal()
+        assert db.query(Eventos).filter(Eventos.eventos_id.between(BASE_ID + 50, BASE_ID + 51)).count() == 0
+        db.close()
+
+    def test_voluntario_con_usuario_inexistente(self, client, limpiar_lotes):
+        """Test para responder 400 al crear un voluntario con un usuario que no existe"""
+        response = client.post("/api/add-voluntarios/", json={
+            "voluntarios_id": BASE_ID + 60, "habilidades": "", "disponibilidad": "", "usuario_id": BASE_ID + 99
+        })
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == f"usuario_id {BASE_ID + 99} no existe"
+
+    def test_asignacion_con_evento_inexistente(self, client, limpiar_lotes):
+        """Test para responder 400 al crear una asignación de un evento que no existe"""
+        db = TestingSessionLocal()
+        db.add(Voluntarios(voluntarios_id=BASE_ID + 61))
+        db.commit()
+        db.close()
+        response = client.post("/api/add-asignacion/", json={
+            "asignaciones_id": BASE_ID + 61, "voluntario_id": BASE_ID + 61, "evento_id": BASE_ID + 99, "estado": "pendiente"
+        })
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == f"evento_id {BASE_ID + 99} no existe"
+
+    def test_feedback_con_referencias_inexistentes(self, client, limpiar_lotes):
+        """Test para responder 400 al crear feedback de un voluntario y un evento que no existen"""
+        response = client.post("/api/add-feedback/", json={
+            "feedback_id": BASE_ID + 62, "voluntario_id": BASE_ID + 98, "evento_id": BASE_ID + 99,
+            "calificacion": 4, "comentario": "Bien"
+        })
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert f"evento_id {BASE_ID + 99} no existe" in response.json()["detail"]
+        assert f"voluntario_id {BASE_ID + 98} no existe" in response.json()["detail"]
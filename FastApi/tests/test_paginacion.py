@@ -0,0 +1,58 @@
+import pytest
+from fastapi import status
+from app.models.models import Eventos, Asignaciones
+from tests.conftest import TestingSessionLocal
+
+# Rango de IDs reservado para no chocar con los datos de otras pruebas
+BASE_ID = 9000
+
+
+@pytest.fixture
+def eventos_paginados():
+    db = TestingSessionLocal()
+    ids = [BASE_ID + i for i in range(1, 6)]
+    db.add_all([Eventos(eventos_id=i, nombre=f"Evento {i}", fecha="2030-01-01") for i in ids])
+    db.add_all([
+        Asignaciones(asignaciones_id=BASE_ID + 1, evento_id=ids[0], estado="pendiente"),
+        Asignaciones(asignaciones_id=BASE_ID + 2, evento_id=ids[0], estado="confirmada"),
+        Asignaciones(asignaciones_id=BASE_ID + 3, evento_id=ids[1], estado="pendiente"),
+    ])
+    db.commit()
+    yield ids
+    db.query(Asignaciones).filter(Asignaciones.asignaciones_id > BASE_ID).delete()
+    db.query(Eventos).filter(Eventos.eventos_id > BASE_ID).delete()
+    db.commit()
+    db.close()
+
+
+# Pruebas para la paginación keyset de los endpoints de listado
+class TestPaginacion:
+    def test_recorrer_eventos_por_cursor(self, client, eventos_paginados):
+        """Test para recorrer todos los eventos siguiendo la cabecera X-Next-Cursor"""
+        recibidos = []
+        cursor = BASE_ID
+        while cursor is not None:
+            response = client.get("/api/eventos", params={"cursor": cursor, "limit": 2})
+            assert response.status_code == status.HTTP_200_OK
+            pagina = response.json()
+            assert len(pagina) <= 2
+            recibidos.extend(e["eventos_id"] for e in pagina)
+            cursor = response.headers.get("X-Next-Cursor")
+
+        assert recibidos == eventos_paginados
+
+    def test_filtrar_asignaciones_por_evento_y_estado(self, client, eventos_paginados):
+        """Test para filtrar asignaciones por evento_id y estado en el servidor"""
+        response = client.get(
+            "/api/asignaciones",
+            params={"evento_id": eventos_paginados[0], "estado": "pendiente"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [a["asignaciones_id"] for a in data] == [BASE_ID + 1]
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_limit_excede_maximo(self, client):
+        """Test para validar que no se puedan pedir páginas más grandes que el máximo"""
+        response = client.get("/api/eventos", params={"limit": 100000})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,102 @@
+import os
+import tempfile
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.database.database import Base
+from app.db.enrutamiento import COOKIE_ESCRITURA, crear_fabrica_sesiones, enrutar_peticion, lectura_de_la_peticion, \
+    usar_replica
+from app.models.models import Eventos
+
+
+# Primaria y réplica en dos ficheros SQLite distintos: la réplica "va con
+# retraso" y sólo tiene el evento 1, la primaria sólo el evento 2
+@pytest.fixture(scope="module")
+def rutas():
+    rutas = {}
+    for nombre, evento_id in (("primaria", 2), ("replica", 1)):
+        fd, ruta = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        engine = create_engine(f"sqlite:///{ruta}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conexion:
+            conexion.execute(insert(Eventos).values(eventos_id=evento_id, nombre=nombre))
+        engine.dispose()
+        rutas[nombre] = ruta
+    yield rutas
+    for ruta in rutas.values():
+        os.remove(ruta)
+
+
+@pytest.fixture(scope="module")
+def client_replicas(rutas):
+    primaria = create_async_engine(f"sqlite+aiosqlite:///{rutas['primaria']}", poolclass=NullPool)
+    replica = create_async_engine(f"sqlite+aiosqlite:///{rutas['replica']}", poolclass=NullPool)
+    fabrica = crear_fabrica_sesiones(primaria, [replica])
+
+    async def get_db():
+        async with fabrica(info={"replica": lectura_de_la_peticion()}) as db:
+            yield db
+
+    app = FastAPI()
+    app.middleware("http")(enrutar_peticion)
+
+    @app.get("/eventos")
+    async def listar(db=Depends(get_db)):
+        return sorted((await db.execute(select(Eventos.nombre))).scalars().all())
+
+    @app.post("/eventos/{eventos_id}")
+    async def crear(eventos_id: int, db=Depends(get_db)):
+        db.add(Eventos(eventos_id=eventos_id, nombre=f"nuevo {eventos_id}"))
+        await db.commit()
+        return sorted((await db.execute(select(Eventos.nombre))).scalars().all())
+
+    @app.post("/eventos/{eventos_id}/leer-aparte")
+    async def crear_y_leer_aparte(eventos_id: int, db=Depends(get_db)):
+        db.add(Eventos(eventos_id=eventos_id, nombre=f"nuevo {eventos_id}"))
+        await db.commit()
+        # Otra sesión de la misma petición, como sesion_lectura()
+        async with fabrica(info={"replica": usar_replica()}) as otra:
+            return sorted((await otra.execute(select(Eventos.nombre))).scalars().all())
+
+    with TestClient(app) as c:
+        yield c
+
+
+# Pruebas para el enrutamiento de sesiones entre la primaria y las réplicas
+class TestReplicas:
+    def test_lecturas_van_a_la_replica(self, client_replicas):
+        """Test para enviar las lecturas de un GET a la réplica"""
+        client_replicas.cookies.clear()
+        response = client_replicas.get("/eventos")
+        assert response.json() == ["replica"]
+        assert COOKIE_ESCRITURA not in response.cookies
+
+    def test_escritura_y_lectura_en_la_misma_sesion_usan_la_primaria(self, client_replicas):
+        """Test para leer de la primaria en la sesión que ya ha escrito"""
+        client_replicas.cookies.clear()
+        response = client_replicas.post("/eventos/3")
+        assert response.json() == ["nuevo 3", "primaria"]
+        assert COOKIE_ESCRITURA in response.cookies
+
+    def test_lecturas_tras_escribir_van_a_la_primaria(self, client_replicas):
+        """Test para leer de la primaria mientras el cliente tenga la cookie de escritura reciente"""
+        client_replicas.cookies.clear()
+        client_replicas.post("/eventos/4")
+
+        # El cliente conserva la cookie: lee sus propias escrituras
+        assert "nuevo 4" in client_replicas.get("/eventos").json()
+
+        client_replicas.cookies.clear()
+        assert client_replicas.get("/eventos").json() == ["replica"]
+
+    def test_otra_sesion_tras_escribir_en_la_peticion_usa_la_primaria(self, client_replicas):
+        """Test para leer de la primaria en otra sesión de una petición que ya ha escrito"""
+        client_replicas.cookies.clear()
+        response = client_replicas.post("/eventos/5/leer-aparte")
+        assert "nuevo 5" in response.json()
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from app.db.repositorio import obtener_por_id, usuario_por_correo, usuario_por_id
+from app.models.models import Eventos, Usuarios
+from tests.conftest import TestingSessionLocal, TestingAsyncSessionLocal
+
+BASE_ID = 9950
+
+
+@pytest.fixture
+def filas():
+    db = TestingSessionLocal()
+    db.add_all([
+        Usuarios(usuarios_id=BASE_ID, nombre="Ana", apellido="Repo", correo="ana.repo@example.com",
+                 tipo="voluntario", hashed_password="hash"),
+        Usuarios(usuarios_id=BASE_ID + 1, nombre="Luis", apellido="Repo", correo="luis.repo@example.com",
+                 tipo="voluntario", hashed_password="hash"),
+        Eventos(eventos_id=BASE_ID, nombre="Evento repo"),
+    ])
+    db.commit()
+    yield
+    db.query(Usuarios).filter(Usuarios.usuarios_id.in_([BASE_ID, BASE_ID + 1])).delete(synchronize_session=False)
+    db.query(Eventos).filter(Eventos.eventos_id == BASE_ID).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+def _ejecutar(buscar):
+    async def con_sesion():
+        async with TestingAsyncSessionLocal() as db:
+            return await buscar(db)
+    return asyncio.run(con_sesion())
+
+
+# Pruebas para las búsquedas con sentencias en caché
+class TestRepositorio:
+    def test_usuario_por_id_y_correo(self, filas):
+        """Test para que la sentencia en caché use el valor de cada llamada"""
+        assert _ejecutar(lambda db: usuario_por_id(db, BASE_ID)).correo == "ana.repo@example.com"
+        assert _ejecutar(lambda db: usuario_por_id(db, BASE_ID + 1)).correo == "luis.repo@example.com"
+        assert _ejecutar(lambda db: usuario_por_correo(db, "luis.repo@example.com")).usuarios_id == BASE_ID + 1
+        assert _ejecutar(lambda db: usuario_por_correo(db, "nadie@example.com")) is None
+
+    def test_obtener_por_id_distingue_modelos(self, filas):
+        """Test para que cada modelo tenga su propia sentencia en la caché"""
+        assert isinstance(_ejecutar(lambda db: obtener_por_id(db, Usuarios, BASE_ID)), Usuarios)
+        assert isinstance(_ejecutar(lambda db: obtener_por_id(db, Eventos, BASE_ID)), Eventos)
+        assert _ejecutar(lambda db: obtener_por_id(db, Eventos, BASE_ID + 1)) is None
+
+    def test_endpoints_por_id(self, client, filas):
+        """Test para que los endpoints que buscan por ID sigan encontrando la fila"""
+        response = client.delete(f"/api/delete-evento/{BASE_ID}")
+        assert response.status_code == status.HTTP_200_OK
+        assert _ejecutar(lambda db: obtener_por_id(db, Eventos, BASE_ID)) is None
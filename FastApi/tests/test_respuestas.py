@@ -0,0 +1,67 @@
+import pytest
+from fastapi import status
+from app.models.models import Usuarios
+from tests.conftest import TestingSessionLocal
+
+BASE_ID = 9800
+
+
+@pytest.fixture
+def usuario_guardado():
+    db = TestingSessionLocal()
+    db.add(Usuarios(
+        usuarios_id=BASE_ID, nombre="Ana", apellido="Ruiz", correo="ana.respuestas@example.com",
+        tipo="voluntario", hashed_password="hash-secreto"
+    ))
+    db.commit()
+    yield BASE_ID
+    db.query(Usuarios).filter(Usuarios.usuarios_id == BASE_ID).delete()
+    db.commit()
+    db.close()
+
+
+# Pruebas para los modelos de respuesta tipados de los endpoints REST
+class TestRespuestas:
+    def test_listado_tipado_sin_hashed_password(self, client, usuario_guardado):
+        """Test para comprobar que el listado de usuarios usa el modelo de respuesta y no expone el hash"""
+        response = client.get("/api/usuarios", params={"cursor": BASE_ID - 1, "limit": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        usuario = response.json()[0]
+        assert usuario["usuarios_id"] == BASE_ID
+        assert "hashed_password" not in usuario
+
+    def test_creacion_devuelve_modelo_de_respuesta(self, client):
+        """Test para comprobar que la creación de un evento devuelve exactamente los campos del modelo"""
+        evento = {
+            "eventos_id": BASE_ID,
+            "nombre": "Evento respuestas",
+            "fecha": "2030-06-01",
+            "hora": "09:00",
+            "ubicacion": "Almacén",
+            "voluntarios_necesarios": 2
+        }
+        response = client.post("/api/add-evento/", json=evento)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {**evento, "descripcion_eventos": None, "starts_at": "2030-06-01T09:00:00"}
+        client.delete(f"/api/delete-evento/{BASE_ID}")
+
+    def test_actualizaciones_devuelven_modelo_de_respuesta(self, client, usuario_guardado):
+        """Test para comprobar que las actualizaciones de usuarios y voluntarios no devuelven el objeto ORM"""
+        response = client.put("/api/update-usuarios/", json={
+            "usuarios_id": BASE_ID, "nombre": "Ana María", "apellido": "Ruiz", "correo": "ana.respuestas@example.com"
+        })
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["nombre"] == "Ana María"
+        assert "hashed_password" not in response.json()
+
+        voluntario = {"voluntarios_id": BASE_ID, "habilidades": "Cocina", "disponibilidad": "Mañanas", "usuario_id": BASE_ID}
+        client.post("/api/add-voluntarios/", json=voluntario)
+        response = client.put("/api/update-voluntario/", json={**voluntario, "disponibilidad": "Tardes"})
+        assert response.json() == {**voluntario, "disponibilidad": "Tardes"}
+        client.delete(f"/api/delete-voluntario/{BASE_ID}")
+
+        response = client.put("/api/update-usuarios/", json={
+            "usuarios_id": BASE_ID + 99, "nombre": "Nadie", "apellido": "Nadie", "correo": "nadie@example.com"
+        })
+        assert response.status_code == status.HTTP_404_NOT_FOUND
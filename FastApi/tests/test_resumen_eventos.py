@@ -0,0 +1,58 @@
+import pytest
+from fastapi import status
+from app.models.models import Eventos, Asignaciones
+from tests.conftest import TestingSessionLocal
+
+BASE_ID = 9500
+
+
+@pytest.fixture
+def eventos_con_asignaciones():
+    db = TestingSessionLocal()
+    db.add_all([
+        Eventos(eventos_id=BASE_ID + 1, nombre="Pasado", fecha="2000-01-01", voluntarios_necesarios=2),
+        Eventos(eventos_id=BASE_ID + 2, nombre="Próximo", fecha="2999-01-01", voluntarios_necesarios=4),
+        Eventos(eventos_id=BASE_ID + 3, nombre="Sin asignaciones", fecha="2999-02-01", voluntarios_necesarios=3),
+    ])
+    db.add_all([
+        Asignaciones(asignaciones_id=BASE_ID + 1, evento_id=BASE_ID + 1, estado="confirmada"),
+        Asignaciones(asignaciones_id=BASE_ID + 2, evento_id=BASE_ID + 2, estado="confirmada"),
+        Asignaciones(asignaciones_id=BASE_ID + 3, evento_id=BASE_ID + 2, estado="pendiente"),
+        Asignaciones(asignaciones_id=BASE_ID + 4, evento_id=BASE_ID + 2, estado="pendiente"),
+        Asignaciones(asignaciones_id=BASE_ID + 5, evento_id=BASE_ID + 2, estado="cancelada"),
+    ])
+    db.commit()
+    yield
+    db.query(Asignaciones).filter(Asignaciones.asignaciones_id > BASE_ID, Asignaciones.asignaciones_id < BASE_ID + 100).delete()
+    db.query(Eventos).filter(Eventos.eventos_id > BASE_ID, Eventos.eventos_id < BASE_ID + 100).delete()
+    db.commit()
+    db.close()
+
+
+def _por_id(data):
+    return {e["eventos_id"]: e for e in data if BASE_ID < e["eventos_id"] < BASE_ID + 100}
+
+
+# Pruebas para el resumen de personal por evento
+class TestResumenEventos:
+    def test_resumen_por_estado(self, client, eventos_con_asignaciones):
+        """Test para contar asignaciones por estado y calcular las plazas faltantes"""
+        response = client.get("/api/resumen-eventos")
+        assert response.status_code == status.HTTP_200_OK
+        resumen = _por_id(response.json())
+
+        proximo = resumen[BASE_ID + 2]
+        assert proximo["por_estado"] == {"confirmada": 1, "pendiente": 2, "cancelada": 1}
+        assert proximo["asignados"] == 3
+        assert proximo["faltantes"] == 1
+
+        sin_asignaciones = resumen[BASE_ID + 3]
+        assert sin_asignaciones["asignados"] == 0
+        assert sin_asignaciones["por_estado"] == {}
+        assert sin_asignaciones["faltantes"] == 3
+
+    def test_resumen_solo_proximos(self, client, eventos_con_asignaciones):
+        """Test para excluir los eventos pasados con proximos=true"""
+        response = client.get("/api/resumen-eventos", params={"proximos": True})
+        assert response.status_code == status.HTTP_200_OK
+        assert set(_por_id(response.json())) == {BASE_ID + 2, BASE_ID + 3}
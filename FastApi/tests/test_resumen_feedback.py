@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from app.models.models import Eventos, Voluntarios, Feedback, ResumenFeedbackVoluntario, ResumenFeedbackEvento
+from app.routers.resumen_feedback import sumar_calificacion
+from tests.conftest import TestingSessionLocal, TestingAsyncSessionLocal
+
+BASE_ID = 9400
+VOLUNTARIO_A = BASE_ID + 1
+VOLUNTARIO_B = BASE_ID + 2
+EVENTO = BASE_ID + 1
+
+
+@pytest.fixture
+def datos_feedback():
+    db = TestingSessionLocal()
+    db.add_all([Voluntarios(voluntarios_id=VOLUNTARIO_A), Voluntarios(voluntarios_id=VOLUNTARIO_B)])
+    db.add(Eventos(eventos_id=EVENTO, nombre="Evento feedback", fecha="2030-03-01"))
+    db.commit()
+    yield
+    db.query(Feedback).filter(Feedback.feedback_id > BASE_ID, Feedback.feedback_id < BASE_ID + 100).delete()
+    db.query(ResumenFeedbackVoluntario).filter(ResumenFeedbackVoluntario.voluntario_id.in_([VOLUNTARIO_A, VOLUNTARIO_B])).delete()
+    db.query(ResumenFeedbackEvento).filter(ResumenFeedbackEvento.evento_id == EVENTO).delete()
+    db.query(Voluntarios).filter(Voluntarios.voluntarios_id.in_([VOLUNTARIO_A, VOLUNTARIO_B])).delete()
+    db.query(Eventos).filter(Eventos.eventos_id == EVENTO).delete()
+    db.commit()
+    db.close()
+
+
+def _feedback(feedback_id, voluntario_id, calificacion):
+    return {
+        "feedback_id": feedback_id,
+        "voluntario_id": voluntario_id,
+        "evento_id": EVENTO,
+        "calificacion": calificacion,
+        "comentario": "ok"
+    }
+
+
+# Pruebas para los agregados de feedback por voluntario y por evento
+class TestResumenFeedback:
+    def test_insertar_actualizar_y_borrar(self, client, datos_feedback):
+        """Test para mantener los agregados al crear, actualizar y borrar feedback"""
+        client.post("/api/add-feedback/", json=_feedback(BASE_ID + 1, VOLUNTARIO_A, 4))
+        client.post("/api/add-feedback/", json=_feedback(BASE_ID + 2, VOLUNTARIO_A, 2))
+
+        resumen = client.get(f"/api/voluntarios/{VOLUNTARIO_A}/resumen-feedback").json()
+        assert (resumen["total"], resumen["suma"], resumen["promedio"]) == (2, 6, 3.0)
+        assert resumen["ultima_fecha"] is not None
+
+        # Mover la segunda calificación al voluntario B y subirla a 5
+        client.put("/api/update-feedback/", json=_feedback(BASE_ID + 2, VOLUNTARIO_B, 5))
+        resumen_a = client.get(f"/api/voluntarios/{VOLUNTARIO_A}/resumen-feedback").json()
+        resumen_b = client.get(f"/api/voluntarios/{VOLUNTARIO_B}/resumen-feedback").json()
+        assert (resumen_a["total"], resumen_a["promedio"]) == (1, 4.0)
+        assert (resumen_b["total"], resumen_b["promedio"]) == (1, 5.0)
+
+        resumen_evento = client.get(f"/api/eventos/{EVENTO}/resumen-feedback").json()
+        assert (resumen_evento["total"], resumen_evento["suma"]) == (2, 9)
+
+        client.delete(f"/api/delete-feedback/{BASE_ID + 1}")
+        resumen_a = client.get(f"/api/voluntarios/{VOLUNTARIO_A}/resumen-feedback").json()
+        assert (resumen_a["total"], resumen_a["promedio"]) == (0, None)
+
+    def test_insercion_en_lote_y_ranking(self, client, datos_feedback):
+        """Test para actualizar los agregados en la creación en lote y ordenar el ranking por promedio"""
+        lote = [
+            _feedback(BASE_ID + 3, VOLUNTARIO_A, 3),
+            _feedback(BASE_ID + 4, VOLUNTARIO_B, 5),
+            _feedback(BASE_ID + 5, VOLUNTARIO_B, 4),
+        ]
+        assert client.post("/api/bulk/add-feedback/", json=lote).json()["creados"] == 3
+
+        response = client.get("/api/ranking-voluntarios", params={"limit": 500})
+        assert response.status_code == status.HTTP_200_OK
+        ranking = [r["voluntario_id"] for r in response.json() if r["voluntario_id"] in (VOLUNTARIO_A, VOLUNTARIO_B)]
+        assert ranking == [VOLUNTARIO_B, VOLUNTARIO_A]
+
+        response = client.get("/api/ranking-voluntarios", params={"min_calificaciones": 2, "limit": 500})
+        assert VOLUNTARIO_A not in [r["voluntario_id"] for r in response.json()]
+
+    def test_suma_con_un_upsert_por_resumen(self, datos_feedback):
+        """Test para sumar cada calificación con un único INSERT ... ON CONFLICT, sin UPDATE previo que pueda competir"""
+        sentencias = []
+
+        def anotar(conn, cursor, statement, parameters, context, executemany):
+            sentencias.append(statement)
+
+        async def sumar():
+            async with TestingAsyncSessionLocal() as db:
+                event.listen(db.bind.sync_engine, "before_cursor_execute", anotar)
+                try:
+                    for feedback_id, calificacion in ((BASE_ID + 1, 4), (BASE_ID + 2, 1)):
+                        await sumar_calificacion(db, Feedback(
+                            feedback_id=feedback_id, voluntario_id=VOLUNTARIO_A, evento_id=EVENTO, calificacion=calificacion
+                        ))
+                finally:
+                    event.remove(db.bind.sync_engine, "before_cursor_execute", anotar)
+                await db.commit()
+
+        asyncio.run(sumar())
+        assert len(sentencias) == 4
+        assert all(sentencia.startswith("INSERT") and "ON CONFLICT" in sentencia for sentencia in sentencias)
+
+        db = TestingSessionLocal()
+        resumen = db.get(ResumenFeedbackVoluntario, VOLUNTARIO_A)
+        assert (resumen.total, resumen.suma, resumen.promedio) == (2, 5, 2.5)
+        assert db.get(ResumenFeedbackEvento, EVENTO).total == 2
+        db.close()